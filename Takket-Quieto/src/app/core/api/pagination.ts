@@ -0,0 +1,65 @@
+import { HttpClient, HttpParams, HttpResponse } from '@angular/common/http';
+import { EMPTY, Observable, expand, map, reduce } from 'rxjs';
+
+/**
+ * Cabecera con la que el backend indica el cursor de la siguiente página.
+ */
+export const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+/**
+ * Página de un listado paginado por cursor.
+ *
+ * `next` es el cursor a enviar para pedir la siguiente página, o null si
+ * no hay más resultados.
+ */
+export interface Page<T> {
+    items: T[];
+    next: string | null;
+}
+
+function requestPage<T>(http: HttpClient, url: string, after?: string | null): Observable<HttpResponse<T[]>> {
+    const params = after ? new HttpParams().set('after', after) : undefined;
+    return http.get<T[]>(url, { observe: 'response', params });
+}
+
+/**
+ * Recupera una sola página de un listado paginado por cursor (keyset).
+ *
+ * Las vistas de listado piden la primera página al cargar y las siguientes
+ * bajo demanda ("Cargar más"), enviando el cursor de la anterior.
+ *
+ * @param http Cliente HTTP de Angular
+ * @param url URL del listado paginado
+ * @param after Cursor devuelto por la página anterior (sin él, la primera)
+ * @returns Observable con los elementos de la página y el cursor siguiente
+ */
+export function fetchPage<T>(http: HttpClient, url: string, after?: string | null): Observable<Page<T>> {
+    return requestPage<T>(http, url, after).pipe(
+        map(response => ({
+            items: response.body ?? [],
+            next: response.headers.get(NEXT_CURSOR_HEADER)
+        }))
+    );
+}
+
+/**
+ * Recupera todas las páginas de un listado paginado por cursor (keyset).
+ *
+ * Pide la primera página y, mientras la respuesta incluya la cabecera
+ * X-Next-Cursor, solicita la siguiente enviándola como parámetro `after`.
+ * Solo para vistas que necesitan el conjunto completo (el cuadro de un
+ * torneo); los listados usan fetchPage.
+ *
+ * @param http Cliente HTTP de Angular
+ * @param url URL del listado paginado
+ * @returns Observable con la concatenación de todas las páginas
+ */
+export function fetchAllPages<T>(http: HttpClient, url: string): Observable<T[]> {
+    return requestPage<T>(http, url).pipe(
+        expand(response => {
+            const next = response.headers.get(NEXT_CURSOR_HEADER);
+            return next ? requestPage<T>(http, url, next) : EMPTY;
+        }),
+        reduce((items, response) => items.concat(response.body ?? []), [] as T[])
+    );
+}
@@ -2,6 +2,7 @@ import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
 import { Observable, map } from 'rxjs';
 import { API_CONFIG } from '../api/api.config';
+import { Page, fetchPage } from '../api/pagination';
 import { Player } from '../../models/player.model';
 
 @Injectable({
@@ -33,10 +34,15 @@ export class PlayersService {
         };
     }
 
-    getAll(): Observable<Player[]> {
+    /**
+     * Recupera una página del listado de jugadores (ordenado por id).
+     *
+     * @param after Cursor de la página anterior (sin él, la primera página)
+     */
+    getPage(after?: string | null): Observable<Page<Player>> {
         const url = `${API_CONFIG.baseUrl}${API_CONFIG.endpoints.players}`;
-        return this.http.get<any[]>(url).pipe(
-            map(players => players.map(p => this.mapToFrontend(p)))
+        return fetchPage<any>(this.http, url, after).pipe(
+            map(page => ({ items: page.items.map(p => this.mapToFrontend(p)), next: page.next }))
         );
     }
 
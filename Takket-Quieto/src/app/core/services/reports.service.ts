@@ -1,6 +1,6 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { Observable, map } from 'rxjs';
 import { API_CONFIG } from '../api/api.config';
 import { Match } from '../../models/match.model';
 
@@ -17,9 +17,16 @@ export class ReportsService {
 
     constructor(private http: HttpClient) { }
 
+    /**
+     * Recupera el ranking global calculado por el backend (ya ordenado).
+     *
+     * El backend devuelve las derrotas como `losses`; se traducen a `defeats`.
+     */
     getLeaderboard(): Observable<LeaderboardEntry[]> {
         const url = `${API_CONFIG.baseUrl}/reports/leaderboard`;
-        return this.http.get<LeaderboardEntry[]>(url);
+        return this.http.get<any[]>(url).pipe(
+            map(entries => entries.map(e => ({ nick: e.nick, wins: e.wins, defeats: e.losses })))
+        );
     }
 
     getTournamentMatches(tournamentId: number): Observable<Match[]> {
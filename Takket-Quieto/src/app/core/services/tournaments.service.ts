@@ -2,7 +2,8 @@ import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
 import { Observable } from 'rxjs';
 import { API_CONFIG } from '../api/api.config';
-import { Tournament } from '../../models/tournament.model';
+import { Page, fetchAllPages, fetchPage } from '../api/pagination';
+import { ParticipantBulkResult, Tournament } from '../../models/tournament.model';
 import { Player } from '../../models/player.model';
 import { Match } from '../../models/match.model';
 
@@ -18,9 +19,14 @@ export class TournamentsService {
 
     constructor(private http: HttpClient) { }
 
-    getAll(): Observable<Tournament[]> {
+    /**
+     * Recupera una página del listado de torneos (ordenado por id).
+     *
+     * @param after Cursor de la página anterior (sin él, la primera página)
+     */
+    getPage(after?: string | null): Observable<Page<Tournament>> {
         const url = `${API_CONFIG.baseUrl}${API_CONFIG.endpoints.tournaments}`;
-        return this.http.get<Tournament[]>(url);
+        return fetchPage<Tournament>(this.http, url, after);
     }
 
 
@@ -54,6 +60,12 @@ export class TournamentsService {
     }
 
 
+    addParticipants(tournamentId: number, playerIds: number[]): Observable<ParticipantBulkResult> {
+        const url = `${API_CONFIG.baseUrl}${API_CONFIG.endpoints.tournaments}/${tournamentId}/participants/bulk`;
+        return this.http.post<ParticipantBulkResult>(url, { player_ids: playerIds });
+    }
+
+
     generateBracket(id: number): Observable<Match[]> {
         const url = `${API_CONFIG.baseUrl}${API_CONFIG.endpoints.tournaments}/${id}/generate`;
         return this.http.post<Match[]>(url, {});
@@ -67,6 +79,6 @@ export class TournamentsService {
 
     getBracket(id: number): Observable<Match[]> {
         const url = `${API_CONFIG.baseUrl}${API_CONFIG.endpoints.tournaments}/${id}/bracket`;
-        return this.http.get<Match[]>(url);
+        return fetchAllPages<Match>(this.http, url);
     }
 }
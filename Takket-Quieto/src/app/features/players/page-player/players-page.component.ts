@@ -16,6 +16,8 @@ import { Player } from '../../../models/player.model';
 export class PlayersPageComponent implements OnInit {
 
     allPlayers: Player[] = [];
+    nextCursor: string | null = null;
+    loadingMore = false;
     filterType: 'all' | 'active' | 'inactive' = 'active';
 
     constructor(
@@ -28,9 +30,10 @@ export class PlayersPageComponent implements OnInit {
     }
 
     loadPlayers(): void {
-        this.playersService.getAll().subscribe({
-            next: (players) => {
-                this.allPlayers = players;
+        this.playersService.getPage().subscribe({
+            next: (page) => {
+                this.allPlayers = page.items;
+                this.nextCursor = page.next;
             },
             error: (err) => {
                 console.error('Error loading players:', err);
@@ -38,6 +41,26 @@ export class PlayersPageComponent implements OnInit {
         });
     }
 
+    /**
+     * Carga la siguiente página del listado (paginación por cursor).
+     */
+    loadMore(): void {
+        if (!this.nextCursor || this.loadingMore) return;
+
+        this.loadingMore = true;
+        this.playersService.getPage(this.nextCursor).subscribe({
+            next: (page) => {
+                this.allPlayers = this.allPlayers.concat(page.items);
+                this.nextCursor = page.next;
+                this.loadingMore = false;
+            },
+            error: (err) => {
+                console.error('Error loading players:', err);
+                this.loadingMore = false;
+            }
+        });
+    }
+
     get displayedPlayers(): Player[] {
         if (this.filterType === 'active') {
             return this.allPlayers.filter(p => p.active);
@@ -61,8 +84,9 @@ export class PlayersPageComponent implements OnInit {
 
     onTogglePlayer(id: number): void {
         this.playersService.toggleActive(id).subscribe({
-            next: () => {
-                this.loadPlayers();
+            next: (player) => {
+                // Se actualiza en su sitio para no perder las páginas ya cargadas
+                this.allPlayers = this.allPlayers.map(p => p.id === player.id ? player : p);
             },
             error: (err) => {
                 console.error('Error toggling player status:', err);
@@ -13,6 +13,7 @@ import { Player } from '../../../../models/player.model';
 })
 export class HistoryComponent implements OnInit {
     tournaments: Tournament[] = [];
+    nextCursor: string | null = null;
     selectedTournamentId: number | null = null;
     matches: Match[] = [];
     participants: Player[] = [];
@@ -28,11 +29,16 @@ export class HistoryComponent implements OnInit {
         this.loadTournaments();
     }
 
+    /**
+     * Carga la siguiente página de torneos (la primera si aún no hay
+     * ninguna) en el selector.
+     */
     loadTournaments(): void {
         this.loading = true;
-        this.tournamentsService.getAll().subscribe({
-            next: (data) => {
-                this.tournaments = data;
+        this.tournamentsService.getPage(this.nextCursor).subscribe({
+            next: (page) => {
+                this.tournaments = this.tournaments.concat(page.items);
+                this.nextCursor = page.next;
                 this.loading = false;
             },
             error: (err) => {
@@ -2,7 +2,6 @@ import { Component, EventEmitter, Input, OnInit, Output } from '@angular/core';
 import { PlayersService } from '../../../../core/services/players.service';
 import { TournamentsService } from '../../../../core/services/tournaments.service';
 import { Player } from '../../../../models/player.model';
-import { forkJoin } from 'rxjs';
 
 @Component({
     standalone: false,
@@ -15,6 +14,7 @@ export class ParticipantPickerComponent implements OnInit {
     @Output() participantsAdded = new EventEmitter<void>();
 
     availablePlayers: Player[] = [];
+    nextCursor: string | null = null;
     selectedPlayerIds: Set<number> = new Set();
     loading = true;
     saving = false;
@@ -28,11 +28,17 @@ export class ParticipantPickerComponent implements OnInit {
         this.loadAvailablePlayers();
     }
 
+    /**
+     * Carga la siguiente página de jugadores (la primera si aún no hay
+     * ninguna) y añade sus jugadores activos a la lista.
+     */
     loadAvailablePlayers(): void {
-        this.playersService.getAll().subscribe({
-            next: (players) => {
+        this.loading = true;
+        this.playersService.getPage(this.nextCursor).subscribe({
+            next: (page) => {
                 // SOLO jugadores activos
-                this.availablePlayers = players.filter(p => p.active);
+                this.availablePlayers = this.availablePlayers.concat(page.items.filter(p => p.active));
+                this.nextCursor = page.next;
                 this.loading = false;
             },
             error: (err) => {
@@ -56,12 +62,12 @@ export class ParticipantPickerComponent implements OnInit {
         if (this.selectedPlayerIds.size === 0) return;
 
         this.saving = true;
-        const requests = Array.from(this.selectedPlayerIds).map(id =>
-            this.tournamentsService.addParticipant(this.tournamentId, id)
-        );
-
-        forkJoin(requests).subscribe({
-            next: () => {
+        // Una sola petición para toda la selección
+        this.tournamentsService.addParticipants(this.tournamentId, Array.from(this.selectedPlayerIds)).subscribe({
+            next: (result) => {
+                if (result.rejected.length > 0) {
+                    console.warn('Some players were not added:', result.rejected);
+                }
                 this.saving = false;
                 this.selectedPlayerIds.clear();
                 this.participantsAdded.emit();
@@ -11,6 +11,8 @@ import { Tournament } from '../../../models/tournament.model';
 })
 export class TournamentsPageComponent implements OnInit {
     tournaments: Tournament[] = [];
+    nextCursor: string | null = null;
+    loadingMore = false;
 
     constructor(
         private tournamentsService: TournamentsService,
@@ -22,9 +24,10 @@ export class TournamentsPageComponent implements OnInit {
     }
 
     loadTournaments(): void {
-        this.tournamentsService.getAll().subscribe({
-            next: (data) => {
-                this.tournaments = data;
+        this.tournamentsService.getPage().subscribe({
+            next: (page) => {
+                this.tournaments = page.items;
+                this.nextCursor = page.next;
             },
             error: (err) => {
                 console.error('Error loading tournaments:', err);
@@ -32,6 +35,26 @@ export class TournamentsPageComponent implements OnInit {
         });
     }
 
+    /**
+     * Carga la siguiente página del listado (paginación por cursor).
+     */
+    loadMore(): void {
+        if (!this.nextCursor || this.loadingMore) return;
+
+        this.loadingMore = true;
+        this.tournamentsService.getPage(this.nextCursor).subscribe({
+            next: (page) => {
+                this.tournaments = this.tournaments.concat(page.items);
+                this.nextCursor = page.next;
+                this.loadingMore = false;
+            },
+            error: (err) => {
+                console.error('Error loading tournaments:', err);
+                this.loadingMore = false;
+            }
+        });
+    }
+
     onNewTournament(): void {
         this.router.navigate(['/tournaments/new']);
     }
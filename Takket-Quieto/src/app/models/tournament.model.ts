@@ -28,3 +28,14 @@ export interface Tournament {
     created_at: string;
     winner_id?: number | null;
 }
+
+/**
+ * Result of registering several players in a tournament at once.
+ * @interface ParticipantBulkResult
+ * @property {number[]} registered - Ids of the players that were registered.
+ * @property {{player_id: number, reason: string}[]} rejected - Ids that were not registered and why.
+ */
+export interface ParticipantBulkResult {
+    registered: number[];
+    rejected: { player_id: number; reason: string }[];
+}
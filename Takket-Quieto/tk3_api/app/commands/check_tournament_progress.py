@@ -0,0 +1,44 @@
+"""
+Comando de verificación del progreso de los torneos.
+
+Compara current_round y pending_matches de cada torneo con los valores
+calculados a partir de la tabla match y, opcionalmente, los corrige.
+
+Uso (desde el directorio tk3_api):
+    python -m app.commands.check_tournament_progress         # solo informa
+    python -m app.commands.check_tournament_progress --fix   # corrige
+"""
+
+import sys
+from ..core.db import SessionLocal
+from ..services.tournaments_service import TournamentsService
+
+
+def main() -> None:
+    """Informa de los torneos inconsistentes y los corrige si se pide."""
+    fix = "--fix" in sys.argv[1:]
+
+    db = SessionLocal()
+    try:
+        issues = TournamentsService().check_progress(db, fix=fix)
+    finally:
+        db.close()
+
+    for issue in issues:
+        print(
+            f"tournament {issue['tournament_id']}: "
+            f"current_round={issue['current_round']} "
+            f"(expected {issue['expected_round']}), "
+            f"pending_matches={issue['pending_matches']} "
+            f"(expected {issue['expected_pending']})"
+        )
+    if not issues:
+        print("all tournaments are consistent")
+    elif fix:
+        print(f"fixed {len(issues)} tournaments")
+    else:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Comando de migración del esquema de base de datos.
+
+Uso (desde el directorio tk3_api):
+    python -m app.commands.migrate           # aplica las migraciones pendientes
+    python -m app.commands.migrate status    # muestra el estado de cada versión
+"""
+
+import sys
+from ..core.db import engine
+from ..core.migrations import MIGRATIONS, applied_versions, upgrade
+
+
+def main() -> None:
+    """Aplica las migraciones pendientes o muestra su estado."""
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        done = set(applied_versions(engine))
+        for migration in MIGRATIONS:
+            mark = "x" if migration.version in done else " "
+            print(f"[{mark}] {migration.version:03d} {migration.name}")
+        return
+
+    applied = upgrade(engine)
+    for migration in applied:
+        print(f"applied {migration.version:03d} {migration.name}")
+    if not applied:
+        print("schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
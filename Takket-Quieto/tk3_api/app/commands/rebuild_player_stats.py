@@ -0,0 +1,30 @@
+"""
+Comando de reconstrucción de la tabla player_stats.
+
+Recalcula las estadísticas de todos los jugadores a partir de la tabla
+match. Se usa para la carga inicial (backfill) y para reparar desviaciones.
+
+Uso (desde el directorio tk3_api):
+    python -m app.commands.rebuild_player_stats
+"""
+
+from ..core.db import SessionLocal, engine
+from ..models.player import Player  # noqa: F401 (registro de la FK)
+from ..models.player_stats import PlayerStats
+from ..services.player_stats_service import PlayerStatsService
+
+
+def main() -> None:
+    """Crea la tabla si no existe y la reconstruye desde el historial."""
+    PlayerStats.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        total = PlayerStatsService().rebuild(db)
+        print(f"player_stats rebuilt: {total} players")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
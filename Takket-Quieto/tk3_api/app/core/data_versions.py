@@ -0,0 +1,92 @@
+"""
+Contadores de versión de datos y validación condicional (ETag / 304).
+
+Hay un ámbito global (ranking, nicks) y uno por torneo (su cuadro). Los
+servicios llaman a bump dentro de la transacción de cada escritura, y los
+routers comparan la versión actual con la cabecera If-None-Match antes de
+ejecutar las consultas del endpoint.
+"""
+
+from typing import Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .upsert import upsert
+from ..models.data_version import DataVersion
+
+GLOBAL_SCOPE = "global"
+
+
+def tournament_scope(tournament_id: int) -> str:
+    """Ámbito de versión del cuadro de un torneo."""
+    return f"tournament:{tournament_id}"
+
+
+def bump(db: Session, *scopes: str) -> None:
+    """
+    Incrementa los contadores indicados (sin commit).
+
+    Los ámbitos se actualizan en orden para que dos transacciones concurrentes
+    bloqueen las filas siempre en la misma secuencia. Un ámbito sin fila
+    todavía se crea con versión 1 en la misma sentencia (upsert), así que dos
+    primeras escrituras concurrentes no chocan con la clave primaria.
+
+    :param db: Sesión de la base de datos.
+    :param scopes: Ámbitos a incrementar.
+    """
+    for scope in sorted(set(scopes)):
+        db.execute(
+            upsert(
+                db,
+                DataVersion,
+                {"scope": scope, "version": 1},
+                {"version": DataVersion.version + 1},
+            )
+        )
+
+
+def get_versions(db: Session, *scopes: str) -> Tuple[int, ...]:
+    """
+    Lee los contadores actuales con una consulta por clave primaria.
+
+    :param db: Sesión de la base de datos.
+    :param scopes: Ámbitos a consultar.
+    :return: Versiones en el mismo orden (0 si el ámbito no existe aún).
+    """
+    found = dict(
+        db.execute(
+            select(DataVersion.scope, DataVersion.version).where(
+                DataVersion.scope.in_(scopes)
+            )
+        )
+        .tuples()
+        .all()
+    )
+    return tuple(found.get(scope, 0) for scope in scopes)
+
+
+def make_etag(*parts) -> str:
+    """Construye un ETag débil a partir de versiones u otros componentes."""
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Aplica un ETag a la respuesta y resuelve la petición condicional.
+
+    :param request: Petición entrante (cabecera If-None-Match).
+    :param response: Respuesta del endpoint, a la que se añade el ETag.
+    :param etag: ETag de la representación actual.
+    :return: Respuesta 304 si el cliente ya tiene esta versión, o None.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    # Comparación débil: se ignora el prefijo W/ de cada candidato
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(status_code=304, headers=headers)
+    return None
@@ -0,0 +1,95 @@
+"""
+Instrumentación del pool de conexiones.
+
+Registra cuántas veces se ha pedido una conexión al pool, cuánto tiempo se
+ha esperado por ella y cuántas esperas han agotado el tiempo, para poder
+diagnosticar los errores "QueuePool limit exceeded" bajo picos de tráfico.
+"""
+
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolStats:
+    """Contadores acumulados de obtención de conexiones de un pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Registra una obtención de conexión y su tiempo de espera."""
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def snapshot(self, pool: Pool) -> dict:
+        """
+        Devuelve los contadores junto con el estado actual del pool.
+
+        :param pool: Pool del motor, para leer su ocupación.
+        :return: Diccionario con contadores y medidores.
+        """
+        with self._lock:
+            stats = {
+                "pool_class": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_avg_ms": (
+                    round(self.wait_time_total * 1000 / self.checkouts, 3)
+                    if self.checkouts
+                    else 0.0
+                ),
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(0, pool.overflow()),
+            )
+        return stats
+
+
+class _InstrumentedPoolMixin:
+    """
+    Mide el tiempo de espera de cada obtención de conexión del pool. Cada
+    pool tiene sus propios contadores, que pasan al pool nuevo cuando el
+    motor lo recrea (engine.dispose()).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool del motor síncrono con medición de esperas."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Pool del motor asíncrono con medición de esperas."""
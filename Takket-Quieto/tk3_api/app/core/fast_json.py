@@ -0,0 +1,79 @@
+"""
+Serialización rápida de respuestas JSON para listados grandes.
+
+Con TK3_FAST_JSON activo, los endpoints de listado construyen sus filas
+directamente desde tuplas de consulta (diccionarios con los campos del
+esquema de respuesta, en el mismo orden) y las codifican con orjson,
+sin la validación y re-serialización por objeto de response_model. El
+response_model se mantiene en el decorador, de modo que el esquema OpenAPI
+no cambia.
+
+orjson es una dependencia opcional: si no está instalado se usa el módulo
+json estándar con la misma salida compacta.
+"""
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterable, Type
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Tipos no nativos de json: enumerados y fechas (como hace orjson)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Codifica content en JSON compacto (UTF-8)."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """Respuesta JSON codificada con orjson (o json si no está disponible)."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> list:
+    """
+    Columnas del modelo ORM correspondientes a los campos de un esquema.
+
+    Respetan el orden de los campos del esquema, de forma que los diccionarios
+    resultantes se serializan igual que la respuesta validada por Pydantic.
+
+    :param model: Clase del modelo ORM.
+    :param schema: Esquema de respuesta (response_model).
+    :return: Lista de columnas para select().
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def fast_response(content: Iterable[Any], response: Response) -> FastJSONResponse:
+    """
+    Construye la respuesta rápida conservando las cabeceras ya fijadas en el
+    endpoint (cursor de paginación, ETag).
+
+    :param content: Filas a serializar (diccionarios).
+    :param response: Respuesta inyectada del endpoint.
+    :return: Respuesta JSON final.
+    """
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return FastJSONResponse(list(content), headers=headers)
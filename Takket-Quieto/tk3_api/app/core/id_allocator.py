@@ -0,0 +1,123 @@
+"""
+Asignación de identificadores por bloques (patrón hi-lo).
+
+Cada proceso reserva un bloque de ids consecutivos en la tabla id_sequence
+con un UPDATE atómico y los reparte en memoria. Así un alta no necesita
+consultar el id máximo de la tabla, y varios workers de uvicorn nunca
+reciben el mismo id. Los ids que queden sin usar en un bloque al terminar
+el proceso se pierden, de modo que la secuencia puede tener huecos.
+"""
+
+import os
+import threading
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .config import ID_BLOCK_SIZE
+from ..models.id_sequence import IdSequence
+from ..models.player import Player
+
+
+class IdAllocator:
+    """
+    Reparte ids de una entidad a partir de bloques reservados en id_sequence.
+
+    La reserva se hace en una conexión propia que confirma de inmediato, de
+    modo que el bloque queda asignado aunque la transacción de la petición
+    falle después, y el bloqueo de la fila dura solo lo que dura el UPDATE.
+    Por eso conviene llamar a allocate antes de escribir en la sesión (en
+    SQLite la sesión retendría el bloqueo de escritura de la base de datos).
+    """
+
+    def __init__(self, name: str, id_column, block_size: int):
+        """
+        :param name: Nombre de la secuencia (fila de id_sequence).
+        :param id_column: Columna id de la entidad, para inicializar la secuencia.
+        :param block_size: Número de ids reservados en cada acceso a la tabla.
+        """
+        self.name = name
+        self.id_column = id_column
+        self.block_size = max(1, block_size)
+        self._next = 0
+        self._limit = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def allocate(self, db: Session, count: int = 1) -> range:
+        """
+        Devuelve count ids consecutivos nunca entregados a otro proceso.
+
+        Las peticiones pequeñas se sirven del bloque en memoria; las que no
+        caben en lo que queda del bloque (p. ej. una importación masiva)
+        reservan su propio rango exacto, sin descartar el bloque actual.
+
+        :param db: Sesión de la base de datos (se usa solo su motor).
+        :param count: Número de ids necesarios.
+        :return: Rango de ids reservados.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Proceso hijo (fork): el bloque heredado pertenece al padre
+                self._next = self._limit = 0
+                self._pid = os.getpid()
+
+            if self._limit - self._next >= count:
+                start = self._next
+                self._next += count
+                return range(start, start + count)
+
+            if count >= self.block_size:
+                start = self._reserve(db, count)
+                return range(start, start + count)
+
+            start = self._reserve(db, self.block_size)
+            self._next = start + count
+            self._limit = start + self.block_size
+            return range(start, start + count)
+
+    def reset(self) -> None:
+        """Descarta el bloque en memoria (el siguiente alta reserva otro)."""
+        with self._lock:
+            self._next = self._limit = 0
+
+    def _reserve(self, db: Session, count: int) -> int:
+        """
+        Reserva count ids en la tabla id_sequence y devuelve el primero.
+
+        Si la secuencia aún no existe se crea a partir del id máximo actual de
+        la entidad; si otro proceso la crea a la vez, se reintenta el UPDATE.
+        """
+        table = IdSequence.__table__
+        bind = db.get_bind()
+        engine = getattr(bind, "engine", bind)
+
+        while True:
+            with engine.begin() as conn:
+                updated = conn.execute(
+                    update(table)
+                    .where(table.c.name == self.name)
+                    .values(next_id=table.c.next_id + count)
+                ).rowcount
+                if updated:
+                    return (
+                        conn.execute(
+                            select(table.c.next_id).where(table.c.name == self.name)
+                        ).scalar_one()
+                        - count
+                    )
+
+            try:
+                with engine.begin() as conn:
+                    start = (
+                        conn.execute(select(func.max(self.id_column))).scalar() or 0
+                    ) + 1
+                    conn.execute(
+                        insert(table).values(name=self.name, next_id=start + count)
+                    )
+                    return start
+            except IntegrityError:
+                continue
+
+
+# Asignador compartido por todas las altas de jugadores del proceso
+player_ids = IdAllocator("player", Player.id, ID_BLOCK_SIZE)
@@ -0,0 +1,269 @@
+"""
+Difusión en vivo de los cambios del cuadro de un torneo (Server-Sent Events).
+
+Cada torneo con espectadores conectados tiene un canal en el proceso con el
+último estado conocido del cuadro. Un único vigilante por canal relee el
+cuadro cuando cambia y reparte a todos los espectadores la diferencia ya
+codificada, de modo que N pantallas cuestan una lectura por cambio y no N
+lecturas por sondeo.
+
+El vigilante se despierta:
+- al instante, cuando los servicios de este proceso avisan tras el commit
+  (notify_bracket_changed);
+- cada LIVE_POLL_SECONDS, para comprobar con una consulta mínima la versión
+  de datos del torneo y detectar así los cambios hechos en otros workers.
+
+Un espectador que no consume sus eventos a tiempo no bloquea a los demás:
+se descartan sus eventos pendientes y recibe de nuevo el estado completo.
+"""
+
+import asyncio
+import contextvars
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Set
+from .config import LIVE_POLL_SECONDS, LIVE_QUEUE_SIZE
+from .fast_json import dumps
+
+# Carga del estado del cuadro: {"version", "tournament", "matches"} o None
+StateLoader = Callable[[int], Awaitable[Optional[dict]]]
+# Carga de la versión de datos del cuadro
+VersionLoader = Callable[[int], Awaitable[int]]
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    """Codifica un evento en el formato de Server-Sent Events."""
+    head = f"event: {event}\n"
+    if event_id is not None:
+        head += f"id: {event_id}\n"
+    return head.encode() + b"data: " + dumps(data) + b"\n\n"
+
+
+class BracketChannel:
+    """Estado conocido del cuadro de un torneo y sus espectadores."""
+
+    def __init__(self, tournament_id: int):
+        self.tournament_id = tournament_id
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.version: Optional[int] = None
+        self.tournament: dict = {}
+        self.matches: Dict[int, dict] = {}
+        self.ready = asyncio.Event()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[bytes] = None
+
+    def load(self, state: dict) -> None:
+        """Sustituye el estado conocido (primera carga)."""
+        self.version = state["version"]
+        self.tournament = state["tournament"]
+        self.matches = {match["id"]: match for match in state["matches"]}
+        self._snapshot = None
+
+    def apply(self, state: dict) -> Optional[dict]:
+        """
+        Actualiza el estado conocido y devuelve la diferencia con el anterior.
+
+        :param state: Estado recién leído.
+        :return: Combates nuevos o cambiados (y el torneo, si ha cambiado), o
+            None si no hay cambios.
+        """
+        changed = [
+            match
+            for match in state["matches"]
+            if self.matches.get(match["id"]) != match
+        ]
+        diff = {"version": state["version"], "matches": changed}
+        if state["tournament"] != self.tournament:
+            diff["tournament"] = state["tournament"]
+        self.version = state["version"]
+        if not changed and "tournament" not in diff:
+            return None
+
+        self.tournament = state["tournament"]
+        for match in changed:
+            self.matches[match["id"]] = match
+        self._snapshot = None
+        return diff
+
+    def snapshot_event(self) -> bytes:
+        """Evento con el cuadro completo (codificado una vez por cambio)."""
+        if self._snapshot is None:
+            self._snapshot = format_event(
+                "snapshot",
+                {
+                    "version": self.version,
+                    "tournament": self.tournament,
+                    "matches": list(self.matches.values()),
+                },
+                self.version,
+            )
+        return self._snapshot
+
+    def publish(self, event: bytes) -> None:
+        """Encola un evento para todos los espectadores del canal."""
+        for queue in self.subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Espectador atascado: se descarta lo pendiente y se le
+                # reenviará el estado completo (None)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+class LiveBrackets:
+    """Canales en vivo de los cuadros de los torneos de este proceso."""
+
+    def __init__(self, poll_seconds: float, queue_size: int):
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self.channels: Dict[int, BracketChannel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loads = 0
+
+    async def subscribe(
+        self,
+        tournament_id: int,
+        load_state: StateLoader,
+        load_version: VersionLoader,
+    ) -> Optional[asyncio.Queue]:
+        """
+        Da de alta un espectador. El primero de cada torneo carga el cuadro y
+        arranca el vigilante; los siguientes reutilizan el estado en memoria.
+
+        :param tournament_id: ID del torneo.
+        :param load_state: Lectura del estado completo del cuadro.
+        :param load_version: Lectura de la versión de datos del cuadro.
+        :return: Cola de eventos del espectador (None: el torneo no existe).
+        """
+        self._loop = asyncio.get_running_loop()
+        channel = self.channels.get(tournament_id)
+        if channel is None:
+            channel = self.channels[tournament_id] = BracketChannel(tournament_id)
+            try:
+                state = await load_state(tournament_id)
+            except BaseException:
+                del self.channels[tournament_id]
+                channel.ready.set()
+                raise
+            self.loads += 1
+            if state is None:
+                del self.channels[tournament_id]
+                channel.ready.set()
+                return None
+            channel.load(state)
+            channel.ready.set()
+            # Contexto vacío: el vigilante sobrevive a la petición que lo crea y
+            # sus lecturas no deben contarse en ella (ver query_stats)
+            channel.task = contextvars.Context().run(
+                asyncio.create_task, self._watch(channel, load_state, load_version)
+            )
+        else:
+            await channel.ready.wait()
+            if self.channels.get(tournament_id) is not channel:
+                return await self.subscribe(tournament_id, load_state, load_version)
+
+        # El primer evento de cada espectador es el cuadro completo
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        queue.put_nowait(channel.snapshot_event())
+        channel.subscribers.add(queue)
+        return queue
+
+    async def events(
+        self, tournament_id: int, queue: asyncio.Queue, keepalive_seconds: float
+    ) -> AsyncIterator[bytes]:
+        """
+        Flujo de eventos de un espectador: estado completo, diferencias y
+        latidos. Al cerrarse (desconexión del cliente) da de baja al espectador.
+
+        :param tournament_id: ID del torneo.
+        :param queue: Cola devuelta por subscribe.
+        :param keepalive_seconds: Tiempo sin eventos tras el que se envía un latido.
+        """
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    channel = self.channels.get(tournament_id)
+                    if channel is None:
+                        return
+                    event = channel.snapshot_event()
+                yield event
+        finally:
+            self.unsubscribe(tournament_id, queue)
+
+    def unsubscribe(self, tournament_id: int, queue: asyncio.Queue) -> None:
+        """Da de baja un espectador; sin espectadores el canal se cierra."""
+        channel = self.channels.get(tournament_id)
+        if channel is None or queue not in channel.subscribers:
+            return
+        channel.subscribers.remove(queue)
+        if not channel.subscribers:
+            del self.channels[tournament_id]
+            if channel.task is not None:
+                channel.task.cancel()
+
+    def notify(self, tournament_ids: Iterable[int]) -> None:
+        """
+        Avisa de que el cuadro de estos torneos ha cambiado. Se puede llamar
+        desde cualquier hilo (los servicios síncronos corren en el pool).
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        for tournament_id in set(tournament_ids):
+            channel = self.channels.get(tournament_id)
+            if channel is not None:
+                loop.call_soon_threadsafe(channel.wakeup.set)
+
+    async def _watch(
+        self,
+        channel: BracketChannel,
+        load_state: StateLoader,
+        load_version: VersionLoader,
+    ) -> None:
+        """Relee el cuadro del canal cuando cambia y difunde la diferencia."""
+        tournament_id = channel.tournament_id
+        while self.channels.get(tournament_id) is channel:
+            try:
+                await asyncio.wait_for(channel.wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                try:
+                    if await load_version(tournament_id) == channel.version:
+                        continue
+                except Exception:
+                    continue
+            channel.wakeup.clear()
+
+            try:
+                state = await load_state(tournament_id)
+            except Exception:
+                continue
+            self.loads += 1
+            if state is None:
+                continue
+            diff = channel.apply(state)
+            if diff is not None:
+                channel.publish(format_event("diff", diff, diff["version"]))
+
+    def stats(self) -> dict:
+        """Canales abiertos, espectadores y lecturas del cuadro realizadas."""
+        return {
+            "channels": len(self.channels),
+            "subscribers": sum(
+                len(channel.subscribers) for channel in self.channels.values()
+            ),
+            "loads": self.loads,
+        }
+
+
+live_brackets = LiveBrackets(LIVE_POLL_SECONDS, LIVE_QUEUE_SIZE)
+
+
+def notify_bracket_changed(tournament_ids: Iterable[int]) -> None:
+    """Gancho tras confirmar cambios en el cuadro de estos torneos."""
+    live_brackets.notify(tournament_ids)
@@ -0,0 +1,563 @@
+"""
+Métricas de la API en formato de texto de Prometheus.
+
+Cada proceso acumula sus métricas en memoria (contadores, medidores e
+histogramas con un lock y sin E/S en el camino de la petición) y un hilo en
+segundo plano vuelca una instantánea a METRICS_DIR/<pid>.json cuando hay
+cambios. El endpoint /metrics, lo atienda el worker que lo atienda, suma la
+instantánea en vivo de su proceso con los ficheros del resto de workers:
+
+- Contadores e histogramas: se suman los de todos los ficheros, también los
+  de procesos ya terminados, para que los totales no retrocedan al
+  reiniciarse un worker.
+- Medidores (peticiones en curso, pool de conexiones): solo los de procesos
+  vivos. Cada fichero guarda también la hora de arranque de su proceso: un
+  pid reutilizado por otro proceso tras el fin del worker no cuenta como
+  vivo.
+
+Los ficheros de procesos terminados se retiran: sus contadores e
+histogramas se acumulan en METRICS_DIR/retired.json y el fichero se borra,
+para que el directorio no crezca con cada worker reiniciado. Las respuestas
+en streaming (SSE) no cuentan como peticiones en curso ni en la latencia:
+duran lo que dure la conexión del cliente.
+"""
+
+import atexit
+import bisect
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from .config import METRICS_DIR, METRICS_FLUSH_SECONDS
+from .db import async_engine, engine
+from .db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - depende del entorno
+    fcntl = None
+
+# Límites de los histogramas de latencia (segundos), los de Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Fichero con los totales de los procesos terminados y su lock
+RETIRED_FILE = "retired.json"
+RETIRED_LOCK = "retired.lock"
+
+# Tipos de contenido de las respuestas en streaming
+STREAMING_CONTENT_TYPES = (b"text/event-stream",)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    """Métrica con nombre, ayuda y etiquetas; los valores van por etiquetas."""
+
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, labels):
+        self.name = name
+        self.help = help
+        self.label_names: Labels = tuple(labels)
+        self._lock = registry.lock
+        self._registry = registry
+        self._values: Dict[Labels, object] = {}
+        registry.metrics.append(self)
+
+
+class Counter(_Metric):
+    """Contador acumulado."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+            self._registry.dirty = True
+
+    def set_total(self, *labels: str, value: float) -> None:
+        """Fija el total del proceso (para contadores que se llevan en otro sitio)."""
+        with self._lock:
+            if self._values.get(labels) != value:
+                self._values[labels] = value
+                self._registry.dirty = True
+
+
+class Gauge(Counter):
+    """Medidor: valor instantáneo que puede subir y bajar."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Histograma acumulado con límites fijos."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labels, buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # Cuentas por tramo (sin acumular; el último es +Inf), suma
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+            self._registry.dirty = True
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas de un proceso y su volcado a disco para agregarlas
+    entre workers.
+    """
+
+    def __init__(self, directory: Optional[str], flush_seconds: float):
+        """
+        :param directory: Directorio compartido por los workers (None: solo
+            las métricas del proceso actual).
+        :param flush_seconds: Intervalo del volcado a disco.
+        """
+        self.lock = threading.Lock()
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], None]] = []
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self.dirty = False
+        self._pid: Optional[int] = None
+        self._start_time: Optional[int] = None
+
+    def counter(self, name: str, help: str, labels=()) -> Counter:
+        return Counter(self, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels=()) -> Gauge:
+        return Gauge(self, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels=()) -> Histogram:
+        return Histogram(self, name, help, labels)
+
+    def start(self) -> None:
+        """
+        Arranca el volcado periódico en este proceso. Es idempotente y, tras
+        un fork, vuelve a arrancarlo en el proceso hijo con contadores a cero.
+        """
+        if self.directory is None or self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                for metric in self.metrics:
+                    metric._values.clear()
+            self._pid = os.getpid()
+            self._start_time = _process_start_time(self._pid)
+        os.makedirs(self.directory, exist_ok=True)
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self) -> None:
+        # Retira de entrada los ficheros de procesos terminados, entre ellos
+        # el de un proceso anterior con el mismo pid que este
+        self._load_others()
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self) -> None:
+        """Vuelca la instantánea del proceso a su fichero si ha cambiado."""
+        for collect in self.collectors:
+            collect()
+        with self.lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+        data = {"start_time": self._start_time, "metrics": self.snapshot()}
+        _write_json(os.path.join(self.directory, f"{os.getpid()}.json"), data)
+
+    def snapshot(self) -> dict:
+        """Valores actuales del proceso: {métrica: [[etiquetas, valor], ...]}."""
+        with self.lock:
+            return {
+                metric.name: [
+                    [list(labels), _copy(value)]
+                    for labels, value in metric._values.items()
+                ]
+                for metric in self.metrics
+            }
+
+    def _worker_files(self) -> List[Tuple[str, bool, dict]]:
+        """
+        Ficheros de los workers del directorio, salvo el de este proceso.
+
+        :return: Lista de (nombre, vivo, instantánea).
+        """
+        files = []
+        for filename in os.listdir(self.directory):
+            pid, ext = os.path.splitext(filename)
+            if ext != ".json" or not pid.isdigit():
+                continue
+            data = _read_json(os.path.join(self.directory, filename))
+            if data is None:
+                continue
+            if "metrics" not in data:
+                # Fichero de una versión anterior: solo la instantánea
+                data = {"start_time": None, "metrics": data}
+            if int(pid) == os.getpid():
+                # Solo puede ser de un proceso anterior con el mismo pid
+                if self._start_time is None or data["start_time"] == self._start_time:
+                    continue
+                alive = False
+            else:
+                alive = _process_alive(int(pid), data["start_time"])
+            files.append((filename, alive, data["metrics"]))
+        return files
+
+    @contextlib.contextmanager
+    def _directory_lock(self):
+        """
+        Lock de fichero del directorio, para que dos workers no retiren a la
+        vez el mismo fichero. Sin fcntl (Windows) no hay lock.
+
+        :return: True si se ha tomado el lock.
+        """
+        if fcntl is None:
+            yield False
+            return
+        with open(os.path.join(self.directory, RETIRED_LOCK), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield True
+
+    def _load_others(self) -> List[Tuple[bool, dict]]:
+        """
+        Instantáneas de los demás procesos y de los ya retirados, retirando
+        antes los ficheros de procesos terminados.
+
+        :return: Lista de (vivo, instantánea).
+        """
+        if self.directory is None or not os.path.isdir(self.directory):
+            return []
+        with self._directory_lock() as locked:
+            files = self._worker_files()
+            if locked:
+                files = self._retire(files)
+            retired = _read_json(os.path.join(self.directory, RETIRED_FILE))
+        others = [(alive, snapshot) for _, alive, snapshot in files]
+        if retired is not None:
+            others.append((False, retired["metrics"]))
+        return others
+
+    def _retire(self, files: List[Tuple[str, bool, dict]]):
+        """
+        Acumula en retired.json los contadores e histogramas de los ficheros
+        de procesos terminados y los borra (sus medidores se descartan). Se
+        llama con el lock del directorio tomado.
+
+        :param files: Ficheros leídos por _worker_files.
+        :return: Los ficheros de procesos vivos.
+        """
+        dead = [
+            (filename, snapshot) for filename, alive, snapshot in files if not alive
+        ]
+        if not dead:
+            return files
+        path = os.path.join(self.directory, RETIRED_FILE)
+        retired = _read_json(path) or {"metrics": {}}
+        sources = [retired["metrics"]] + [snapshot for _, snapshot in dead]
+        merged = {}
+        for metric in self.metrics:
+            if metric.kind == "gauge":
+                continue
+            values = _merge(metric, sources)
+            if values:
+                merged[metric.name] = [
+                    [list(labels), value] for labels, value in values.items()
+                ]
+        _write_json(path, {"metrics": merged})
+        for filename, _ in dead:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+        return [entry for entry in files if entry[1]]
+
+    def render(self) -> str:
+        """
+        Genera el texto de exposición de Prometheus con las métricas de
+        todos los workers.
+
+        :return: Texto en formato text/plain; version=0.0.4.
+        """
+        for collect in self.collectors:
+            collect()
+        sources = [(True, self.snapshot())] + self._load_others()
+
+        lines = []
+        for metric in self.metrics:
+            merged = _merge(
+                metric,
+                [
+                    snapshot
+                    for alive, snapshot in sources
+                    if alive or metric.kind != "gauge"
+                ],
+            )
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, value in sorted(merged.items()):
+                pairs = list(zip(metric.label_names, labels))
+                if metric.kind != "histogram":
+                    lines.append(f"{metric.name}{_labels(pairs)} {_number(value)}")
+                    continue
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip(metric.buckets + ("+Inf",), counts):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _number(bound)
+                    lines.append(
+                        f"{metric.name}_bucket{_labels(pairs + [('le', le)])} "
+                        f"{cumulative}"
+                    )
+                lines.append(f"{metric.name}_sum{_labels(pairs)} {_number(total)}")
+                lines.append(f"{metric.name}_count{_labels(pairs)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def default_directory() -> str:
+    """
+    Directorio de métricas por defecto (TK3_METRICS_DIR=auto), propio de
+    cada arranque del servidor.
+
+    Se identifica por el grupo de procesos, que comparten el proceso
+    principal de uvicorn/gunicorn y sus workers, y por la hora de arranque
+    de su líder: un servidor reiniciado (aunque lo relance el mismo
+    supervisor o el pid del grupo se reutilice) empieza con un directorio
+    nuevo en lugar de seguir sumando los ficheros del anterior.
+    """
+    group = os.getpgrp() if hasattr(os, "getpgrp") else os.getpid()
+    started = _process_start_time(group) or 0
+    return os.path.join(tempfile.gettempdir(), f"tk3_metrics_{group}_{started}")
+
+
+def _merge(metric: _Metric, snapshots: List[dict]) -> Dict[Labels, object]:
+    """
+    Suma los valores de una métrica en varias instantáneas.
+
+    :param metric: Métrica a sumar.
+    :param snapshots: Instantáneas ({métrica: [[etiquetas, valor], ...]}).
+    :return: Valores sumados por etiquetas.
+    """
+    merged: Dict[Labels, object] = {}
+    for snapshot in snapshots:
+        for labels, value in snapshot.get(metric.name, []):
+            key = tuple(labels)
+            if metric.kind == "histogram":
+                total = merged.setdefault(key, [[0] * (len(metric.buckets) + 1), 0.0])
+                total[0] = [a + b for a, b in zip(total[0], value[0])]
+                total[1] += value[1]
+            else:
+                merged[key] = merged.get(key, 0.0) + value
+    return merged
+
+
+def _read_json(path: str) -> Optional[dict]:
+    """Lee un fichero JSON del directorio de métricas (None si no existe o está dañado)."""
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: dict) -> None:
+    """Escribe un fichero JSON de forma atómica (fichero temporal y rename)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as handle:
+        json.dump(data, handle)
+    os.replace(tmp_path, path)
+
+
+def _process_alive(pid: int, start_time: Optional[int] = None) -> bool:
+    """
+    Indica si sigue vivo el proceso que escribió un fichero de métricas.
+
+    :param pid: Pid del proceso.
+    :param start_time: Hora de arranque guardada en el fichero (None si la
+        plataforma no la ofrece: solo se comprueba el pid).
+    :return: True si el pid existe y, si se conoce, arrancó a esa hora.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return start_time is None or _process_start_time(pid) == start_time
+
+
+def _process_start_time(pid: int) -> Optional[int]:
+    """
+    Hora de arranque de un proceso (en ticks desde el arranque del sistema,
+    campo starttime de /proc/<pid>/stat), o None fuera de Linux.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as handle:
+            stat = handle.read()
+    except OSError:
+        return None
+    # El nombre del proceso (campo 2, entre paréntesis) puede contener
+    # espacios: los campos se cuentan tras el último ")"; starttime es el 22
+    return int(stat[stat.rindex(b")") + 2 :].split()[19])
+
+
+def _copy(value):
+    """Copia un valor de métrica (los de histograma son mutables)."""
+    if isinstance(value, list):
+        return [list(value[0]), value[1]]
+    return value
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    escaped = (
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+metrics = MetricsRegistry(
+    default_directory() if METRICS_DIR == "auto" else METRICS_DIR,
+    METRICS_FLUSH_SECONDS,
+)
+
+# Peticiones HTTP
+http_requests = metrics.counter(
+    "tk3_http_requests_total",
+    "HTTP requests by route, method and status code.",
+    ("route", "method", "status"),
+)
+http_latency = metrics.histogram(
+    "tk3_http_request_duration_seconds",
+    "HTTP request latency by route and method.",
+    ("route", "method"),
+)
+http_in_flight = metrics.gauge(
+    "tk3_http_requests_in_flight", "HTTP requests currently being served."
+)
+
+# Pool de conexiones
+pool_checked_out = metrics.gauge(
+    "tk3_db_pool_checked_out", "Connections checked out from the pool.", ("engine",)
+)
+pool_overflow = metrics.gauge(
+    "tk3_db_pool_overflow", "Connections open beyond the pool size.", ("engine",)
+)
+pool_size = metrics.gauge("tk3_db_pool_size", "Configured pool size.", ("engine",))
+pool_checkouts = metrics.counter(
+    "tk3_db_pool_checkouts_total", "Connection checkouts from the pool.", ("engine",)
+)
+pool_timeouts = metrics.counter(
+    "tk3_db_pool_timeouts_total",
+    "Connection checkouts that timed out waiting for the pool.",
+    ("engine",),
+)
+
+# Eventos de dominio
+matches_resolved = metrics.counter(
+    "tk3_matches_resolved_total", "Matches resolved through result submission."
+)
+brackets_generated = metrics.counter(
+    "tk3_brackets_generated_total", "Tournament brackets generated."
+)
+rounds_generated = metrics.counter(
+    "tk3_rounds_generated_total", "Tournament rounds generated after the first one."
+)
+
+
+def _collect_pool() -> None:
+    """Copia el estado del pool de cada motor en los medidores."""
+    engines = [("sync", engine.pool)]
+    if async_engine is not None:
+        engines.append(("async", async_engine.pool))
+    for name, pool in engines:
+        if not isinstance(pool, (InstrumentedQueuePool, InstrumentedAsyncQueuePool)):
+            continue
+        pool_checked_out.set_total(name, value=pool.checkedout())
+        pool_overflow.set_total(name, value=max(0, pool.overflow()))
+        pool_size.set_total(name, value=pool.size())
+        pool_checkouts.set_total(name, value=pool.stats.checkouts)
+        pool_timeouts.set_total(name, value=pool.stats.timeouts)
+
+
+metrics.collectors.append(_collect_pool)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide cada petición HTTP: contador por ruta, método y
+    código, histograma de latencia y peticiones en curso.
+
+    La ruta es la plantilla del endpoint (/tournaments/{tournament_id}), no
+    la URL, para que el número de series no crezca con los ids. Las
+    respuestas en streaming (text/event-stream) se cuentan, pero dejan de
+    estar en curso al empezar a enviarse y no entran en el histograma.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics.start()
+        status = [500]
+        streaming = [False]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                if _is_streaming(message):
+                    streaming[0] = True
+                    http_in_flight.dec()
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_requests.inc(path, scope["method"], str(status[0]))
+            if not streaming[0]:
+                http_in_flight.dec()
+                http_latency.observe(elapsed, path, scope["method"])
+
+
+def _is_streaming(message: dict) -> bool:
+    """Indica si el inicio de respuesta ASGI es de una respuesta en streaming."""
+    for name, value in message.get("headers", []):
+        if name.lower() == b"content-type":
+            return value.split(b";")[0].strip().lower() in STREAMING_CONTENT_TYPES
+    return False
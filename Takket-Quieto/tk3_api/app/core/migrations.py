@@ -0,0 +1,270 @@
+"""
+Ejecutor de migraciones de esquema versionadas.
+
+Cada migración tiene un número de versión y una función que recibe una
+conexión abierta. Las versiones aplicadas se registran en la tabla
+schema_version, de modo que ejecutar el comando varias veces solo aplica
+las pendientes. Todas las migraciones son idempotentes (comprueban antes de
+crear) para funcionar tanto sobre la base de datos existente en MariaDB como
+sobre una base de datos nueva.
+"""
+
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from .db import Base
+
+# Tabla de control, fuera de Base para que no forme parte del modelo de dominio
+_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    """Migración de esquema identificada por su número de versión."""
+
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _create_table_if_missing(conn: Connection, table_name: str) -> None:
+    """Crea una tabla del modelo (con sus índices) si aún no existe."""
+    Base.metadata.tables[table_name].create(bind=conn, checkfirst=True)
+
+
+def _create_indexes_if_missing(
+    conn: Connection, table_name: str, names: List[str]
+) -> None:
+    """Crea los índices del modelo indicados que aún no existan en la tabla."""
+    table = Base.metadata.tables[table_name]
+    existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+    for index in table.indexes:
+        if index.name in names and index.name not in existing:
+            index.create(bind=conn)
+
+
+def _drop_indexes_if_present(
+    conn: Connection, table_name: str, names: List[str]
+) -> None:
+    """Elimina los índices indicados que existan en la tabla."""
+    existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+    # Tabla mínima solo para generar el DROP INDEX de cada dialecto (MariaDB
+    # necesita la tabla: DROP INDEX ... ON tabla); las columnas no se usan
+    table = Table(table_name, MetaData(), Column("id", Integer))
+    for name in names:
+        if name in existing:
+            Index(name, table.c.id).drop(bind=conn)
+
+
+def _add_column_if_missing(conn: Connection, table_name: str, ddl: str) -> None:
+    """Añade una columna (definida en DDL) si la tabla aún no la tiene."""
+    column_name = ddl.split()[0]
+    existing = {column["name"] for column in inspect(conn).get_columns(table_name)}
+    if column_name not in existing:
+        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {ddl}"))
+
+
+def _initial_schema(conn: Connection) -> None:
+    for table_name in ("player", "tournament", "tournament_player", "match"):
+        _create_table_if_missing(conn, table_name)
+
+
+def _player_stats(conn: Connection) -> None:
+    _create_table_if_missing(conn, "player_stats")
+
+    # Backfill desde el historial (el ranking se lee solo de player_stats):
+    # victorias de cada ganador (BYEs incluidos) y derrotas de quien jugó un
+    # combate resuelto contra un rival real y no ganó
+    exists = conn.execute(text("SELECT COUNT(*) FROM player_stats")).scalar()
+    if not exists:
+        conn.execute(
+            text(
+                "INSERT INTO player_stats"
+                " (player_id, wins, losses, matches_played)"
+                " SELECT p.player_id, SUM(p.win), SUM(p.loss), SUM(p.win + p.loss)"
+                " FROM ("
+                "  SELECT winner_id AS player_id, 1 AS win, 0 AS loss FROM `match`"
+                "  WHERE status = 'RESOLVED' AND winner_id IS NOT NULL"
+                "  UNION ALL"
+                "  SELECT player1_id, 0, 1 FROM `match`"
+                "  WHERE status = 'RESOLVED' AND player1_id IS NOT NULL"
+                "  AND player2_id IS NOT NULL AND winner_id <> player1_id"
+                "  UNION ALL"
+                "  SELECT player2_id, 0, 1 FROM `match`"
+                "  WHERE status = 'RESOLVED' AND player1_id IS NOT NULL"
+                "  AND player2_id IS NOT NULL AND winner_id <> player2_id"
+                " ) p GROUP BY p.player_id"
+            )
+        )
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    _create_indexes_if_missing(
+        conn,
+        "match",
+        ["ix_match_tournament_round_position"],
+    )
+    _create_indexes_if_missing(
+        conn, "tournament_player", ["ix_tournament_player_player"]
+    )
+
+
+def _tournament_progress(conn: Connection) -> None:
+    _add_column_if_missing(
+        conn, "tournament", "current_round INTEGER NOT NULL DEFAULT 0"
+    )
+    _add_column_if_missing(
+        conn, "tournament", "pending_matches INTEGER NOT NULL DEFAULT 0"
+    )
+
+    # Backfill: última ronda generada y combates pendientes de esa ronda
+    conn.execute(
+        text(
+            "UPDATE tournament SET current_round = ("
+            " SELECT COALESCE(MAX(m.round), 0) FROM `match` m"
+            " WHERE m.tournament_id = tournament.id)"
+        )
+    )
+    conn.execute(
+        text(
+            "UPDATE tournament SET pending_matches = ("
+            " SELECT COUNT(*) FROM `match` m"
+            " WHERE m.tournament_id = tournament.id"
+            " AND m.round = tournament.current_round"
+            " AND m.status = 'PENDING')"
+        )
+    )
+
+
+def _tournament_auto_advance(conn: Connection) -> None:
+    _add_column_if_missing(
+        conn, "tournament", "auto_advance BOOLEAN NOT NULL DEFAULT 0"
+    )
+
+
+def _id_sequence(conn: Connection) -> None:
+    _create_table_if_missing(conn, "id_sequence")
+
+    # Siembra la secuencia de jugadores a partir del id máximo existente
+    exists = conn.execute(
+        text("SELECT COUNT(*) FROM id_sequence WHERE name = 'player'")
+    ).scalar()
+    if not exists:
+        conn.execute(
+            text(
+                "INSERT INTO id_sequence (name, next_id)"
+                " SELECT 'player', COALESCE(MAX(id), 0) + 1 FROM player"
+            )
+        )
+
+
+def _data_version(conn: Connection) -> None:
+    _create_table_if_missing(conn, "data_version")
+
+    # El ámbito global se crea de antemano: lo incrementan casi todas las escrituras
+    exists = conn.execute(
+        text("SELECT COUNT(*) FROM data_version WHERE scope = 'global'")
+    ).scalar()
+    if not exists:
+        conn.execute(
+            text("INSERT INTO data_version (scope, version) VALUES ('global', 1)")
+        )
+
+
+# Índices que creaba la versión 3 sin que ninguna consulta de los servicios
+# los use: solo encarecían cada INSERT/UPDATE de combates
+_UNUSED_MATCH_INDEXES = [
+    "ix_match_tournament_round_status",
+    "ix_match_winner_status",
+    "ix_match_player1_status",
+    "ix_match_player2_status",
+]
+
+
+def _drop_unused_match_indexes(conn: Connection) -> None:
+    _drop_indexes_if_present(conn, "match", _UNUSED_MATCH_INDEXES)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "initial_schema", _initial_schema),
+    Migration(2, "player_stats", _player_stats),
+    Migration(3, "hot_path_indexes", _hot_path_indexes),
+    Migration(4, "tournament_progress", _tournament_progress),
+    Migration(5, "tournament_auto_advance", _tournament_auto_advance),
+    Migration(6, "id_sequence", _id_sequence),
+    Migration(7, "data_version", _data_version),
+    Migration(8, "drop_unused_match_indexes", _drop_unused_match_indexes),
+]
+
+
+def _load_models() -> None:
+    """Importa todos los modelos para que estén registrados en Base.metadata."""
+    from ..models import (  # noqa: F401
+        data_version,
+        id_sequence,
+        match,
+        player,
+        player_stats,
+        tournament,
+        tournament_player,
+    )
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    """
+    Devuelve las versiones de esquema ya aplicadas.
+
+    :param engine: Motor de conexión a la base de datos.
+    :return: Lista ordenada de números de versión.
+    """
+    with engine.begin() as conn:
+        schema_version.create(bind=conn, checkfirst=True)
+        return sorted(conn.execute(select(schema_version.c.version)).scalars())
+
+
+def upgrade(engine: Engine) -> List[Migration]:
+    """
+    Aplica en orden todas las migraciones pendientes.
+
+    Cada migración se ejecuta en su propia transacción junto con su registro
+    en schema_version.
+
+    :param engine: Motor de conexión a la base de datos.
+    :return: Lista de migraciones aplicadas en esta ejecución.
+    """
+    _load_models()
+    done = set(applied_versions(engine))
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version in done:
+            continue
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(
+                schema_version.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.utcnow(),
+                )
+            )
+        applied.append(migration)
+    return applied
@@ -0,0 +1,72 @@
+"""
+Utilidades de paginación por cursor (keyset).
+
+Las listas se recorren en un orden estable (por id, o por ronda y posición
+en los cuadros) y cada página devuelve un cursor opaco con la clave del
+último elemento. La siguiente página filtra "clave > cursor" sobre el índice,
+así que su coste no depende de cuántas páginas se hayan leído antes.
+
+El cursor de la siguiente página se envía en la cabecera X-Next-Cursor; si
+no aparece, no hay más resultados.
+"""
+
+import base64
+import json
+from typing import Any, Callable, List, Optional, Tuple
+from fastapi import Response
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key: Tuple[int, ...]) -> str:
+    """Codifica la clave de ordenación de un elemento como cursor opaco."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[Tuple[int, ...]]:
+    """
+    Decodifica un cursor recibido del cliente.
+
+    :param cursor: Cursor opaco (o None para la primera página).
+    :param size: Número de componentes enteros que debe tener la clave.
+    :return: Tupla con la clave o None si no hay cursor.
+    :raises ValueError: Si el cursor no es válido.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (
+        not isinstance(key, list)
+        or len(key) != size
+        or not all(type(value) is int for value in key)
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
+
+def paginate(
+    response: Response,
+    items: List[Any],
+    limit: int,
+    key: Callable[[Any], Tuple[int, ...]],
+) -> List[Any]:
+    """
+    Recorta una página leída con limit + 1 elementos y publica el siguiente cursor.
+
+    :param response: Respuesta HTTP donde se añade la cabecera X-Next-Cursor.
+    :param items: Elementos leídos (hasta limit + 1).
+    :param limit: Tamaño de página solicitado.
+    :param key: Función que extrae la clave de ordenación de un elemento.
+    :return: Los elementos de la página (como mucho limit).
+    """
+    if len(items) > limit:
+        items = items[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(items[-1]))
+    return items
@@ -0,0 +1,168 @@
+"""
+Caché local al proceso de la identidad de los jugadores.
+
+Los nicks y logos se consultan en casi todos los informes y vistas del cuadro,
+pero los jugadores cambian muy poco. Esta caché LRU con caducidad (TTL)
+evita repetir esas lecturas; el servicio de jugadores la refresca en cada
+escritura (write-through) y el tamaño máximo mantiene la memoria acotada.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+from .config import PLAYER_CACHE_MAX_SIZE, PLAYER_CACHE_TTL_SECONDS
+from ..models.player import Player
+
+# Tamaño máximo de cada consulta IN al cargar fallos de caché
+_LOAD_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class CachedPlayer:
+    """Identidad inmutable de un jugador tal y como se guarda en la caché."""
+
+    id: int
+    nick: str
+    logo_url: Optional[str]
+    active: bool
+
+
+class PlayerCache:
+    """
+    Caché LRU + TTL de id de jugador -> CachedPlayer.
+
+    Es segura entre hilos (FastAPI ejecuta los endpoints síncronos en un
+    pool de hilos) y expone contadores de aciertos, fallos y desalojos.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Escrituras (put, invalidate, clear) desde el arranque: una carga de
+        # la base de datos no se guarda si ha habido alguna durante la lectura
+        self._writes = 0
+
+    def get(self, db: Session, player_id: int) -> Optional[CachedPlayer]:
+        """
+        Devuelve la identidad de un jugador, cargándola de la base de datos si falta.
+
+        :param db: Sesión de la base de datos (solo se usa en caso de fallo).
+        :param player_id: Identificador del jugador.
+        :return: CachedPlayer o None si el jugador no existe.
+        """
+        return self.get_many(db, [player_id]).get(player_id)
+
+    def get_many(
+        self, db: Session, player_ids: Iterable[int]
+    ) -> Dict[int, CachedPlayer]:
+        """
+        Resuelve varios jugadores a la vez; los fallos se cargan con consultas IN.
+
+        Si durante la lectura otra petición refresca la caché (put tras una
+        escritura), las filas leídas se devuelven pero no se guardan: podrían
+        ser anteriores a esa escritura y taparla hasta que caduque.
+
+        :param db: Sesión de la base de datos (solo se usa en caso de fallo).
+        :param player_ids: Identificadores a resolver.
+        :return: Diccionario id -> CachedPlayer de los jugadores existentes.
+        """
+        found: Dict[int, CachedPlayer] = {}
+        missing = []
+        now = time.monotonic()
+
+        with self._lock:
+            writes = self._writes
+            for player_id in set(player_ids):
+                entry = self._entries.get(player_id)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(player_id)
+                    found[player_id] = entry[0]
+                    self.hits += 1
+                else:
+                    missing.append(player_id)
+                    self.misses += 1
+
+        for start in range(0, len(missing), _LOAD_CHUNK_SIZE):
+            chunk = missing[start : start + _LOAD_CHUNK_SIZE]
+            rows = (
+                db.query(Player.id, Player.nick, Player.logo_url, Player.active)
+                .filter(Player.id.in_(chunk))
+                .all()
+            )
+            for row in rows:
+                cached = CachedPlayer(
+                    id=row.id, nick=row.nick, logo_url=row.logo_url, active=row.active
+                )
+                found[row.id] = cached
+                self._store(cached, writes)
+
+        return found
+
+    def put(self, player: Player) -> None:
+        """
+        Refresca la entrada de un jugador tras una escritura (write-through).
+
+        :param player: Jugador recién persistido.
+        """
+        cached = CachedPlayer(
+            id=player.id,
+            nick=player.nick,
+            logo_url=player.logo_url,
+            active=player.active,
+        )
+        with self._lock:
+            self._writes += 1
+        self._store(cached)
+
+    def invalidate(self, player_id: int) -> None:
+        """Elimina la entrada de un jugador, si existe."""
+        with self._lock:
+            self._writes += 1
+            self._entries.pop(player_id, None)
+
+    def clear(self) -> None:
+        """Vacía la caché por completo (los contadores se conservan)."""
+        with self._lock:
+            self._writes += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Devuelve los contadores y la ocupación actual de la caché."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _store(self, cached: CachedPlayer, writes: Optional[int] = None) -> None:
+        """
+        Inserta o refresca una entrada respetando el tamaño máximo.
+
+        :param cached: Identidad del jugador.
+        :param writes: Contador de escrituras leído antes de cargar la fila de
+            la base de datos; si ha cambiado, la fila puede estar obsoleta y
+            no se guarda (None: la guarda siempre, como en put).
+        """
+        with self._lock:
+            if writes is not None and writes != self._writes:
+                return
+            self._entries[cached.id] = (cached, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(cached.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+# Instancia compartida por todos los servicios del proceso
+player_cache = PlayerCache(PLAYER_CACHE_MAX_SIZE, PLAYER_CACHE_TTL_SECONDS)
@@ -0,0 +1,276 @@
+"""
+Instrumentación de las sentencias SQL de cada petición.
+
+Los eventos del motor (before/after_cursor_execute) acumulan en el objeto
+QueryStats de la petición en curso (una ContextVar) el número de sentencias,
+el tiempo total en la base de datos y la sentencia más lenta. La variable se
+propaga tanto al pool de hilos (sesión síncrona) como a run_sync (sesión
+asíncrona), así que cuenta lo mismo en las dos pilas.
+
+QueryStatsMiddleware abre un contador por petición, lo publica como cabeceras
+X-DB-* en modo depuración y lo escribe como log estructurado (JSON). Avisa
+además cuando una petición supera un número de sentencias o repite la misma
+sentencia parametrizada demasiadas veces (patrón N+1).
+
+query_budget es la guarda para tests: falla con QueryBudgetExceeded si algún
+bloque o petición supera el presupuesto declarado.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import DEBUG, QUERY_WARN_COUNT, QUERY_WARN_REPEATS
+
+logger = logging.getLogger("tk3.queries")
+
+# Cabeceras de depuración con las métricas de la petición
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+QUERY_SLOWEST_HEADER = "X-DB-Slowest-Ms"
+DEBUG_HEADERS = [QUERY_COUNT_HEADER, QUERY_TIME_HEADER, QUERY_SLOWEST_HEADER]
+
+# Longitud máxima de las sentencias incluidas en logs y mensajes
+_STATEMENT_PREVIEW = 200
+
+
+class QueryStats:
+    """Sentencias ejecutadas dentro de una petición o bloque medido."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Registra una sentencia y su duración."""
+        with self._lock:
+            self.count += 1
+            self.total_time += seconds
+            self.statements[statement] += 1
+            if seconds >= self.slowest_time:
+                self.slowest_time = seconds
+                self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Devuelve las sentencias ejecutadas más de threshold veces.
+
+        :param threshold: Repeticiones permitidas por sentencia parametrizada.
+        :return: Pares (sentencia, veces), de más a menos repetida.
+        """
+        with self._lock:
+            return [
+                (statement, times)
+                for statement, times in self.statements.most_common()
+                if times > threshold
+            ]
+
+    def summary(self) -> dict:
+        """Resumen serializable para logs y mensajes de error."""
+        with self._lock:
+            top = self.statements.most_common(1)
+            return {
+                "queries": self.count,
+                "db_time_ms": round(self.total_time * 1000, 3),
+                "slowest_ms": round(self.slowest_time * 1000, 3),
+                "slowest_statement": _preview(self.slowest_statement),
+                "most_repeated": _preview(top[0][0]) if top else None,
+                "most_repeated_times": top[0][1] if top else 0,
+            }
+
+
+def _preview(statement: Optional[str]) -> Optional[str]:
+    if statement is None:
+        return None
+    statement = " ".join(statement.split())
+    if len(statement) > _STATEMENT_PREVIEW:
+        return statement[:_STATEMENT_PREVIEW] + "..."
+    return statement
+
+
+# Contador activo en el contexto actual (None fuera de peticiones y guardas)
+_current: ContextVar[Optional[QueryStats]] = ContextVar("tk3_query_stats", default=None)
+
+# Funciones avisadas con el QueryStats de cada petición terminada
+_observers: List[Callable[[QueryStats], None]] = []
+_observers_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("tk3_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        starts = conn.info.get("tk3_query_start")
+        if starts:
+            stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    # Sentencia fallida: after_cursor_execute no llega a ejecutarse, así que
+    # se retira aquí su marca de inicio (si no, la lista crece con cada error
+    # y las mediciones siguientes de la conexión se desplazan)
+    conn = exception_context.connection
+    starts = conn.info.get("tk3_query_start") if conn is not None else None
+    if starts:
+        started = starts.pop()
+        stats = _current.get()
+        if stats is not None and exception_context.statement is not None:
+            stats.record(exception_context.statement, time.perf_counter() - started)
+
+
+def instrument(engine: Engine) -> None:
+    """
+    Registra los eventos de medición en un motor síncrono (para el motor
+    asíncrono, pasar async_engine.sync_engine).
+
+    :param engine: Motor de SQLAlchemy.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def capture() -> Iterator[QueryStats]:
+    """
+    Mide las sentencias ejecutadas dentro del bloque.
+
+    :return: QueryStats que se va rellenando durante el bloque.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Un bloque o petición ha superado su presupuesto de sentencias."""
+
+
+@contextmanager
+def query_budget(
+    max_queries: int, max_repeats: Optional[int] = None
+) -> Iterator[QueryStats]:
+    """
+    Guarda para tests: falla si el bloque, o cualquier petición atendida
+    durante el bloque (p. ej. con TestClient), supera el presupuesto.
+
+    Ejemplo:
+        with query_budget(5, max_repeats=1):
+            client.get("/reports/leaderboard")
+
+    :param max_queries: Sentencias permitidas por petición (y fuera de ellas).
+    :param max_repeats: Veces que se permite repetir la misma sentencia
+        parametrizada; None para no comprobarlo.
+    :return: QueryStats de las sentencias ejecutadas fuera de peticiones.
+    :raises QueryBudgetExceeded: Si se supera el presupuesto.
+    """
+    requests: List[QueryStats] = []
+    with _observers_lock:
+        _observers.append(requests.append)
+    try:
+        with capture() as stats:
+            yield stats
+    finally:
+        with _observers_lock:
+            _observers.remove(requests.append)
+
+    problems = []
+    for measured in [stats, *requests]:
+        if measured.count > max_queries:
+            problems.append(
+                f"{measured.count} queries (budget {max_queries}); "
+                f"slowest: {_preview(measured.slowest_statement)}"
+            )
+        if max_repeats is not None:
+            for statement, times in measured.repeated(max_repeats):
+                problems.append(
+                    f"statement repeated {times} times (max {max_repeats}): "
+                    f"{_preview(statement)}"
+                )
+    if problems:
+        raise QueryBudgetExceeded("Query budget exceeded:\n" + "\n".join(problems))
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI que mide las sentencias SQL de cada petición HTTP.
+
+    Las cabeceras solo reflejan las sentencias ejecutadas antes de empezar la
+    respuesta; en las respuestas en streaming el log incluye también las del
+    envío del cuerpo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if DEBUG and message["type"] == "http.response.start":
+                summary = stats.summary()
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (QUERY_COUNT_HEADER.lower().encode(), b"%d" % summary["queries"]),
+                    (
+                        QUERY_TIME_HEADER.lower().encode(),
+                        b"%.3f" % summary["db_time_ms"],
+                    ),
+                    (
+                        QUERY_SLOWEST_HEADER.lower().encode(),
+                        b"%.3f" % summary["slowest_ms"],
+                    ),
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        with capture() as stats:
+            await self.app(scope, receive, send_with_headers)
+        _report(scope, stats, time.perf_counter() - start)
+
+
+def _report(scope, stats: QueryStats, elapsed: float) -> None:
+    """Avisa a los observadores y escribe el log estructurado de la petición."""
+    with _observers_lock:
+        observers = list(_observers)
+    for observer in observers:
+        observer(stats)
+
+    repeated = stats.repeated(QUERY_WARN_REPEATS)
+    suspicious = stats.count > QUERY_WARN_COUNT or repeated
+    level = logging.WARNING if suspicious else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+
+    record = {
+        "event": "db_queries",
+        "method": scope["method"],
+        "path": scope["path"],
+        "duration_ms": round(elapsed * 1000, 3),
+        **stats.summary(),
+    }
+    if repeated:
+        record["n_plus_one"] = [
+            {"statement": _preview(statement), "times": times}
+            for statement, times in repeated
+        ]
+    logger.log(level, json.dumps(record))
@@ -0,0 +1,444 @@
+"""
+Caché de respuestas de los informes (ranking, historial de torneos y
+probabilidades de los torneos en juego).
+
+Guarda el JSON ya serializado de cada informe con caducidad (TTL) y
+desalojo LRU. Hay dos backends intercambiables:
+
+- memory: diccionario local al proceso; el más rápido, pero cada worker
+  tiene su propia copia y solo ve sus propias invalidaciones.
+- sqlite: fichero SQLite compartido por todos los workers de la máquina
+  (hace el papel de un Redis local); los aciertos y las invalidaciones de un
+  worker sirven a todos.
+
+Las claves incluyen la versión de datos (ver data_versions), de modo que una
+entrada nunca se sirve con el ETag de otra versión. Además, los servicios
+invalidan las entradas afectadas tras confirmar cada escritura
+(on_matches_changed, on_players_changed) para liberarlas en cuanto quedan
+obsoletas, y un contador de generación evita guardar un informe calculado
+antes de una invalidación concurrente.
+
+La caché nunca debe hacer fallar una petición: un error del backend (p. ej.
+"database is locked" en sqlite) se registra y cuenta como fallo de caché al
+leer, como guardado omitido al escribir y, en los ganchos que se ejecutan
+tras el commit, como mínimo incrementa la generación. Los endpoints
+asíncronos usan fetch y store, que llevan las llamadas bloqueantes del
+backend sqlite al threadpool.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from .config import (
+    REPORT_CACHE_BACKEND,
+    REPORT_CACHE_MAX_ENTRIES,
+    REPORT_CACHE_PATH,
+    REPORT_CACHE_TTL_SECONDS,
+)
+
+LEADERBOARD_PREFIX = "leaderboard:"
+HISTORY_PREFIX = "history:"
+ODDS_PREFIX = "odds:"
+
+logger = logging.getLogger("tk3.report_cache")
+
+
+def leaderboard_key(version: str = "") -> str:
+    """Clave del ranking para una versión de datos (sin versión: prefijo)."""
+    return f"{LEADERBOARD_PREFIX}{version}"
+
+
+def history_key(tournament_id: int, version: str = "") -> str:
+    """Clave del historial de un torneo para una versión (sin versión: prefijo)."""
+    return f"{HISTORY_PREFIX}{tournament_id}:{version}"
+
+
+def odds_key(tournament_id: int, version: str = "") -> str:
+    """Clave de las probabilidades de un torneo (sin versión: prefijo)."""
+    return f"{ODDS_PREFIX}{tournament_id}:{version}"
+
+
+class MemoryCacheBackend:
+    """Backend LRU + TTL en memoria, seguro entre hilos."""
+
+    name = "memory"
+    # Sin E/S: se llama directamente desde el bucle de eventos
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: str, value: bytes, generation: int) -> bool:
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def bump_generation(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def invalidate(self, prefixes: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            prefixes = tuple(prefixes)
+            for key in [key for key in self._entries if key.startswith(prefixes)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(value) for value, _ in self._entries.values()),
+                "evictions": self.evictions,
+            }
+
+
+class SQLiteCacheBackend:
+    """
+    Backend LRU + TTL sobre un fichero SQLite compartido entre procesos.
+
+    Cada hilo usa su propia conexión; las escrituras se serializan con
+    BEGIN IMMEDIATE y el fichero trabaja en modo WAL para que las lecturas
+    no esperen a las escrituras. Las lecturas no escriben: la fecha de último
+    acceso (para el LRU), como mucho una por segundo y entrada, se acumula en
+    memoria y se guarda en la transacción del siguiente set, justo antes de
+    desalojar.
+    """
+
+    name = "sqlite"
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._touched: Dict[str, float] = {}
+        self._touched_lock = threading.Lock()
+        with self._write() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                " id INTEGER PRIMARY KEY CHECK (id = 1),"
+                " generation INTEGER NOT NULL, evictions INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO meta VALUES (1, 0, 0)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Transacción de escritura (BEGIN IMMEDIATE ... COMMIT/ROLLBACK)."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        row = (
+            self._conn()
+            .execute(
+                "SELECT value, expires_at, accessed_at FROM entries WHERE key = ?",
+                (key,),
+            )
+            .fetchone()
+        )
+        if row is None or row[1] <= now:
+            return None
+        if now - row[2] > 1:
+            with self._touched_lock:
+                self._touched[key] = now
+        return row[0]
+
+    def generation(self) -> int:
+        return self._conn().execute("SELECT generation FROM meta").fetchone()[0]
+
+    def set(self, key: str, value: bytes, generation: int) -> bool:
+        now = time.time()
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+        with self._write() as conn:
+            if conn.execute("SELECT generation FROM meta").fetchone()[0] != generation:
+                return False
+            conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ? AND accessed_at < ?",
+                [(at, touched_key, at) for touched_key, at in touched.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now),
+            )
+            excess = (
+                conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                - self.max_entries
+            )
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    " SELECT key FROM entries ORDER BY expires_at <= ? DESC,"
+                    " accessed_at LIMIT ?)",
+                    (now, excess),
+                )
+                conn.execute("UPDATE meta SET evictions = evictions + ?", (excess,))
+        return True
+
+    def bump_generation(self) -> None:
+        with self._write() as conn:
+            conn.execute("UPDATE meta SET generation = generation + 1")
+
+    def invalidate(self, prefixes: Iterable[str]) -> None:
+        with self._write() as conn:
+            conn.execute("UPDATE meta SET generation = generation + 1")
+            for prefix in prefixes:
+                # Rango de claves con el prefijo (aprovecha la clave primaria)
+                conn.execute(
+                    "DELETE FROM entries WHERE key >= ? AND key < ?",
+                    (prefix, prefix + "\uffff"),
+                )
+
+    def clear(self) -> None:
+        with self._write() as conn:
+            conn.execute("UPDATE meta SET generation = generation + 1")
+            conn.execute("DELETE FROM entries")
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM entries"
+        ).fetchone()
+        evictions = conn.execute("SELECT evictions FROM meta").fetchone()[0]
+        return {"entries": entries, "bytes": size, "evictions": evictions}
+
+
+class ReportCache:
+    """
+    Fachada de la caché de informes sobre un backend (o ninguno).
+
+    Los contadores de aciertos y fallos son locales al proceso; las entradas,
+    bytes y desalojos los informa el backend (compartidos si es sqlite).
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Devuelve el JSON guardado para una clave, si existe y no ha caducado.
+        Un error del backend se registra y cuenta como fallo de caché.
+
+        :param key: Clave del informe.
+        :return: Contenido serializado o None.
+        """
+        if self.backend is None:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            logger.warning("Report cache read failed for %s", key, exc_info=True)
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def generation(self) -> Optional[int]:
+        """
+        Generación actual: se pasa a set para descartar datos ya invalidados.
+
+        :return: Generación, o None si el backend no responde (set no guardará).
+        """
+        if self.backend is None:
+            return 0
+        try:
+            return self.backend.generation()
+        except Exception:
+            logger.warning("Report cache generation read failed", exc_info=True)
+            return None
+
+    def set(self, key: str, value: bytes, generation: Optional[int]) -> None:
+        """
+        Guarda un informe calculado, salvo que haya habido una invalidación
+        desde que se leyó la generación (el informe podría estar obsoleto).
+        Un error del backend se registra y el guardado se omite.
+
+        :param key: Clave del informe.
+        :param value: Contenido serializado.
+        :param generation: Generación leída antes de calcular el informe.
+        """
+        if self.backend is None or generation is None:
+            return
+        try:
+            self.backend.set(key, value, generation)
+        except Exception:
+            logger.warning("Report cache store failed for %s", key, exc_info=True)
+
+    def _lookup(self, key: str) -> Tuple[Optional[bytes], Optional[int]]:
+        content = self.get(key)
+        return content, None if content is not None else self.generation()
+
+    async def fetch(self, key: str) -> Tuple[Optional[bytes], Optional[int]]:
+        """
+        Versión para endpoints asíncronos de get + generation, en una sola
+        llamada al threadpool si el backend es bloqueante.
+
+        :param key: Clave del informe.
+        :return: (contenido, None) si hay acierto; (None, generación) si no.
+        """
+        if self.backend is not None and self.backend.blocking:
+            return await run_in_threadpool(self._lookup, key)
+        return self._lookup(key)
+
+    async def store(self, key: str, value: bytes, generation: Optional[int]) -> None:
+        """Versión para endpoints asíncronos de set (threadpool si bloquea)."""
+        if self.backend is not None and self.backend.blocking:
+            await run_in_threadpool(self.set, key, value, generation)
+        else:
+            self.set(key, value, generation)
+
+    def invalidate(self, *prefixes: str) -> None:
+        """Elimina las entradas cuya clave empieza por alguno de los prefijos."""
+        if self.backend is None:
+            return
+        self.backend.invalidate(prefixes)
+        with self._lock:
+            self.invalidations += 1
+
+    def invalidate_best_effort(self, *prefixes: str) -> None:
+        """
+        Invalida como invalidate, pero sin lanzar excepciones (para los ganchos
+        que se ejecutan tras el commit).
+
+        Si la invalidación falla se registra y se intenta al menos incrementar
+        la generación: las entradas obsoletas se quedan hasta su TTL, pero no
+        se sirven con el ETag nuevo (la clave incluye la versión de datos) y
+        ningún informe calculado antes del cambio llega a guardarse.
+
+        :param prefixes: Prefijos de las claves a eliminar.
+        """
+        try:
+            self.invalidate(*prefixes)
+            return
+        except Exception:
+            logger.warning(
+                "Report cache invalidation failed for %s", prefixes, exc_info=True
+            )
+        try:
+            self.backend.bump_generation()
+        except Exception:
+            logger.warning("Report cache generation bump failed", exc_info=True)
+
+    def clear(self) -> None:
+        """Vacía la caché por completo."""
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        """Devuelve el backend, la tasa de aciertos y la ocupación de la caché."""
+        with self._lock:
+            hits, misses, invalidations = self.hits, self.misses, self.invalidations
+        stats = {
+            "backend": self.backend.name if self.backend is not None else "none",
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            "invalidations": invalidations,
+            "entries": 0,
+            "bytes": 0,
+            "evictions": 0,
+        }
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+
+def _build_backend():
+    """Crea el backend indicado por TK3_REPORT_CACHE_BACKEND."""
+    if REPORT_CACHE_BACKEND == "none":
+        return None
+    if REPORT_CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(
+            REPORT_CACHE_PATH, REPORT_CACHE_MAX_ENTRIES, REPORT_CACHE_TTL_SECONDS
+        )
+    if REPORT_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(REPORT_CACHE_MAX_ENTRIES, REPORT_CACHE_TTL_SECONDS)
+    raise ValueError(f"Unknown report cache backend: {REPORT_CACHE_BACKEND}")
+
+
+# Instancia compartida por el router de informes y los servicios que escriben
+report_cache = ReportCache(_build_backend())
+
+
+def on_matches_changed(tournament_ids: Iterable[int]) -> None:
+    """
+    Gancho tras resolver o generar combates: ranking, e historiales y
+    probabilidades de los torneos afectados.
+    """
+    tournament_ids = set(tournament_ids)
+    report_cache.invalidate_best_effort(
+        leaderboard_key(),
+        *map(history_key, tournament_ids),
+        *map(odds_key, tournament_ids),
+    )
+
+
+def on_players_changed() -> None:
+    """Gancho tras escribir jugadores: los nicks aparecen en todos los informes."""
+    report_cache.invalidate_best_effort(LEADERBOARD_PREFIX, HISTORY_PREFIX)
@@ -0,0 +1,46 @@
+"""
+INSERT ... ON CONFLICT UPDATE según el dialecto de la base de datos.
+
+Los contadores que se crean en la primera escritura (player_stats,
+data_version) no pueden hacer "UPDATE y, si no había fila, INSERT": dos
+transacciones concurrentes ven las dos rowcount 0 y la segunda choca con la
+clave primaria. Con una sola sentencia de upsert la base de datos resuelve
+la carrera: MariaDB con ON DUPLICATE KEY UPDATE y SQLite con ON CONFLICT DO
+UPDATE.
+"""
+
+from typing import Any, Dict
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+
+
+def upsert(
+    db: Session, model: Any, values: Dict[str, Any], on_conflict: Dict[str, Any]
+) -> Executable:
+    """
+    Construye la sentencia de upsert de una fila identificada por su clave
+    primaria.
+
+    :param db: Sesión de la base de datos (determina el dialecto).
+    :param model: Modelo de la tabla.
+    :param values: Valores de la fila si no existe.
+    :param on_conflict: Columnas a actualizar si ya existe; las expresiones
+        sobre columnas del modelo (p. ej. Model.total + 1) se refieren a la
+        fila existente.
+    :return: Sentencia lista para db.execute.
+    :raises ValueError: Si el dialecto no admite upsert.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        return (
+            mysql.insert(model).values(**values).on_duplicate_key_update(**on_conflict)
+        )
+    if dialect == "sqlite":
+        primary_key = [column.name for column in model.__table__.primary_key]
+        return (
+            sqlite.insert(model)
+            .values(**values)
+            .on_conflict_do_update(index_elements=primary_key, set_=on_conflict)
+        )
+    raise ValueError(f"Upsert is not supported for dialect {dialect}")
@@ -8,8 +8,18 @@ la ruta raíz informativa.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import players_router, tournaments_router, matches_router, reports_router
-
+from .core.config import DEBUG, METRICS, QUERY_STATS
+from .core.metrics import MetricsMiddleware
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.query_stats import DEBUG_HEADERS, QueryStatsMiddleware
+from .routers import (
+    players_router,
+    tournaments_router,
+    matches_router,
+    reports_router,
+    status_router,
+    metrics_router,
+)
 
 app = FastAPI(
     title="Takket-Quieto API",
@@ -29,13 +39,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor de paginación (y métricas SQL en depuración) legibles desde el frontend
+    expose_headers=[NEXT_CURSOR_HEADER] + (DEBUG_HEADERS if DEBUG else []),
 )
 
+# Sentencias SQL por petición: log estructurado y cabeceras de depuración
+if QUERY_STATS:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Contadores, latencias y peticiones en curso para /metrics
+if METRICS:
+    app.add_middleware(MetricsMiddleware)
+
 # Incluir routers
 app.include_router(players_router.router)
 app.include_router(tournaments_router.router)
 app.include_router(matches_router.router)
 app.include_router(reports_router.router)
+app.include_router(status_router.router)
+app.include_router(metrics_router.router)
 
 
 @app.get("/")
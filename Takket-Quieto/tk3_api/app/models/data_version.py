@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+from ..core.db import Base
+
+
+class DataVersion(Base):
+    """
+    Contador de versión de un ámbito de datos (global o de un torneo).
+
+    Las escrituras que cambian el cuadro o el ranking incrementan el contador
+    en su misma transacción; los endpoints de lectura lo usan como ETag para
+    responder 304 sin repetir las consultas si nada ha cambiado.
+    """
+
+    __tablename__ = "data_version"
+
+    scope = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+from ..core.db import Base
+
+
+class IdSequence(Base):
+    """
+    Secuencia de identificadores compartida por todos los procesos de la API.
+
+    Cada fila guarda el siguiente id libre de una entidad. Los procesos
+    reservan bloques de ids incrementando next_id de forma atómica y los
+    reparten en memoria, sin consultar la tabla de la entidad en cada alta.
+    """
+
+    __tablename__ = "id_sequence"
+
+    name = Column(String(50), primary_key=True)
+    next_id = Column(Integer, nullable=False)
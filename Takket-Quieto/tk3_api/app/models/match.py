@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Enum
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Index
 import enum
 from ..core.db import Base
 
@@ -35,3 +35,11 @@ class Match(Base):
     player2_id = Column(Integer, nullable=True)
     winner_id = Column(Integer, nullable=True)
     status = Column(Enum(MatchStatus), default=MatchStatus.PENDING, nullable=False)
+
+    # Cuadro, historial y rondas filtran por torneo (y ronda) y ordenan por
+    # ronda y posición; las estadísticas por jugador salen de player_stats
+    __table_args__ = (
+        Index(
+            "ix_match_tournament_round_position", "tournament_id", "round", "position"
+        ),
+    )
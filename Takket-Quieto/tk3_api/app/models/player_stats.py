@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
+from ..core.db import Base
+
+
+class PlayerStats(Base):
+    """
+    Estadísticas acumuladas de un jugador, mantenidas de forma incremental.
+
+    Cada vez que se resuelve un combate (manualmente o por BYE) se actualiza
+    la fila de los jugadores implicados en la misma transacción, de forma que
+    el ranking se lee de esta tabla sin recorrer el historial de combates.
+    """
+
+    __tablename__ = "player_stats"
+
+    player_id = Column(Integer, ForeignKey("player.id"), primary_key=True)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    # Combates resueltos contabilizados (victorias + derrotas, BYEs incluidos)
+    matches_played = Column(Integer, default=0, nullable=False)
+    last_resolved_at = Column(DateTime, nullable=True)
+
+
+# Índice alineado con el orden del ranking: victorias desc, derrotas asc.
+Index("ix_player_stats_ranking", PlayerStats.wins.desc(), PlayerStats.losses)
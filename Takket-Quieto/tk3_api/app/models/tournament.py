@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, Enum, DateTime
 from datetime import datetime
 import enum
 from ..core.db import Base
@@ -35,3 +35,13 @@ class Tournament(Base):
     )
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     winner_id = Column(Integer, nullable=True)
+
+    # Estado de progresión mantenido por los servicios en la misma transacción
+    # que genera rondas o resuelve combates: última ronda generada (0 si aún no
+    # hay cuadro) y combates pendientes de esa ronda.
+    current_round = Column(Integer, default=0, nullable=False)
+    pending_matches = Column(Integer, default=0, nullable=False)
+
+    # Modo opcional: el cuadro completo se genera de una vez y los ganadores
+    # avanzan automáticamente a la siguiente ronda al resolver cada combate.
+    auto_advance = Column(Boolean, default=False, nullable=False)
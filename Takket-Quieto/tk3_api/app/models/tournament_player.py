@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, Index
 from ..core.db import Base
 
 
@@ -17,6 +17,10 @@ class TournamentPlayer(Base):
     player_id = Column(Integer, ForeignKey("player.id"), nullable=False)
 
     # Evitamos duplicados: un jugador no puede estar dos veces en el mismo torneo.
+    # La restricción única sirve además de índice para listar los inscritos de un
+    # torneo y para la comprobación de duplicados; el segundo índice cubre las
+    # búsquedas por jugador.
     __table_args__ = (
         UniqueConstraint("tournament_id", "player_id", name="_tournament_player_uc"),
+        Index("ix_tournament_player_player", "player_id"),
     )
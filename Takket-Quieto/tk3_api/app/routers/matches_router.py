@@ -1,7 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..core.db import get_db
-from ..schemas.match_schemas import MatchResponse, MatchWinnerUpdate
+from ..core.db import AnySession, get_session, run_db
+from ..schemas.match_schemas import (
+    MatchResponse,
+    MatchResultsBatch,
+    MatchResultsReport,
+    MatchWinnerUpdate,
+)
 from ..services.matches_service import MatchesService
 
 router = APIRouter(prefix="/matches", tags=["matches"])
@@ -10,7 +14,9 @@ service = MatchesService()
 
 
 @router.post("/{match_id}/winner", response_model=MatchResponse)
-def set_winner(match_id: int, winner: MatchWinnerUpdate, db: Session = Depends(get_db)):
+async def set_winner(
+    match_id: int, winner: MatchWinnerUpdate, db: AnySession = Depends(get_session)
+):
     """
     Registra oficialmente el ganador de un combate particular.
     Actualiza el estado del combate a RESOLVED.
@@ -21,6 +27,25 @@ def set_winner(match_id: int, winner: MatchWinnerUpdate, db: Session = Depends(g
     :return: Los datos del combate actualizado o error 400.
     """
     try:
-        return service.set_winner(db, match_id, winner.winner_id)
+        return await run_db(db, service.set_winner, match_id, winner.winner_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/results", response_model=MatchResultsReport)
+async def set_winners(batch: MatchResultsBatch, db: AnySession = Depends(get_session)):
+    """
+    Registra los ganadores de varios combates en una sola petición.
+
+    Cada resultado se valida como en /matches/{match_id}/winner y se informa
+    por separado; con all_or_nothing, un solo error descarta el lote entero.
+
+    :param batch: Pares (match_id, winner_id) y opción all_or_nothing.
+    :param db: Sesión de base de datos inyectada.
+    :return: Totales y resultado de cada par o error 400.
+    """
+    pairs = [(item.match_id, item.winner_id) for item in batch.results]
+    try:
+        return await run_db(db, service.set_winners, pairs, batch.all_or_nothing)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
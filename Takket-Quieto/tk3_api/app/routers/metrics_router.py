@@ -0,0 +1,30 @@
+"""
+Router del endpoint de métricas para Prometheus.
+
+Expone contadores e histogramas de las peticiones HTTP, el estado del pool
+de conexiones y los eventos de dominio, sumados entre todos los workers.
+"""
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from ..core.metrics import metrics
+
+router = APIRouter(tags=["status"])
+
+# Tipo de contenido del formato de texto de Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def read_metrics():
+    """
+    Obtiene las métricas de la API en formato de texto de Prometheus.
+
+    La lectura de las instantáneas del resto de workers se hace en el pool de
+    hilos para no bloquear el bucle de eventos.
+
+    :return: Texto de exposición de Prometheus.
+    """
+    content = await run_in_threadpool(metrics.render)
+    return PlainTextResponse(content, media_type=PROMETHEUS_CONTENT_TYPE)
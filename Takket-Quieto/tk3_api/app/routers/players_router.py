@@ -1,29 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-
-from ..core.db import get_db
-from ..schemas.player_schemas import PlayerResponse, PlayerCreate, PlayerUpdate
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional
+
+from ..core.config import FAST_JSON
+from ..core.db import AnySession, get_session, run_db
+from ..core.fast_json import fast_response
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, paginate
+from ..schemas.player_schemas import (
+    PlayerImportReport,
+    PlayerResponse,
+    PlayerCreate,
+    PlayerUpdate,
+)
 from ..services.players_service import PlayersService
 
 router = APIRouter(prefix="/players", tags=["players"])
 
+logger = logging.getLogger("tk3.players")
+
 service = PlayersService()
 
 
 @router.get("/", response_model=List[PlayerResponse])
-def read_players(db: Session = Depends(get_db)):
+async def read_players(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AnySession = Depends(get_session),
+):
     """
-    Recupera el listado completo de jugadores.
+    Recupera el listado de jugadores paginado por cursor (ordenado por id).
+
+    Si hay más resultados, la cabecera X-Next-Cursor contiene el valor a
+    enviar como parámetro after para obtener la siguiente página.
 
+    Con TK3_FAST_JSON activo las filas se leen como tuplas y se codifican
+    con orjson, sin validar cada objeto con el response_model.
+
+    :param limit: Tamaño de página.
+    :param after: Cursor opaco devuelto por la página anterior.
     :param db: Sesión de base de datos inyectada.
     :return: Lista de jugadores (esquema PlayerResponse).
     """
-    return service.get_all(db)
+    try:
+        cursor = decode_cursor(after, 1)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    after_id = cursor[0] if cursor else None
+    if FAST_JSON:
+        rows = await run_db(db, service.get_all_rows, limit + 1, after_id)
+        rows = paginate(response, rows, limit, key=lambda row: (row["id"],))
+        return fast_response(rows, response)
+
+    players = await run_db(db, service.get_all, limit + 1, after_id)
+    return paginate(response, players, limit, key=lambda player: (player.id,))
 
 
 @router.get("/{player_id}", response_model=PlayerResponse)
-def read_player(player_id: int, db: Session = Depends(get_db)):
+async def read_player(player_id: int, db: AnySession = Depends(get_session)):
     """
     Obtiene los detalles de un jugador específico por ID.
 
@@ -31,14 +66,14 @@ def read_player(player_id: int, db: Session = Depends(get_db)):
     :param db: Sesión de base de datos inyectada.
     :return: Datos del jugador o error 404 si no existe.
     """
-    player = service.get_by_id(db, player_id)
+    player = await run_db(db, service.get_by_id, player_id)
     if player is None:
         raise HTTPException(status_code=404, detail="Player not found")
     return player
 
 
 @router.post("/", response_model=PlayerResponse)
-def create_player(player: PlayerCreate, db: Session = Depends(get_db)):
+async def create_player(player: PlayerCreate, db: AnySession = Depends(get_session)):
     """
     Registra un nuevo jugador en el sistema.
 
@@ -48,15 +83,57 @@ def create_player(player: PlayerCreate, db: Session = Depends(get_db)):
     """
     # En un escenario real validariamos si el nick ya existe aqui o capturariamos la excepcion de integridad
     try:
-        return service.create_player(db, player)
+        return await run_db(db, service.create_player, player)
     except Exception as e:
         # Simplificacion para el ejercicio
-        print(f"ERROR creating player: {str(e)}")
+        logger.warning("Error creating player: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# El cuerpo se lee sin procesar (JSON o CSV); se documenta aquí para OpenAPI
+_IMPORT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "array",
+                    "items": PlayerCreate.model_json_schema(),
+                }
+            },
+            "text/csv": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+@router.post("/bulk", response_model=PlayerImportReport, openapi_extra=_IMPORT_BODY)
+async def import_players(request: Request, db: AnySession = Depends(get_session)):
+    """
+    Importa jugadores de forma masiva desde JSON o CSV.
+
+    El cuerpo puede ser una lista JSON de jugadores o un CSV con cabecera
+    (Content-Type: text/csv) con las columnas nick, logo_url y active. Las
+    filas rechazadas (nick repetido, ya existente o inválido) se informan en
+    el resultado sin impedir el alta del resto.
+
+    :param request: Petición con el fichero de importación como cuerpo.
+    :param db: Sesión de base de datos inyectada.
+    :return: Informe con el resultado de cada fila o error 400.
+    """
+    raw = await request.body()
+    try:
+        rows = service.parse_import(raw, request.headers.get("content-type", ""))
+        return await run_db(db, service.import_players, rows)
+    except Exception as e:
+        logger.warning("Error importing players: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{player_id}", response_model=PlayerResponse)
-def update_player(player_id: int, player: PlayerUpdate, db: Session = Depends(get_db)):
+async def update_player(
+    player_id: int, player: PlayerUpdate, db: AnySession = Depends(get_session)
+):
     """
     Actualiza la información de un jugador existente.
 
@@ -66,17 +143,17 @@ def update_player(player_id: int, player: PlayerUpdate, db: Session = Depends(ge
     :return: Jugador actualizado o error 404.
     """
     try:
-        updated_player = service.update_player(db, player_id, player)
+        updated_player = await run_db(db, service.update_player, player_id, player)
         if updated_player is None:
             raise HTTPException(status_code=404, detail="Player not found")
         return updated_player
     except Exception as e:
-        print(f"ERROR updating player {player_id}: {str(e)}")
+        logger.warning("Error updating player %s: %s", player_id, e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.patch("/{player_id}/toggle", response_model=PlayerResponse)
-def toggle_player_status(player_id: int, db: Session = Depends(get_db)):
+async def toggle_player_status(player_id: int, db: AnySession = Depends(get_session)):
     """
     Activa o desactiva a un jugador mediante su identificador.
 
@@ -84,7 +161,7 @@ def toggle_player_status(player_id: int, db: Session = Depends(get_db)):
     :param db: Sesión de base de datos inyectada.
     :return: Jugador con estado toggleado o error 404.
     """
-    updated_player = service.toggle_active(db, player_id)
+    updated_player = await run_db(db, service.toggle_active, player_id)
 
     if updated_player is None:
         raise HTTPException(status_code=404, detail="Player not found")
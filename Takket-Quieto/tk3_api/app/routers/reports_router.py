@@ -9,22 +9,60 @@ Propósito académico: Separación de responsabilidades entre controlador (route
 lógica de negocio (service) y acceso a datos (models).
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from ..core.db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from typing import Any, Callable, List, Optional
+from ..core import data_versions
+from ..core.config import DB_ASYNC
+from ..core.db import AnySession, AsyncSessionLocal, SessionLocal, get_session, run_db
+from ..core.report_cache import history_key, leaderboard_key, report_cache
+from ..models.match import MatchStatus
 from ..services.reports_service import ReportsService
-from ..schemas.reports_schemas import LeaderboardEntry, MatchHistoryEntry
-
+from ..schemas.match_schemas import MatchStatus as MatchStatusFilter
+from ..schemas.reports_schemas import ExportFormat, LeaderboardEntry, MatchHistoryEntry
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 # Instancia del servicio de informes
 reports_service = ReportsService()
 
+# Serializadores de los informes cacheados (JSON en bytes)
+_leaderboard_json = TypeAdapter(List[LeaderboardEntry])
+_history_json = TypeAdapter(List[MatchHistoryEntry])
+
+
+async def _cached_report(
+    key: str,
+    adapter: TypeAdapter,
+    response: Response,
+    db: AnySession,
+    fn: Callable[..., Any],
+    *args,
+) -> Response:
+    """
+    Devuelve un informe desde la caché o lo calcula y lo guarda.
+
+    :param key: Clave del informe (incluye la versión de datos).
+    :param adapter: Serializador del tipo devuelto por fn.
+    :param response: Respuesta del endpoint, cuyas cabeceras (ETag) se conservan.
+    :param db: Sesión de base de datos.
+    :param fn: Método del servicio que calcula el informe.
+    :return: Respuesta JSON con el informe ya serializado.
+    """
+    content, generation = await report_cache.fetch(key)
+    if content is None:
+        content = adapter.dump_json(await run_db(db, fn, *args))
+        await report_cache.store(key, content, generation)
+
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(content, media_type="application/json", headers=headers)
+
 
 @router.get("/leaderboard", response_model=List[LeaderboardEntry])
-def get_leaderboard(db: Session = Depends(get_db)):
+async def get_leaderboard(
+    request: Request, response: Response, db: AnySession = Depends(get_session)
+):
     """
     Obtiene el ranking global de jugadores.
 
@@ -37,12 +75,29 @@ def get_leaderboard(db: Session = Depends(get_db)):
     - Derrotas: combates donde participó pero no ganó (excluyendo BYE)
     - Ordenado por victorias descendente
 
+    La respuesta lleva un ETag con la versión global de los datos: si coincide
+    con If-None-Match se responde 304 sin calcular el ranking. Si no, el
+    ranking se sirve desde la caché de informes mientras no cambie.
+
     :param db: Sesión de base de datos inyectada automáticamente.
     :return: Lista de entradas del ranking con player_id, nick, wins y losses.
     """
     try:
-        leaderboard = reports_service.get_leaderboard(db)
-        return leaderboard
+        versions = await run_db(
+            db, data_versions.get_versions, data_versions.GLOBAL_SCOPE
+        )
+        etag = data_versions.make_etag("leaderboard", *versions)
+        cached = data_versions.not_modified(request, response, etag)
+        if cached:
+            return cached
+
+        return await _cached_report(
+            leaderboard_key(etag),
+            _leaderboard_json,
+            response,
+            db,
+            reports_service.get_leaderboard,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error al generar el ranking: {str(e)}"
@@ -52,7 +107,12 @@ def get_leaderboard(db: Session = Depends(get_db)):
 @router.get(
     "/tournaments/{tournament_id}/matches", response_model=List[MatchHistoryEntry]
 )
-def get_tournament_matches(tournament_id: int, db: Session = Depends(get_db)):
+async def get_tournament_matches(
+    tournament_id: int,
+    request: Request,
+    response: Response,
+    db: AnySession = Depends(get_session),
+):
     """
     Obtiene el historial de combates de un torneo específico.
 
@@ -61,15 +121,99 @@ def get_tournament_matches(tournament_id: int, db: Session = Depends(get_db)):
     están ordenados por ronda y posición para facilitar la visualización
     del cuadro de eliminación.
 
+    Lleva un ETag con las versiones global (nicks) y del torneo: si coincide
+    con If-None-Match se responde 304 sin consultar los combates. Si no, el
+    historial se sirve desde la caché de informes mientras no cambie.
+
     :param tournament_id: Identificador del torneo a consultar.
     :param db: Sesión de base de datos inyectada automáticamente.
     :return: Lista de combates con información completa de participantes y resultado.
     """
     try:
-        matches = reports_service.get_tournament_matches(db, tournament_id)
-        return matches
+        versions = await run_db(
+            db,
+            data_versions.get_versions,
+            data_versions.GLOBAL_SCOPE,
+            data_versions.tournament_scope(tournament_id),
+        )
+        etag = data_versions.make_etag("history", tournament_id, *versions)
+        cached = data_versions.not_modified(request, response, etag)
+        if cached:
+            return cached
+
+        return await _cached_report(
+            history_key(tournament_id, etag),
+            _history_json,
+            response,
+            db,
+            reports_service.get_tournament_matches,
+            tournament_id,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error al obtener el historial del torneo: {str(e)}",
         )
+
+
+@router.get("/matches/export")
+async def export_matches(
+    format: ExportFormat = ExportFormat.NDJSON,
+    tournament_id: Optional[int] = None,
+    status: Optional[MatchStatusFilter] = None,
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+):
+    """
+    Exporta el historial de combates de todos los torneos en streaming.
+
+    Cada combate incluye los nicks de los participantes y del ganador. La
+    respuesta se envía por lotes a medida que se lee de la base de datos,
+    así que el consumo de memoria es constante sea cual sea el volumen.
+
+    La sesión se abre dentro del propio flujo (y no como dependencia) para
+    que siga abierta mientras se envía la respuesta.
+
+    :param format: Formato de salida: ndjson (por defecto) o csv.
+    :param tournament_id: Filtro opcional por torneo.
+    :param status: Filtro opcional por estado (PENDING o RESOLVED).
+    :param min_id: Filtro opcional: id de combate mínimo (incluido).
+    :param max_id: Filtro opcional: id de combate máximo (incluido).
+    :return: Respuesta en streaming con un combate por línea.
+    """
+    filters = {
+        "tournament_id": tournament_id,
+        "status": MatchStatus(status.value) if status else None,
+        "min_id": min_id,
+        "max_id": max_id,
+    }
+
+    if DB_ASYNC:
+        body = _stream_export_async(format, filters)
+    else:
+        body = _stream_export(format, filters)
+
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="matches.{format.value}"'
+        },
+    )
+
+
+def _stream_export(fmt: ExportFormat, filters: dict):
+    """Flujo síncrono (Starlette lo itera en el pool de hilos)."""
+    db = SessionLocal()
+    try:
+        yield from reports_service.export_matches(db, fmt, **filters)
+    finally:
+        db.close()
+
+
+async def _stream_export_async(fmt: ExportFormat, filters: dict):
+    """Flujo asíncrono sobre una AsyncSession."""
+    async with AsyncSessionLocal() as db:
+        async for chunk in reports_service.export_matches_async(db, fmt, **filters):
+            yield chunk
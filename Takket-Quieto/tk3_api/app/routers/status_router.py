@@ -0,0 +1,55 @@
+"""
+Router de endpoints de diagnóstico.
+
+Expone el estado interno de la API útil para operar el servicio bajo carga:
+ocupación y tiempos de espera del pool de conexiones, contadores de las
+cachés de jugadores y de informes y espectadores de los cuadros en vivo.
+"""
+
+from fastapi import APIRouter
+from ..core.db import get_pool_stats
+from ..core.live_brackets import live_brackets
+from ..core.player_cache import player_cache
+from ..core.report_cache import report_cache
+
+router = APIRouter(prefix="/status", tags=["status"])
+
+
+@router.get("/db-pool")
+def read_db_pool_stats():
+    """
+    Obtiene las estadísticas del pool de conexiones de cada motor.
+
+    :return: Conexiones en uso, desbordamiento, obtenciones, esperas y timeouts.
+    """
+    return get_pool_stats()
+
+
+@router.get("/player-cache")
+def read_player_cache_stats():
+    """
+    Obtiene los contadores de la caché de identidad de jugadores.
+
+    :return: Tamaño, aciertos, fallos y desalojos de la caché.
+    """
+    return player_cache.stats()
+
+
+@router.get("/report-cache")
+def read_report_cache_stats():
+    """
+    Obtiene los contadores de la caché de respuestas de los informes.
+
+    :return: Backend, aciertos, fallos, tasa de aciertos, entradas y bytes.
+    """
+    return report_cache.stats()
+
+
+@router.get("/live-brackets")
+def read_live_bracket_stats():
+    """
+    Obtiene el estado de la difusión en vivo de los cuadros en este proceso.
+
+    :return: Canales abiertos, espectadores conectados y lecturas del cuadro.
+    """
+    return live_brackets.stats()
@@ -1,16 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Callable, List, Optional
+import zlib
 
-from ..core.db import get_db
+from ..core import data_versions
+from ..core.config import (
+    DB_ASYNC,
+    FAST_JSON,
+    LIVE_KEEPALIVE_SECONDS,
+    ODDS_MAX_SIMULATIONS,
+    ODDS_SIMULATIONS,
+    ODDS_TIME_BUDGET_SECONDS,
+)
+from ..core.db import AnySession, AsyncSessionLocal, SessionLocal, get_session, run_db
+from ..core.fast_json import dumps, fast_response
+from ..core.live_brackets import live_brackets
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, paginate
+from ..core.report_cache import odds_key, report_cache
 from ..schemas.tournament_schemas import (
     TournamentResponse,
     TournamentCreate,
+    ParticipantBulkCreate,
+    ParticipantBulkResult,
     ParticipantCreate,
+    PlayerPathResponse,
+    TournamentOddsResponse,
     TournamentUpdate,
 )
 from ..schemas.match_schemas import MatchResponse
 from ..schemas.player_schemas import PlayerResponse
+from ..services import bracket_odds
 from ..services.tournaments_service import TournamentsService
 
 router = APIRouter(prefix="/tournaments", tags=["tournaments"])
@@ -19,18 +39,38 @@ service = TournamentsService()
 
 
 @router.get("/", response_model=List[TournamentResponse])
-def read_tournaments(db: Session = Depends(get_db)):
+async def read_tournaments(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AnySession = Depends(get_session),
+):
     """
-    Obtiene el listado de todos los torneos registrados.
+    Obtiene el listado de torneos paginado por cursor (ordenado por id).
+
+    Si hay más resultados, la cabecera X-Next-Cursor contiene el valor a
+    enviar como parámetro after para obtener la siguiente página.
 
+    :param limit: Tamaño de página.
+    :param after: Cursor opaco devuelto por la página anterior.
     :param db: Sesión de base de datos inyectada.
     :return: Lista de torneos disponibles.
     """
-    return service.get_all(db)
+    try:
+        cursor = decode_cursor(after, 1)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    tournaments = await run_db(
+        db, service.get_all, limit + 1, cursor[0] if cursor else None
+    )
+    return paginate(
+        response, tournaments, limit, key=lambda tournament: (tournament.id,)
+    )
 
 
 @router.get("/{tournament_id}", response_model=TournamentResponse)
-def read_tournament(tournament_id: int, db: Session = Depends(get_db)):
+async def read_tournament(tournament_id: int, db: AnySession = Depends(get_session)):
     """
     Recupera la información detallada de un torneo por su identificador.
 
@@ -38,14 +78,16 @@ def read_tournament(tournament_id: int, db: Session = Depends(get_db)):
     :param db: Sesión de base de datos inyectada.
     :return: Datos del torneo o error 404 si no se encuentra.
     """
-    tournament = service.get_by_id(db, tournament_id)
+    tournament = await run_db(db, service.get_by_id, tournament_id)
     if tournament is None:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return tournament
 
 
 @router.post("/", response_model=TournamentResponse)
-def create_tournament(tournament: TournamentCreate, db: Session = Depends(get_db)):
+async def create_tournament(
+    tournament: TournamentCreate, db: AnySession = Depends(get_session)
+):
     """
     Registra un nuevo torneo en el sistema con estado inicial DRAFT.
 
@@ -54,14 +96,16 @@ def create_tournament(tournament: TournamentCreate, db: Session = Depends(get_db
     :return: El torneo creado o error 400.
     """
     try:
-        return service.create_tournament(db, tournament)
+        return await run_db(db, service.create_tournament, tournament)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{tournament_id}", response_model=TournamentResponse)
-def update_tournament(
-    tournament_id: int, tournament: TournamentUpdate, db: Session = Depends(get_db)
+async def update_tournament(
+    tournament_id: int,
+    tournament: TournamentUpdate,
+    db: AnySession = Depends(get_session),
 ):
     """
     Actualiza la información básica de un torneo.
@@ -71,15 +115,19 @@ def update_tournament(
     :param db: Sesión de base de datos inyectada.
     :return: Torneo actualizado o error 404.
     """
-    updated_tournament = service.update_tournament(db, tournament_id, tournament)
+    updated_tournament = await run_db(
+        db, service.update_tournament, tournament_id, tournament
+    )
     if updated_tournament is None:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return updated_tournament
 
 
 @router.post("/{tournament_id}/participants", response_model=PlayerResponse)
-def add_participant(
-    tournament_id: int, participant: ParticipantCreate, db: Session = Depends(get_db)
+async def add_participant(
+    tournament_id: int,
+    participant: ParticipantCreate,
+    db: AnySession = Depends(get_session),
 ):
     """
     Inscribe a un jugador existente en un torneo determinado.
@@ -90,13 +138,33 @@ def add_participant(
     :return: Los datos del jugador inscrito o error 400 por validación.
     """
     try:
-        return service.add_participant(db, tournament_id, participant)
+        return await run_db(db, service.add_participant, tournament_id, participant)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/{tournament_id}/participants/bulk", response_model=ParticipantBulkResult)
+async def add_participants(
+    tournament_id: int,
+    participants: ParticipantBulkCreate,
+    db: AnySession = Depends(get_session),
+):
+    """
+    Inscribe a varios jugadores en un torneo en borrador con una sola petición.
+
+    :param tournament_id: ID del torneo de destino.
+    :param participants: Lista de ids de jugador a inscribir.
+    :param db: Sesión de base de datos inyectada.
+    :return: Ids inscritos y rechazados (con motivo) o error 400.
+    """
+    try:
+        return await run_db(db, service.add_participants, tournament_id, participants)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{tournament_id}/participants", response_model=List[PlayerResponse])
-def read_participants(tournament_id: int, db: Session = Depends(get_db)):
+async def read_participants(tournament_id: int, db: AnySession = Depends(get_session)):
     """
     Obtiene el listado de todos los jugadores inscritos en un torneo específico.
 
@@ -104,11 +172,11 @@ def read_participants(tournament_id: int, db: Session = Depends(get_db)):
     :param db: Sesión de base de datos inyectada.
     :return: Lista de participantes.
     """
-    return service.get_participants(db, tournament_id)
+    return await run_db(db, service.get_participants, tournament_id)
 
 
 @router.post("/{tournament_id}/generate", response_model=List[MatchResponse])
-def generate_bracket(tournament_id: int, db: Session = Depends(get_db)):
+async def generate_bracket(tournament_id: int, db: AnySession = Depends(get_session)):
     """
     Genera automáticamente el cuadro de combates (bracket) para el torneo.
     Establece los emparejamientos de la ronda 1 y gestiona BYEs.
@@ -118,13 +186,15 @@ def generate_bracket(tournament_id: int, db: Session = Depends(get_db)):
     :return: Lista de combates generados.
     """
     try:
-        return service.generate_bracket(db, tournament_id)
+        return await run_db(db, service.generate_bracket, tournament_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/{tournament_id}/next-round", response_model=List[MatchResponse])
-def generate_next_round(tournament_id: int, db: Session = Depends(get_db)):
+async def generate_next_round(
+    tournament_id: int, db: AnySession = Depends(get_session)
+):
     """
     Crea los emparejamientos para la siguiente ronda basándose en los ganadores actuales.
 
@@ -133,18 +203,204 @@ def generate_next_round(tournament_id: int, db: Session = Depends(get_db)):
     :return: Lista de nuevos combates generados.
     """
     try:
-        return service.generate_next_round(db, tournament_id)
+        return await run_db(db, service.generate_next_round, tournament_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{tournament_id}/bracket", response_model=List[MatchResponse])
-def read_bracket(tournament_id: int, db: Session = Depends(get_db)):
+async def read_bracket(
+    tournament_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AnySession = Depends(get_session),
+):
     """
-    Recupera el cuadro completo del torneo (todos los combates de todas las rondas).
+    Recupera el cuadro del torneo (combates de todas las rondas) paginado por
+    cursor, en orden de ronda y posición.
+
+    Si hay más resultados, la cabecera X-Next-Cursor contiene el valor a
+    enviar como parámetro after para obtener la siguiente página.
+
+    Con TK3_FAST_JSON activo las filas se leen como tuplas y se codifican
+    con orjson, sin validar cada objeto con el response_model.
+
+    La respuesta lleva un ETag con la versión del cuadro y la página pedida
+    (limit y after): si coincide con If-None-Match se responde 304 sin
+    consultar los combates.
 
     :param tournament_id: ID del torneo.
+    :param limit: Tamaño de página.
+    :param after: Cursor opaco devuelto por la página anterior.
     :param db: Sesión de base de datos inyectada.
     :return: Listado de combates del torneo.
     """
-    return service.get_bracket(db, tournament_id)
+    try:
+        cursor = decode_cursor(after, 2)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    versions = await run_db(
+        db, data_versions.get_versions, data_versions.tournament_scope(tournament_id)
+    )
+    etag = data_versions.make_etag(
+        "bracket", tournament_id, *versions, limit, after or ""
+    )
+    cached = data_versions.not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    if FAST_JSON:
+        rows = await run_db(
+            db, service.get_bracket_rows, tournament_id, limit + 1, cursor
+        )
+        rows = paginate(
+            response, rows, limit, key=lambda row: (row["round"], row["position"])
+        )
+        return fast_response(rows, response)
+
+    matches = await run_db(db, service.get_bracket, tournament_id, limit + 1, cursor)
+    return paginate(
+        response, matches, limit, key=lambda match: (match.round, match.position)
+    )
+
+
+@router.get(
+    "/{tournament_id}/players/{player_id}/path", response_model=PlayerPathResponse
+)
+async def read_player_path(
+    tournament_id: int, player_id: int, db: AnySession = Depends(get_session)
+):
+    """
+    Obtiene el camino de un jugador en el cuadro: su combate en juego, el
+    rival siguiente y el resultado o rival de cada ronda hasta la final.
+
+    :param tournament_id: ID del torneo.
+    :param player_id: ID del jugador.
+    :param db: Sesión de base de datos inyectada.
+    :return: Camino del jugador o error 400.
+    """
+    try:
+        return await run_db(db, service.get_player_path, tournament_id, player_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{tournament_id}/odds", response_model=TournamentOddsResponse)
+async def read_odds(
+    tournament_id: int,
+    request: Request,
+    response: Response,
+    simulations: int = Query(ODDS_SIMULATIONS, ge=1, le=ODDS_MAX_SIMULATIONS),
+    db: AnySession = Depends(get_session),
+):
+    """
+    Calcula la probabilidad de cada jugador de llegar a cada ronda y de
+    ganar el torneo, simulando el resto del cuadro (ver bracket_odds).
+
+    Los combates resueltos quedan fijos y los pendientes se deciden según la
+    tasa de victorias histórica de cada jugador. Si la simulación agota
+    TK3_ODDS_TIME_BUDGET_SECONDS, se devuelve lo simulado hasta entonces
+    (complete = false).
+
+    Lleva un ETag con las versiones global (historial de los jugadores) y del
+    torneo: si coincide con If-None-Match se responde 304 y, si no, el
+    resultado se sirve desde la caché de informes mientras no cambie.
+
+    :param tournament_id: ID del torneo.
+    :param simulations: Número de simulaciones.
+    :param db: Sesión de base de datos inyectada.
+    :return: Probabilidades por jugador, de más a menos probable ganador.
+    """
+    if not bracket_odds.available():
+        raise HTTPException(
+            status_code=503, detail="Odds simulation requires numpy to be installed"
+        )
+
+    versions = await run_db(
+        db,
+        data_versions.get_versions,
+        data_versions.GLOBAL_SCOPE,
+        data_versions.tournament_scope(tournament_id),
+    )
+    etag = data_versions.make_etag("odds", tournament_id, simulations, *versions)
+    cached = data_versions.not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    key = odds_key(tournament_id, etag)
+    content, generation = await report_cache.fetch(key)
+    if content is None:
+        try:
+            engine, records = await run_db(db, service.get_odds_state, tournament_id)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Cálculo fuera del bucle de eventos; la semilla depende del estado,
+        # así que todos los workers obtienen el mismo resultado
+        odds = await run_in_threadpool(
+            bracket_odds.simulate,
+            engine,
+            records,
+            simulations,
+            ODDS_TIME_BUDGET_SECONDS,
+            zlib.crc32(etag.encode()),
+        )
+        content = dumps({"tournament_id": tournament_id, **odds})
+        await report_cache.store(key, content, generation)
+
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(content, media_type="application/json", headers=headers)
+
+
+@router.get("/{tournament_id}/live")
+async def live_bracket(tournament_id: int):
+    """
+    Emite el cuadro del torneo en vivo mediante Server-Sent Events.
+
+    El primer evento (snapshot) contiene el cuadro completo y los siguientes
+    (diff) solo los combates nuevos o cambiados y, si cambia, el progreso del
+    torneo. Todos los espectadores de un torneo comparten una única lectura
+    del cuadro por cambio, en lugar de consultar /bracket periódicamente.
+
+    :param tournament_id: ID del torneo.
+    :return: Flujo text/event-stream con los eventos snapshot y diff.
+    """
+    queue = await live_brackets.subscribe(
+        tournament_id, _load_live_bracket, _load_live_version
+    )
+    if queue is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+
+    return StreamingResponse(
+        live_brackets.events(tournament_id, queue, LIVE_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _with_session(fn: Callable[..., Any], *args) -> Any:
+    """
+    Ejecuta un método de servicio en una sesión propia: las lecturas del
+    cuadro en vivo no pertenecen a ninguna petición.
+    """
+    if DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            return await run_db(db, fn, *args)
+    db = SessionLocal()
+    try:
+        return await run_db(db, fn, *args)
+    finally:
+        db.close()
+
+
+async def _load_live_bracket(tournament_id: int) -> Optional[dict]:
+    return await _with_session(service.get_live_bracket, tournament_id)
+
+
+async def _load_live_version(tournament_id: int) -> int:
+    versions = await _with_session(
+        data_versions.get_versions, data_versions.tournament_scope(tournament_id)
+    )
+    return versions[0]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 
@@ -30,3 +30,40 @@ class MatchWinnerUpdate(BaseModel):
     """Esquema para la actualización del ganador de un combate."""
 
     winner_id: int
+
+
+class MatchResultItem(BaseModel):
+    """Resultado de un combate dentro de un envío por lotes."""
+
+    match_id: int
+    winner_id: int
+
+
+class MatchResultsBatch(BaseModel):
+    """
+    Esquema para registrar varios resultados de una vez.
+
+    Con all_or_nothing a True, si un resultado no es válido no se aplica
+    ninguno.
+    """
+
+    results: List[MatchResultItem]
+    all_or_nothing: bool = False
+
+
+class MatchResultOutcome(BaseModel):
+    """Resultado del registro de un par (match_id, winner_id) del lote."""
+
+    match_id: int
+    winner_id: int
+    ok: bool
+    error: Optional[str] = None
+    match: Optional[MatchResponse] = None
+
+
+class MatchResultsReport(BaseModel):
+    """Informe de un envío por lotes: totales y resultado de cada par."""
+
+    applied: int
+    failed: int
+    results: List[MatchResultOutcome]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from enum import Enum
 
 
 class PlayerBase(BaseModel):
@@ -30,3 +31,30 @@ class PlayerResponse(PlayerBase):
 
     class Config:
         from_attributes = True
+
+
+class PlayerImportStatus(str, Enum):
+    """Resultado de una fila en la importación masiva de jugadores."""
+
+    CREATED = "CREATED"
+    DUPLICATE = "DUPLICATE"
+    INVALID = "INVALID"
+
+
+class PlayerImportResult(BaseModel):
+    """Resultado de la importación de una fila (numeradas desde 1)."""
+
+    row: int
+    nick: Optional[str] = None
+    status: PlayerImportStatus
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class PlayerImportReport(BaseModel):
+    """Informe de una importación masiva: totales y resultado por fila."""
+
+    total: int
+    created: int
+    rejected: int
+    results: List[PlayerImportResult]
@@ -9,6 +9,7 @@ Propósito académico: Separación clara entre modelos de base de datos
 y modelos de transferencia de datos (DTO pattern).
 """
 
+from enum import Enum
 from pydantic import BaseModel
 from typing import Optional
 
@@ -74,3 +75,10 @@ class MatchHistoryEntry(BaseModel):
         """Configuración para permitir la conversión desde objetos ORM."""
 
         from_attributes = True
+
+
+class ExportFormat(str, Enum):
+    """Formatos disponibles para la exportación del historial de combates."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
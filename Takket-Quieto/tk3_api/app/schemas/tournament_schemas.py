@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 
@@ -21,9 +21,14 @@ class TournamentBase(BaseModel):
 
 
 class TournamentCreate(TournamentBase):
-    """Esquema para la creación de torneos."""
+    """
+    Esquema para la creación de torneos.
 
-    pass
+    auto_advance activa la pre-generación del cuadro completo con avance
+    automático de los ganadores.
+    """
+
+    auto_advance: bool = False
 
 
 class TournamentUpdate(TournamentBase):
@@ -39,6 +44,9 @@ class TournamentResponse(TournamentBase):
     status: TournamentStatus
     created_at: datetime
     winner_id: Optional[int] = None
+    current_round: int = 0
+    pending_matches: int = 0
+    auto_advance: bool = False
 
     class Config:
         from_attributes = True
@@ -48,3 +56,87 @@ class ParticipantCreate(BaseModel):
     """Esquema para inscribir un jugador en un torneo."""
 
     player_id: int
+
+
+class ParticipantBulkCreate(BaseModel):
+    """Esquema para inscribir varios jugadores en un torneo de una vez."""
+
+    player_ids: List[int]
+
+
+class ParticipantRejection(BaseModel):
+    """Jugador no inscrito en una inscripción masiva y motivo del rechazo."""
+
+    player_id: int
+    reason: str
+
+
+class ParticipantBulkResult(BaseModel):
+    """Resultado de una inscripción masiva: ids inscritos y rechazados."""
+
+    registered: List[int]
+    rejected: List[ParticipantRejection]
+
+
+class PathResult(str, Enum):
+    """
+    Resultado de un jugador en cada ronda de su camino hacia la final.
+
+    PLAYING: combate en juego; UPCOMING: ronda aún no alcanzada.
+    """
+
+    WON = "WON"
+    LOST = "LOST"
+    PLAYING = "PLAYING"
+    UPCOMING = "UPCOMING"
+
+
+class BracketPlayerStatus(str, Enum):
+    """Situación de un jugador en el cuadro."""
+
+    ALIVE = "ALIVE"
+    ELIMINATED = "ELIMINATED"
+    CHAMPION = "CHAMPION"
+
+
+class PathStep(BaseModel):
+    """Combate del camino de un jugador y su resultado (rival si ya se conoce)."""
+
+    round: int
+    position: int
+    opponent_id: Optional[int] = None
+    result: PathResult
+
+
+class PlayerPathResponse(BaseModel):
+    """Camino de un jugador en el cuadro: combate en juego, rival y rondas."""
+
+    player_id: int
+    status: BracketPlayerStatus
+    current_round: Optional[int] = None
+    current_position: Optional[int] = None
+    next_opponent_id: Optional[int] = None
+    steps: List[PathStep]
+
+
+class PlayerOdds(BaseModel):
+    """
+    Probabilidades de un jugador: reach[i] es la de llegar a la ronda i + 1
+    y win la de ganar el torneo.
+    """
+
+    player_id: int
+    win_rate: float
+    reach: List[float]
+    win: float
+
+
+class TournamentOddsResponse(BaseModel):
+    """Resultado de la simulación del resto de un torneo en juego."""
+
+    tournament_id: int
+    rounds: int
+    simulations: int
+    elapsed_ms: float
+    complete: bool
+    players: List[PlayerOdds]
@@ -0,0 +1,410 @@
+"""
+Motor de cuadros de eliminación directa en memoria.
+
+El cuadro se guarda como un árbol binario completo en arrays planos
+indexados como un heap: el nodo 1 es la final y los hijos del nodo i son
+2i y 2i+1. Con un cuadro de `size` huecos (potencia de 2):
+
+- Los nodos size..2*size-1 son las hojas: el jugador de cada hueco de la
+  ronda 1 (0 = hueco vacío).
+- Los nodos 1..size-1 son los combates: guardan el ganador (0 si no hay) y
+  un byte con su estado. Los dos jugadores del combate i son el contenido de
+  sus hijos 2i y 2i+1, así que avanzar a un ganador es escribir un entero.
+
+El combate (ronda r, posición p) es el nodo (size >> r) + p - 1, de modo que
+(r, p) se alimenta de (r-1, 2p-1) y (r-1, 2p), igual que en la tabla match.
+Las consultas de camino y rival recorren como mucho una rama: O(log n).
+
+Un cuadro de 1M de nodos (512K jugadores) ocupa unos 5 MB: un int32 por
+nodo y un byte por combate. Los ids de combate y el índice de jugadores
+(búsqueda binaria por id) se reservan solo si se usan, y suman otros 4 MB.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+from ..models.match import Match, MatchStatus
+
+# Estados de un combate en el array de estados
+PENDING = 0
+RESOLVED = 1
+
+# Resultado de cada paso del camino de un jugador
+WON = "WON"
+LOST = "LOST"
+PLAYING = "PLAYING"
+UPCOMING = "UPCOMING"
+
+# Situación de un jugador en el cuadro
+ALIVE = "ALIVE"
+ELIMINATED = "ELIMINATED"
+CHAMPION = "CHAMPION"
+
+
+def _zeros(count: int) -> array:
+    """Array de int32 a cero sin pasar por una lista de Python."""
+    return array("i", bytes(4 * count))
+
+
+def _field(row: Any, name: str) -> Any:
+    """Lee un campo de un Match o de un diccionario de fila."""
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+class BracketEngine:
+    """
+    Cuadro de eliminación directa en arrays indexados como un heap.
+
+    current_round es la última ronda materializada (con filas en la tabla
+    match): en los torneos con avance automático son todas; en el resto, la
+    ronda en juego. Las rondas posteriores se calculan igualmente en memoria,
+    pero no se exportan a filas hasta llegar a ellas (advance_round).
+    """
+
+    def __init__(self, size: int, current_round: int = 1):
+        """
+        :param size: Huecos de la ronda 1 (potencia de 2, mínimo 2).
+        :param current_round: Última ronda materializada.
+        """
+        if size < 2 or size & (size - 1):
+            raise ValueError("Bracket size must be a power of 2 (at least 2)")
+        self.size = size
+        self.rounds = size.bit_length() - 1
+        self.current_round = current_round
+        self.slots = _zeros(2 * size)
+        self.status = bytearray(size)
+        self.match_ids: Optional[array] = None
+        self._player_index: Optional[Tuple[array, array]] = None
+
+    @classmethod
+    def seed(cls, player_ids: Sequence[int], full: bool = False) -> "BracketEngine":
+        """
+        Crea el cuadro con los jugadores en el orden dado (ya sorteado).
+
+        Los huecos sobrantes hasta la potencia de 2 quedan vacíos al final y
+        los BYE se resuelven y propagan hacia la final.
+
+        :param player_ids: Jugadores de la ronda 1, en orden de hueco.
+        :param full: Materializar todas las rondas (avance automático).
+        :return: Cuadro inicial.
+        """
+        count = len(player_ids)
+        size = max(2, 1 << (count - 1).bit_length())
+        engine = cls(size)
+        engine.slots[size : size + count] = array("i", player_ids)
+        engine._propagate_byes(1)
+        if full:
+            engine.current_round = engine.rounds
+        return engine
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[Any]) -> "BracketEngine":
+        """
+        Reconstruye el cuadro a partir de sus filas (Match o diccionarios con
+        los campos de MatchResponse).
+
+        La ronda en juego (current_round) es la mayor presente en las filas.
+
+        :param matches: Combates del torneo (todas las rondas materializadas).
+        :return: Cuadro equivalente.
+        :raises ValueError: Si faltan combates o no son coherentes entre sí.
+        """
+        rows = sorted(
+            matches, key=lambda row: (_field(row, "round"), _field(row, "position"))
+        )
+        first_round = sum(1 for row in rows if _field(row, "round") == 1)
+        if first_round == 0:
+            raise ValueError("Bracket has no first round matches")
+
+        last_round = _field(rows[-1], "round")
+        engine = cls(2 * first_round, last_round)
+        expected = sum(engine.size >> r for r in range(1, last_round + 1))
+        if len(rows) != expected:
+            raise ValueError("Bracket rounds are incomplete")
+
+        engine.match_ids = _zeros(engine.size)
+        slots = engine.slots
+        for row in rows:
+            node = engine.node(_field(row, "round"), _field(row, "position"))
+            player1 = _field(row, "player1_id") or 0
+            player2 = _field(row, "player2_id") or 0
+            if node >= engine.size // 2:
+                slots[2 * node] = player1
+                slots[2 * node + 1] = player2
+            elif (slots[2 * node], slots[2 * node + 1]) != (player1, player2):
+                raise ValueError(
+                    f"Match {engine.round_position(node)} does not follow "
+                    f"from its previous matches"
+                )
+            engine.match_ids[node] = _field(row, "id") or 0
+            if _field(row, "status") == MatchStatus.RESOLVED:
+                winner_id = _field(row, "winner_id") or 0
+                if winner_id not in (player1, player2) or (winner_id == 0) != (
+                    player1 == player2 == 0
+                ):
+                    raise ValueError(
+                        f"Match {engine.round_position(node)} has an invalid winner"
+                    )
+                engine.status[node] = RESOLVED
+                slots[node] = winner_id
+
+        engine._propagate_byes(last_round + 1)
+        return engine
+
+    def to_matches(self, tournament_id: int) -> List[Match]:
+        """
+        Exporta las rondas materializadas como objetos Match (sin persistir),
+        en orden de ronda y posición. Conserva los ids conocidos.
+
+        :param tournament_id: ID del torneo.
+        :return: Combates de las rondas 1..current_round.
+        """
+        matches = []
+        for round in range(1, self.current_round + 1):
+            for node in self._round_nodes(round):
+                matches.append(
+                    Match(tournament_id=tournament_id, **self._match_fields(node))
+                )
+        return matches
+
+    def round_matches(self, tournament_id: int, round: int) -> List[Match]:
+        """Exporta los combates de una ronda como objetos Match (sin persistir)."""
+        return [
+            Match(tournament_id=tournament_id, **self._match_fields(node))
+            for node in self._round_nodes(round)
+        ]
+
+    def node(self, round: int, position: int) -> int:
+        """Nodo del combate (ronda, posición)."""
+        if not 1 <= round <= self.rounds or not 1 <= position <= self.size >> round:
+            raise Exception("Match not found")
+        return (self.size >> round) + position - 1
+
+    def round_position(self, node: int) -> Tuple[int, int]:
+        """Ronda y posición del combate de un nodo."""
+        depth = node.bit_length() - 1
+        return self.rounds - depth, node - (1 << depth) + 1
+
+    def _round_nodes(self, round: int) -> range:
+        first = self.size >> round
+        return range(first, 2 * first)
+
+    def _match_fields(self, node: int) -> dict:
+        round, position = self.round_position(node)
+        resolved = self.status[node] == RESOLVED
+        match_id = self.match_ids[node] if self.match_ids is not None else 0
+        return {
+            "id": match_id or None,
+            "round": round,
+            "position": position,
+            "player1_id": self.slots[2 * node] or None,
+            "player2_id": self.slots[2 * node + 1] or None,
+            "winner_id": (self.slots[node] or None) if resolved else None,
+            "status": MatchStatus.RESOLVED if resolved else MatchStatus.PENDING,
+        }
+
+    def _ready(self, node: int) -> bool:
+        """Indica si los dos combates que alimentan el nodo están resueltos."""
+        if node >= self.size // 2:
+            return True
+        return bool(self.status[2 * node] and self.status[2 * node + 1])
+
+    def _resolve_bye(self, node: int) -> bool:
+        """Resuelve el combate si está listo y le llega como mucho un jugador."""
+        if self.status[node] or not self._ready(node):
+            return False
+        player1, player2 = self.slots[2 * node], self.slots[2 * node + 1]
+        if player1 and player2:
+            return False
+        self.status[node] = RESOLVED
+        self.slots[node] = player1 or player2
+        return True
+
+    def _propagate_byes(self, from_round: int) -> None:
+        """
+        Resuelve los BYE de las rondas from_round..final, de abajo arriba.
+
+        Es el mismo criterio que _resolve_bye, desenrollado porque recorre
+        todo el cuadro al sembrarlo.
+        """
+        if from_round > self.rounds:
+            return
+        slots, status = self.slots, self.status
+        first_round = self.size // 2
+        for node in range((self.size >> from_round) * 2 - 1, 0, -1):
+            if status[node]:
+                continue
+            left = 2 * node
+            if node < first_round and not (status[left] and status[left + 1]):
+                continue
+            player1, player2 = slots[left], slots[left + 1]
+            if player1 and player2:
+                continue
+            status[node] = RESOLVED
+            slots[node] = player1 or player2
+
+    def set_winner(
+        self, round: int, position: int, winner_id: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Registra el ganador de un combate y propaga los BYE que provoca.
+
+        Aplica las mismas validaciones que MatchesService.
+
+        :param round: Ronda del combate.
+        :param position: Posición del combate.
+        :param winner_id: Jugador ganador.
+        :return: Combates resueltos (ronda, posición): el indicado y los BYE
+            resueltos en cascada.
+        """
+        if round > self.current_round:
+            raise Exception("Match not found")
+        node = self.node(round, position)
+        if self.status[node] == RESOLVED:
+            raise Exception("Match already resolved")
+        player1, player2 = self.slots[2 * node], self.slots[2 * node + 1]
+        if not (player1 and player2):
+            raise Exception("Match is still waiting for its players")
+        if winner_id not in (player1, player2):
+            raise Exception("Winner must be one of the match players")
+
+        self.status[node] = RESOLVED
+        self.slots[node] = winner_id
+        resolved = [(round, position)]
+        node //= 2
+        while node and self._resolve_bye(node):
+            resolved.append(self.round_position(node))
+            node //= 2
+        return resolved
+
+    def pending_count(self, round: Optional[int] = None) -> int:
+        """
+        Combates pendientes de una ronda o de todas las materializadas.
+
+        :param round: Ronda concreta (None: rondas 1..current_round).
+        :return: Número de combates sin resolver.
+        """
+        if round is not None:
+            nodes = self._round_nodes(round)
+            return len(nodes) - sum(self.status[nodes.start : nodes.stop])
+        first = self.size >> self.current_round
+        return (self.size - first) - sum(self.status[first : self.size])
+
+    def advance_round(self) -> List[Tuple[int, int]]:
+        """
+        Materializa la siguiente ronda (torneos sin avance automático).
+
+        :return: Combates de la nueva ronda (ronda, posición); vacío si la
+            ronda actual era la final.
+        :raises Exception: Si quedan combates pendientes en la ronda actual.
+        """
+        pending = self.pending_count(self.current_round)
+        if pending > 0:
+            raise Exception(f"Cannot progress: there are {pending} pending matches")
+        if self.current_round == self.rounds:
+            return []
+        self.current_round += 1
+        return [
+            self.round_position(node) for node in self._round_nodes(self.current_round)
+        ]
+
+    @property
+    def finished(self) -> bool:
+        """Indica si la final está resuelta."""
+        return self.status[1] == RESOLVED
+
+    @property
+    def champion(self) -> Optional[int]:
+        """Ganador del torneo, si la final está resuelta."""
+        return (self.slots[1] or None) if self.finished else None
+
+    def _leaf(self, player_id: int) -> int:
+        """Hoja del jugador, por búsqueda binaria en un índice ordenado."""
+        if self._player_index is None:
+            leaves = self.slots[self.size :]
+            order = sorted(
+                (offset for offset, player in enumerate(leaves) if player),
+                key=leaves.__getitem__,
+            )
+            self._player_index = (
+                array("i", (leaves[offset] for offset in order)),
+                array("i", (self.size + offset for offset in order)),
+            )
+        players, leaves = self._player_index
+        index = bisect_left(players, player_id)
+        if index == len(players) or players[index] != player_id:
+            raise Exception("Player is not in this bracket")
+        return leaves[index]
+
+    def path(self, player_id: int) -> dict:
+        """
+        Camino de un jugador hacia la final: en cada ronda, su combate, el
+        rival (si ya se conoce) y el resultado. El camino de un eliminado
+        termina en el combate que perdió.
+
+        :param player_id: Jugador a consultar.
+        :return: Diccionario con player_id, status (ALIVE, ELIMINATED o
+            CHAMPION), current_round y current_position (combate en juego o
+            en el que cayó), next_opponent_id y steps.
+        """
+        child = self._leaf(player_id)
+        steps = []
+        status = ALIVE
+        current = None
+        opponent_id = None
+        while child > 1:
+            node = child // 2
+            round, position = self.round_position(node)
+            rival = (self.slots[child ^ 1] if self._decided(child ^ 1) else 0) or None
+            if self.status[node] == RESOLVED and current is None:
+                result = WON if self.slots[node] == player_id else LOST
+            elif current is None and round <= self.current_round:
+                result = PLAYING
+                current = (round, position)
+                opponent_id = rival
+            else:
+                result = UPCOMING
+            steps.append(
+                {
+                    "round": round,
+                    "position": position,
+                    "opponent_id": rival,
+                    "result": result,
+                }
+            )
+            if result == LOST:
+                status = ELIMINATED
+                current = (round, position)
+                break
+            if result == UPCOMING and current is None:
+                # Ronda aún no generada: el jugador espera a que se cree
+                current = (round, position)
+            child = node
+
+        if self.champion == player_id:
+            status = CHAMPION
+        return {
+            "player_id": player_id,
+            "status": status,
+            "current_round": current[0] if current else None,
+            "current_position": current[1] if current else None,
+            "next_opponent_id": opponent_id,
+            "steps": steps,
+        }
+
+    def next_opponent(self, player_id: int) -> Optional[int]:
+        """Rival del jugador en su combate en juego (None si aún no se conoce)."""
+        return self.path(player_id)["next_opponent_id"]
+
+    def _decided(self, node: int) -> bool:
+        """Indica si ya se sabe quién ocupa el hueco de un nodo."""
+        return node >= self.size or self.status[node] == RESOLVED
+
+    def nbytes(self) -> int:
+        """Memoria ocupada por los arrays del cuadro (bytes)."""
+        total = len(self.slots) * self.slots.itemsize + len(self.status)
+        if self.match_ids is not None:
+            total += len(self.match_ids) * self.match_ids.itemsize
+        if self._player_index is not None:
+            total += sum(len(a) * a.itemsize for a in self._player_index)
+        return total
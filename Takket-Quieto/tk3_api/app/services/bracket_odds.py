@@ -0,0 +1,175 @@
+"""
+Probabilidades de cada jugador en un torneo en juego (Monte Carlo).
+
+Parte del estado actual del cuadro (BracketEngine): los combates resueltos
+quedan fijos y los pendientes se simulan ronda a ronda hasta la final. Cada
+simulación es una fila de una matriz de NumPy, así que una ronda de todas
+las simulaciones de un lote son unas pocas operaciones vectoriales:
+
+- La matriz de ocupantes de la ronda r-1 (simulaciones x huecos) se parte en
+  columnas pares e impares: los dos jugadores de cada combate de la ronda r.
+- Los combates resueltos copian su ganador; en los pendientes gana el
+  primero si un número aleatorio queda por debajo de su probabilidad de
+  victoria, y los huecos vacíos (BYE) dejan pasar al rival.
+- np.bincount de los ganadores cuenta cuántas veces llega cada jugador a la
+  ronda siguiente.
+
+La probabilidad de victoria de un combate sale de la tasa de victorias
+histórica de cada jugador (tabla player_stats, con las victorias por BYE
+incluidas), suavizada con (victorias + 1) / (combates + 2) para que los
+jugadores sin historial cuenten como 0.5, y combinada con la fórmula log5:
+p = a(1-b) / (a(1-b) + b(1-a)).
+
+Las simulaciones se ejecutan por lotes hasta llegar al número pedido o
+agotar el presupuesto de tiempo (al menos un lote). NumPy es una dependencia
+opcional: sin ella, available() devuelve False.
+"""
+
+import time
+from typing import Dict, Tuple
+from .bracket_engine import RESOLVED, BracketEngine
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# Celdas (simulaciones x huecos) de la matriz de cada lote: lotes pequeños
+# (256 KB por matriz de int32) para que cada ronda trabaje en la caché del
+# procesador; con lotes de millones de celdas la simulación es 2-3 veces
+# más lenta
+_BATCH_CELLS = 1 << 16
+
+
+def available() -> bool:
+    """Indica si NumPy está instalado (necesario para simular)."""
+    return np is not None
+
+
+def win_rate(wins: int, losses: int) -> float:
+    """Tasa de victorias suavizada: 0.5 sin historial."""
+    return (wins + 1) / (wins + losses + 2)
+
+
+def simulate(
+    engine: BracketEngine,
+    records: Dict[int, Tuple[int, int]],
+    simulations: int,
+    time_budget: float,
+    seed: int = 0,
+) -> dict:
+    """
+    Simula la resolución del resto del cuadro y cuenta hasta qué ronda llega
+    cada jugador.
+
+    :param engine: Estado actual del cuadro.
+    :param records: Historial de cada jugador: {player_id: (victorias, derrotas)}.
+    :param simulations: Número de simulaciones pedido.
+    :param time_budget: Segundos disponibles; se detiene tras el lote que lo agote.
+    :param seed: Semilla del generador (mismo estado y semilla, mismo resultado).
+    :return: Diccionario con rounds, simulations, elapsed_ms, complete y
+        players (player_id, win_rate, reach por ronda y win), de mayor a menor
+        probabilidad de ganar.
+    """
+    if np is None:
+        raise RuntimeError("Odds simulation requires numpy")
+
+    start = time.perf_counter()
+    size, rounds = engine.size, engine.rounds
+    slots = np.frombuffer(engine.slots, dtype=np.int32)
+    resolved = np.frombuffer(engine.status, dtype=np.uint8) == RESOLVED
+
+    # Ids densos: 0 es el hueco vacío y 1..n los jugadores, para indexar las
+    # fuerzas y contar con bincount
+    leaves = slots[size:]
+    player_ids = np.unique(leaves[leaves != 0])
+    dense = np.zeros(2 * size, dtype=np.int32)
+    occupied = slots != 0
+    dense[occupied] = np.searchsorted(player_ids, slots[occupied]) + 1
+
+    rates = np.full(len(player_ids) + 1, 0.5)
+    for i, player_id in enumerate(player_ids.tolist(), start=1):
+        wins, losses = records.get(player_id, (0, 0))
+        rates[i] = win_rate(wins, losses)
+    # log5 como cociente de "cuotas": p = odds_a / (odds_a + odds_b). El
+    # hueco vacío tiene cuota 0: su rival gana siempre (BYE)
+    odds = (rates / (1 - rates)).astype(np.float32)
+    odds[0] = 0
+
+    # Combates de cada ronda: columnas resueltas (ganador fijo) y pendientes
+    plan = []
+    for r in range(1, rounds + 1):
+        first = size >> r
+        fixed = resolved[first : 2 * first]
+        plan.append(
+            (
+                np.flatnonzero(fixed),
+                dense[first : 2 * first][fixed],
+                np.flatnonzero(~fixed),
+            )
+        )
+    # Los jugadores de la ronda 1 son los mismos en todas las simulaciones:
+    # su probabilidad de ganar se calcula una sola vez por combate
+    first_a = dense[size::2][plan[0][2]]
+    first_b = dense[size + 1 :: 2][plan[0][2]]
+    first_total = odds[first_a] + odds[first_b]
+    first_p = np.divide(
+        odds[first_a],
+        first_total,
+        out=np.zeros_like(first_total),
+        where=first_total > 0,
+    )
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((rounds + 1, len(player_ids) + 1), dtype=np.int64)
+    batch = max(1, min(simulations, _BATCH_CELLS // size))
+    done = 0
+    while done < simulations:
+        n = min(batch, simulations - done)
+        counts[0] += n * np.bincount(dense[size:], minlength=counts.shape[1])
+        level = None
+        for r, (fixed_cols, fixed_winners, pending_cols) in enumerate(plan, start=1):
+            if level is None:
+                a, b = first_a, first_b
+                a_wins = rng.random((n, len(pending_cols)), dtype=np.float32) < first_p
+            else:
+                if len(fixed_cols) == 0:
+                    # Ronda sin resolver: vistas sin copia de las columnas
+                    a, b = level[:, 0::2], level[:, 1::2]
+                else:
+                    a, b = level[:, 2 * pending_cols], level[:, 2 * pending_cols + 1]
+                # u < odds_a / (odds_a + odds_b), sin dividir y exacto con cuota 0
+                u = rng.random(a.shape, dtype=np.float32)
+                a_wins = u * odds[b] < (1 - u) * odds[a]
+            # Aritmética en lugar de np.where: b + (a - b) si gana a
+            won = b + a_wins * (a - b)
+            if len(fixed_cols) == 0:
+                winners = won
+            else:
+                winners = np.empty((n, size >> r), dtype=np.int32)
+                winners[:, fixed_cols] = fixed_winners
+                winners[:, pending_cols] = won
+            counts[r] += np.bincount(winners.ravel(), minlength=counts.shape[1])
+            level = winners
+        done += n
+        if time.perf_counter() - start >= time_budget:
+            break
+
+    probabilities = counts[:, 1:] / done
+    players = [
+        {
+            "player_id": int(player_id),
+            "win_rate": float(rates[i + 1]),
+            "reach": probabilities[:rounds, i].tolist(),
+            "win": float(probabilities[rounds, i]),
+        }
+        for i, player_id in enumerate(player_ids)
+    ]
+    players.sort(key=lambda player: (-player["win"], player["player_id"]))
+    return {
+        "rounds": rounds,
+        "simulations": done,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        "complete": done == simulations,
+        "players": players,
+    }
@@ -1,6 +1,14 @@
+from collections import Counter
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+from ..core import data_versions
+from ..core.live_brackets import notify_bracket_changed
+from ..core.metrics import matches_resolved
+from ..core.report_cache import on_matches_changed
 from ..models.match import Match, MatchStatus
+from ..models.tournament import Tournament, TournamentStatus
+from .player_stats_service import PlayerStatsService
 
 
 class MatchesService:
@@ -11,6 +19,9 @@ class MatchesService:
     y el registro oficial de resultados y ganadores.
     """
 
+    def __init__(self):
+        self.stats_service = PlayerStatsService()
+
     def get_by_id(self, db: Session, match_id: int) -> Optional[Match]:
         """
         Recupera los detalles de un combate específico.
@@ -28,26 +39,238 @@ class MatchesService:
         Valida rigurosamente que:
         1. El combate exista.
         2. El combate no haya sido resuelto previamente.
-        3. El ganador propuesto sea uno de los dos participantes del combate.
+        3. El combate tenga ya sus dos participantes.
+        4. El ganador propuesto sea uno de los dos participantes del combate.
+
+        En los torneos con auto_advance el ganador se escribe directamente en
+        el combate siguiente (ver _advance_winner).
 
         :param db: Sesión de la base de datos.
         :param match_id: ID del combate.
         :param winner_id: ID del jugador que se declara ganador.
         :return: El combate actualizado con el ganador y estado RESOLVED.
         """
-        match = self.get_by_id(db, match_id)
+        # Bloqueo de fila: dos resoluciones simultáneas del mismo combate no
+        # pueden descontar dos veces el contador de pendientes del torneo
+        match = db.query(Match).filter(Match.id == match_id).with_for_update().first()
+        self._validate(match, winner_id)
+
+        match.winner_id = winner_id
+        self._resolve(db, [match])
+
+        tournament = db.get(Tournament, match.tournament_id)
+        if tournament.auto_advance:
+            self._advance_winner(db, tournament, match)
+
+        db.commit()
+        on_matches_changed([match.tournament_id])
+        notify_bracket_changed([match.tournament_id])
+        matches_resolved.inc()
+        db.refresh(match)
+        return match
+
+    def set_winners(
+        self,
+        db: Session,
+        results: Sequence[Tuple[int, int]],
+        all_or_nothing: bool = False,
+    ) -> dict:
+        """
+        Registra los ganadores de varios combates en una sola transacción.
+
+        Los combates se cargan (y bloquean) con una única consulta y cada
+        resultado se valida con las mismas reglas que set_winner, en el orden
+        recibido. Los combates válidos se escriben con un UPDATE por lotes al
+        hacer flush, y las estadísticas y contadores de pendientes se
+        actualizan una vez para todo el lote. En los torneos con auto_advance
+        el ganador se propaga en el momento, así que un mismo lote puede
+        resolver un combate y después el combate siguiente que este alimenta.
+
+        :param db: Sesión de la base de datos.
+        :param results: Pares (match_id, winner_id).
+        :param all_or_nothing: Si es True, un solo error descarta todo el lote.
+        :return: Diccionario con los totales y el resultado de cada par.
+        """
+        match_ids = sorted({match_id for match_id, _ in results})
+        # Bloqueo en orden de id para no interbloquearse con otros lotes
+        matches: Dict[int, Match] = {
+            match.id: match
+            for match in db.execute(
+                select(Match)
+                .where(Match.id.in_(match_ids))
+                .order_by(Match.id)
+                .with_for_update()
+            ).scalars()
+        }
+        tournament_ids = {match.tournament_id for match in matches.values()}
+        tournaments: Dict[int, Tournament] = {
+            tournament.id: tournament
+            for tournament in db.execute(
+                select(Tournament).where(Tournament.id.in_(tournament_ids))
+            ).scalars()
+        }
+
+        outcomes = []
+        resolved: List[Match] = []
+        for match_id, winner_id in results:
+            outcome = {"match_id": match_id, "winner_id": winner_id, "ok": False}
+            outcomes.append(outcome)
+            match = matches.get(match_id)
+            try:
+                self._validate(match, winner_id)
+            except Exception as e:
+                outcome["error"] = str(e)
+                continue
+
+            match.winner_id = winner_id
+            match.status = MatchStatus.RESOLVED
+            resolved.append(match)
+            outcome["ok"] = True
+
+            tournament = tournaments[match.tournament_id]
+            if tournament.auto_advance:
+                self._advance_winner(db, tournament, match)
+
+        failed = sum(1 for outcome in outcomes if not outcome["ok"])
+        if failed and all_or_nothing:
+            db.rollback()
+            for outcome in outcomes:
+                if outcome["ok"]:
+                    outcome["ok"] = False
+                    outcome["error"] = "Not applied: another result in the batch failed"
+            return {"applied": 0, "failed": len(outcomes), "results": outcomes}
+
+        self._resolve(db, resolved)
+
+        # Copia de los combates antes del commit (evita una relectura por fila)
+        snapshots = {
+            match.id: {
+                "id": match.id,
+                "tournament_id": match.tournament_id,
+                "round": match.round,
+                "position": match.position,
+                "player1_id": match.player1_id,
+                "player2_id": match.player2_id,
+                "winner_id": match.winner_id,
+                "status": match.status,
+            }
+            for match in resolved
+        }
+        db.commit()
+        if resolved:
+            on_matches_changed(match.tournament_id for match in resolved)
+            notify_bracket_changed(match.tournament_id for match in resolved)
+            matches_resolved.inc(amount=len(resolved))
+
+        for outcome in outcomes:
+            if outcome["ok"]:
+                outcome["match"] = snapshots[outcome["match_id"]]
+        return {
+            "applied": len(outcomes) - failed,
+            "failed": failed,
+            "results": outcomes,
+        }
+
+    def _validate(self, match: Optional[Match], winner_id: int) -> None:
+        """
+        Comprueba que se puede declarar a winner_id ganador del combate con
+        las reglas descritas en set_winner; si no, lanza la excepción con el motivo.
+        """
         if not match:
             raise Exception("Match not found")
 
         if match.status == MatchStatus.RESOLVED:
             raise Exception("Match is already resolved")
 
+        if match.player1_id is None or match.player2_id is None:
+            raise Exception("Match is still waiting for its players")
+
         if winner_id not in [match.player1_id, match.player2_id]:
             raise Exception("Winner must be one of the match players")
 
-        match.winner_id = winner_id
-        match.status = MatchStatus.RESOLVED
+    def _resolve(self, db: Session, matches: List[Match]) -> None:
+        """
+        Marca como resueltos combates que ya tienen asignado su ganador (sin commit).
 
-        db.commit()
-        db.refresh(match)
-        return match
+        Actualiza en la misma transacción las estadísticas del ranking, el
+        contador de combates pendientes de cada torneo afectado y las
+        versiones de datos usadas como ETag.
+        """
+        for match in matches:
+            match.status = MatchStatus.RESOLVED
+
+        self.stats_service.record_resolved_matches(db, matches)
+        per_tournament = Counter(match.tournament_id for match in matches)
+        for tournament_id, count in per_tournament.items():
+            db.execute(
+                update(Tournament)
+                .where(Tournament.id == tournament_id)
+                .values(pending_matches=Tournament.pending_matches - count)
+            )
+        if matches:
+            data_versions.bump(
+                db,
+                data_versions.GLOBAL_SCOPE,
+                *(data_versions.tournament_scope(tid) for tid in per_tournament),
+            )
+
+    def _advance_winner(
+        self, db: Session, tournament: Tournament, match: Match
+    ) -> None:
+        """
+        Propaga el ganador de un combate al cuadro pre-generado (sin commit).
+
+        El combate (r, p) alimenta el hueco player1 (p impar) o player2 (p par)
+        del combate (r+1, ceil(p/2)). Si el combate hermano terminó vacío, el
+        siguiente combate es un BYE: se resuelve y se sigue propagando. Al
+        resolverse la final, el torneo queda FINISHED con su campeón.
+
+        Cada paso toca un número fijo de filas localizadas por índice, y como
+        mucho hay una cascada por ronda.
+        """
+        while True:
+            if match.round == tournament.current_round:
+                tournament.status = TournamentStatus.FINISHED
+                tournament.winner_id = match.winner_id
+                return
+
+            next_match = (
+                db.query(Match)
+                .filter(
+                    Match.tournament_id == match.tournament_id,
+                    Match.round == match.round + 1,
+                    Match.position == (match.position + 1) // 2,
+                )
+                .with_for_update()
+                .first()
+            )
+            if match.position % 2 == 1:
+                next_match.player1_id = match.winner_id
+                other_player_id = next_match.player2_id
+                sibling_position = match.position + 1
+            else:
+                next_match.player2_id = match.winner_id
+                other_player_id = next_match.player1_id
+                sibling_position = match.position - 1
+
+            # Con rival ya asignado el combate queda listo para disputarse
+            if other_player_id is not None:
+                return
+
+            sibling = (
+                db.query(Match)
+                .filter(
+                    Match.tournament_id == match.tournament_id,
+                    Match.round == match.round,
+                    Match.position == sibling_position,
+                )
+                .first()
+            )
+            # Rival aún por decidir: se espera a que se resuelva el combate hermano
+            if sibling.status != MatchStatus.RESOLVED:
+                return
+
+            # El combate hermano terminó vacío: BYE en ronda intermedia
+            next_match.winner_id = match.winner_id
+            self._resolve(db, [next_match])
+            match = next_match
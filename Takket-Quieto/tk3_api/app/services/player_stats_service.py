@@ -0,0 +1,164 @@
+"""
+Servicio de mantenimiento de las estadísticas agregadas de jugadores.
+
+Centraliza las reglas de conteo de victorias y derrotas, tanto para la
+actualización incremental al resolver combates como para la reconstrucción
+completa de la tabla player_stats a partir del historial de combates.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+from ..core import data_versions
+from ..core.report_cache import on_matches_changed
+from ..core.upsert import upsert
+from ..models.match import Match, MatchStatus
+from ..models.player_stats import PlayerStats
+
+
+class PlayerStatsService:
+    """
+    Servicio encargado de mantener la tabla player_stats.
+
+    Reglas de conteo (idénticas a las del ranking histórico):
+    - Victoria: el jugador es el winner_id de un combate resuelto.
+    - Derrota: el jugador participó en un combate resuelto sin ganarlo
+      y el combate NO es BYE (player2_id no es NULL).
+    """
+
+    def record_resolved_matches(self, db: Session, matches: Iterable[Match]) -> None:
+        """
+        Suma a player_stats la contribución de los combates recién resueltos.
+
+        No realiza commit: está pensado para ejecutarse dentro de la misma
+        transacción que resuelve los combates.
+
+        :param db: Sesión de la base de datos.
+        :param matches: Combates que acaban de pasar a estado RESOLVED.
+        """
+        # player_id -> [victorias, derrotas]
+        deltas: Dict[int, List[int]] = {}
+
+        for match in matches:
+            if match.status != MatchStatus.RESOLVED:
+                continue
+
+            if match.winner_id is not None:
+                deltas.setdefault(match.winner_id, [0, 0])[0] += 1
+
+                # Los BYE no cuentan como derrota para nadie
+                if match.player2_id is not None:
+                    for player_id in (match.player1_id, match.player2_id):
+                        if player_id is not None and player_id != match.winner_id:
+                            deltas.setdefault(player_id, [0, 0])[1] += 1
+
+        now = datetime.utcnow()
+        # Upsert en orden de id: la primera resolución de un jugador crea su
+        # fila sin carreras, y dos transacciones bloquean las filas en el
+        # mismo orden
+        for player_id, (wins, losses) in sorted(deltas.items()):
+            db.execute(
+                upsert(
+                    db,
+                    PlayerStats,
+                    values={
+                        "player_id": player_id,
+                        "wins": wins,
+                        "losses": losses,
+                        "matches_played": wins + losses,
+                        "last_resolved_at": now,
+                    },
+                    on_conflict={
+                        "wins": PlayerStats.wins + wins,
+                        "losses": PlayerStats.losses + losses,
+                        "matches_played": PlayerStats.matches_played + wins + losses,
+                        "last_resolved_at": now,
+                    },
+                )
+            )
+
+    def compute_from_matches(self, db: Session) -> list:
+        """
+        Calcula las estadísticas de todos los jugadores recorriendo la tabla match.
+
+        Se resuelve con una única consulta agregada: cada fila de
+        "participaciones" aporta una victoria o una derrota a un jugador.
+
+        :param db: Sesión de la base de datos.
+        :return: Filas (player_id, wins, losses) de los jugadores con combates.
+        """
+        resolved = Match.status == MatchStatus.RESOLVED
+
+        participations = union_all(
+            # Victorias: el jugador es el ganador del combate
+            select(
+                Match.winner_id.label("player_id"),
+                literal(1).label("win"),
+                literal(0).label("loss"),
+            ).where(resolved, Match.winner_id.isnot(None)),
+            # Derrotas como player1: participó, no ganó y NO es BYE
+            select(
+                Match.player1_id.label("player_id"),
+                literal(0).label("win"),
+                literal(1).label("loss"),
+            ).where(
+                resolved,
+                Match.player2_id.isnot(None),
+                Match.winner_id != Match.player1_id,
+            ),
+            # Derrotas como player2: participó y no ganó
+            select(
+                Match.player2_id.label("player_id"),
+                literal(0).label("win"),
+                literal(1).label("loss"),
+            ).where(
+                resolved,
+                Match.player2_id.isnot(None),
+                Match.winner_id != Match.player2_id,
+            ),
+        ).subquery()
+
+        return db.execute(
+            select(
+                participations.c.player_id,
+                func.sum(participations.c.win).label("wins"),
+                func.sum(participations.c.loss).label("losses"),
+            ).group_by(participations.c.player_id)
+        ).all()
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Reconstruye por completo la tabla player_stats desde el historial.
+
+        Sirve tanto para la carga inicial como para reparar desviaciones.
+        Se conserva el last_resolved_at existente, ya que la tabla match
+        no almacena la fecha de resolución.
+
+        :param db: Sesión de la base de datos.
+        :return: Número de jugadores con estadísticas tras la reconstrucción.
+        """
+        last_resolved = dict(
+            db.execute(
+                select(PlayerStats.player_id, PlayerStats.last_resolved_at)
+            ).all()
+        )
+        rows = [
+            {
+                "player_id": row.player_id,
+                "wins": int(row.wins),
+                "losses": int(row.losses),
+                "matches_played": int(row.wins) + int(row.losses),
+                "last_resolved_at": last_resolved.get(row.player_id),
+            }
+            for row in self.compute_from_matches(db)
+        ]
+
+        db.execute(delete(PlayerStats))
+        if rows:
+            db.execute(insert(PlayerStats), rows)
+        data_versions.bump(db, data_versions.GLOBAL_SCOPE)
+        db.commit()
+        # Solo cambia el ranking; ningún historial de torneo se ve afectado
+        on_matches_changed([])
+        return len(rows)
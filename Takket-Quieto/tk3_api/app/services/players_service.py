@@ -1,7 +1,30 @@
+import csv
+import io
+import json
 from typing import List, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from ..core import data_versions
+from ..core.config import PLAYER_IMPORT_CHUNK_SIZE, PLAYER_IMPORT_MAX_ROWS
+from ..core.fast_json import schema_columns
+from ..core.id_allocator import player_ids
+from ..core.player_cache import player_cache
+from ..core.report_cache import on_players_changed
 from ..models.player import Player
-from ..schemas.player_schemas import PlayerCreate, PlayerUpdate
+from ..schemas.player_schemas import (
+    PlayerCreate,
+    PlayerImportStatus,
+    PlayerResponse,
+    PlayerUpdate,
+)
+
+# Longitud máxima del nick (columna player.nick)
+NICK_MAX_LENGTH = Player.__table__.c.nick.type.length
+
+# Tamaño de lote para las consultas IN de validación de nicks
+_NICK_LOOKUP_CHUNK = 1000
 
 
 class PlayersService:
@@ -12,14 +35,41 @@ class PlayersService:
     su creación, recuperación, actualización y gestión de su estado de activación.
     """
 
-    def get_all(self, db: Session) -> List[Player]:
+    def get_all(
+        self, db: Session, limit: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Player]:
         """
-        Recupera la lista completa de jugadores registrados en el sistema.
+        Recupera los jugadores registrados en el sistema, ordenados por id.
 
         :param db: Sesión de la base de datos.
+        :param limit: Número máximo de jugadores (None para todos).
+        :param after_id: Cursor keyset: devuelve solo jugadores con id mayor.
         :return: Lista de objetos Player.
         """
-        return db.query(Player).all()
+        query = db.query(Player)
+        if after_id is not None:
+            query = query.filter(Player.id > after_id)
+        return query.order_by(Player.id).limit(limit).all()
+
+    def get_all_rows(
+        self, db: Session, limit: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Igual que get_all, pero devuelve diccionarios con los campos de
+        PlayerResponse leídos como tuplas (ruta rápida de serialización).
+
+        :param db: Sesión de la base de datos.
+        :param limit: Número máximo de jugadores (None para todos).
+        :param after_id: Cursor keyset: devuelve solo jugadores con id mayor.
+        :return: Lista de diccionarios, uno por jugador.
+        """
+        stmt = select(*schema_columns(Player, PlayerResponse))
+        if after_id is not None:
+            stmt = stmt.where(Player.id > after_id)
+        stmt = stmt.order_by(Player.id).limit(limit)
+        result = db.execute(stmt)
+        keys = list(result.keys())
+        return [dict(zip(keys, row)) for row in result]
 
     def get_by_id(self, db: Session, player_id: int) -> Optional[Player]:
         """
@@ -34,19 +84,21 @@ class PlayersService:
     def create_player(self, db: Session, player: PlayerCreate) -> Player:
         """
         Registra un nuevo jugador en el sistema.
-        Incluye un workaround para el error de duplicidad de ID 0 si el auto-incremento falla.
+        El id se asigna explícitamente (la tabla puede no tener AUTO_INCREMENT
+        configurado) a partir de los bloques reservados por el proceso.
         """
-        # Obtenemos el ID mas alto actual para evitar el error 'Duplicate entry 0'
-        # si la tabla no tiene AUTO_INCREMENT configurado correctamente.
-        max_id = db.query(Player.id).order_by(Player.id.desc()).first()
-        next_id = (max_id[0] + 1) if max_id else 1
+        next_id = player_ids.allocate(db)[0]
 
         db_player = Player(
             id=next_id, nick=player.nick, logo_url=player.logo_url, active=player.active
         )
         db.add(db_player)
+        data_versions.bump(db, data_versions.GLOBAL_SCOPE)
         db.commit()
         db.refresh(db_player)
+
+        # Write-through: la caché de identidad refleja el nuevo estado
+        player_cache.put(db_player)
         return db_player
 
     def update_player(
@@ -72,8 +124,13 @@ class PlayersService:
         if player_update.active is not None:
             db_player.active = player_update.active
 
+        data_versions.bump(db, data_versions.GLOBAL_SCOPE)
         db.commit()
         db.refresh(db_player)
+
+        # Write-through: la caché de identidad refleja el nuevo estado
+        player_cache.put(db_player)
+        on_players_changed()
         return db_player
 
     def toggle_active(self, db: Session, player_id: int) -> Optional[Player]:
@@ -89,6 +146,202 @@ class PlayersService:
             return None
 
         db_player.active = not db_player.active
+        data_versions.bump(db, data_versions.GLOBAL_SCOPE)
         db.commit()
         db.refresh(db_player)
+
+        # Write-through: la caché de identidad refleja el nuevo estado
+        player_cache.put(db_player)
+        on_players_changed()
         return db_player
+
+    def parse_import(self, raw: bytes, content_type: str) -> List[dict]:
+        """
+        Convierte el cuerpo de una importación masiva en una lista de filas.
+
+        Se acepta JSON (lista de objetos con nick, logo_url y active) o CSV
+        con cabecera (content type text/csv). En CSV las celdas vacías se
+        omiten para que se apliquen los valores por defecto del esquema.
+
+        :param raw: Cuerpo de la petición sin procesar.
+        :param content_type: Cabecera Content-Type de la petición.
+        :return: Lista de diccionarios, uno por fila, sin validar.
+        """
+        try:
+            text = raw.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise Exception("Import payload must be UTF-8 encoded")
+
+        if "csv" in (content_type or "").lower():
+            reader = csv.DictReader(io.StringIO(text))
+            if not reader.fieldnames or "nick" not in reader.fieldnames:
+                raise Exception("CSV import requires a header row with a nick column")
+            rows = [
+                {
+                    key: value.strip()
+                    for key, value in record.items()
+                    if key is not None and value is not None and value.strip() != ""
+                }
+                for record in reader
+            ]
+        else:
+            try:
+                rows = json.loads(text)
+            except ValueError as e:
+                raise Exception(f"Invalid JSON payload: {e}")
+            if not isinstance(rows, list):
+                raise Exception("JSON import must be a list of players")
+
+        if len(rows) > PLAYER_IMPORT_MAX_ROWS:
+            raise Exception(
+                f"Import is limited to {PLAYER_IMPORT_MAX_ROWS} rows per request"
+            )
+        return rows
+
+    def import_players(self, db: Session, rows: List[dict]) -> dict:
+        """
+        Da de alta jugadores de forma masiva en una única transacción.
+
+        Todas las filas se validan antes de escribir: el esquema, los nicks
+        repetidos dentro de la propia importación y los nicks ya registrados
+        (consultados con IN sobre el índice único de nick, en lotes). Las filas
+        válidas se insertan con un INSERT multi-fila por lotes de
+        PLAYER_IMPORT_CHUNK_SIZE; las rechazadas se informan sin abortar el resto.
+        Si una escritura concurrente ocupa un nick entre la validación y el
+        INSERT, las filas se reintentan una a una y la que choca se informa
+        como DUPLICATE.
+
+        :param db: Sesión de la base de datos.
+        :param rows: Filas sin validar (ver parse_import).
+        :return: Informe con totales y el resultado de cada fila.
+        """
+        results = []
+        accepted = []
+        first_row_by_nick = {}
+
+        for number, raw in enumerate(rows, start=1):
+            nick = raw.get("nick") if isinstance(raw, dict) else None
+            result = {"row": number, "nick": nick if isinstance(nick, str) else None}
+            results.append(result)
+
+            try:
+                player = PlayerCreate.model_validate(raw)
+            except ValidationError as e:
+                error = e.errors()[0]
+                field = ".".join(str(part) for part in error["loc"]) or "row"
+                result.update(
+                    status=PlayerImportStatus.INVALID, detail=f"{field}: {error['msg']}"
+                )
+                continue
+
+            if not player.nick.strip():
+                result.update(
+                    status=PlayerImportStatus.INVALID, detail="Nick cannot be empty"
+                )
+            elif len(player.nick) > NICK_MAX_LENGTH:
+                result.update(
+                    status=PlayerImportStatus.INVALID,
+                    detail=f"Nick is longer than {NICK_MAX_LENGTH} characters",
+                )
+            elif player.nick in first_row_by_nick:
+                result.update(
+                    status=PlayerImportStatus.DUPLICATE,
+                    detail=f"Nick repeated in row {first_row_by_nick[player.nick]}",
+                )
+            else:
+                first_row_by_nick[player.nick] = number
+                accepted.append((result, player))
+
+        # Nicks ya registrados: una consulta IN por lote sobre el índice único
+        nicks = list(first_row_by_nick)
+        existing = set()
+        for start in range(0, len(nicks), _NICK_LOOKUP_CHUNK):
+            existing.update(
+                db.execute(
+                    select(Player.nick).where(
+                        Player.nick.in_(nicks[start : start + _NICK_LOOKUP_CHUNK])
+                    )
+                ).scalars()
+            )
+
+        to_insert = []
+        for result, player in accepted:
+            if player.nick in existing:
+                result.update(
+                    status=PlayerImportStatus.DUPLICATE, detail="Nick already exists"
+                )
+            else:
+                to_insert.append((result, player))
+
+        if to_insert:
+            # Un único rango de ids para toda la importación
+            ids = player_ids.allocate(db, len(to_insert))
+            records = []
+            for player_id, (result, player) in zip(ids, to_insert):
+                record = {
+                    "id": player_id,
+                    "nick": player.nick,
+                    "logo_url": player.logo_url,
+                    "active": player.active,
+                }
+                records.append(record)
+                result.update(status=PlayerImportStatus.CREATED, id=record["id"])
+
+            try:
+                for start in range(0, len(records), PLAYER_IMPORT_CHUNK_SIZE):
+                    db.execute(
+                        insert(Player),
+                        records[start : start + PLAYER_IMPORT_CHUNK_SIZE],
+                    )
+            except IntegrityError:
+                # Nick ocupado por una escritura concurrente (o por la colación
+                # del servidor): se reintenta fila a fila para saber cuál choca
+                db.rollback()
+                self._insert_one_by_one(db, records, [r for r, _ in to_insert])
+            data_versions.bump(db, data_versions.GLOBAL_SCOPE)
+            db.commit()
+
+        created = sum(
+            1 for result in results if result["status"] == PlayerImportStatus.CREATED
+        )
+        return {
+            "total": len(results),
+            "created": created,
+            "rejected": len(results) - created,
+            "results": results,
+        }
+
+    def _insert_one_by_one(
+        self, db: Session, records: List[dict], results: List[dict]
+    ) -> None:
+        """
+        Inserta las filas de una importación de una en una, cada una en su
+        propio SAVEPOINT: las que chocan con un nick ya registrado se marcan
+        como DUPLICATE sin deshacer el resto.
+
+        Solo se considera DUPLICATE si, tras el error, el nick existe (con la
+        misma comparación que el índice único); cualquier otra violación
+        (clave primaria, claves ajenas) anula la importación.
+
+        :param db: Sesión de la base de datos (sin cambios pendientes).
+        :param records: Filas a insertar (ids ya reservados).
+        :param results: Resultado de cada fila, en el mismo orden.
+        :raises Exception: Si una fila falla por otra restricción.
+        """
+        for record, result in zip(records, results):
+            try:
+                with db.begin_nested():
+                    db.execute(insert(Player), [record])
+            except IntegrityError as e:
+                taken = db.execute(
+                    select(Player.id).where(Player.nick == record["nick"])
+                ).first()
+                if taken is None:
+                    db.rollback()
+                    raise Exception(
+                        f"Import failed at row {result['row']}: {e.orig}"
+                    ) from e
+                result.pop("id", None)
+                result.update(
+                    status=PlayerImportStatus.DUPLICATE, detail="Nick already exists"
+                )
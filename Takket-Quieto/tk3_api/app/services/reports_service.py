@@ -9,12 +9,39 @@ Propósito académico: Encapsular la lógica de negocio compleja separada
 de los controladores (routers), siguiendo el principio de responsabilidad única (SOLID).
 """
 
-from typing import List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator, List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import Select, or_, select
+from ..core.player_cache import player_cache
 from ..models.match import Match, MatchStatus
 from ..models.player import Player
-from ..schemas.reports_schemas import LeaderboardEntry, MatchHistoryEntry
+from ..models.player_stats import PlayerStats
+from ..schemas.reports_schemas import (
+    ExportFormat,
+    LeaderboardEntry,
+    MatchHistoryEntry,
+)
+
+# Filas leídas del cursor de servidor (y enviadas al cliente) en cada lote
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    "match_id",
+    "tournament_id",
+    "round",
+    "position",
+    "player1_id",
+    "player1_nick",
+    "player2_id",
+    "player2_nick",
+    "winner_id",
+    "winner_nick",
+    "status",
+)
 
 
 class ReportsService:
@@ -29,11 +56,12 @@ class ReportsService:
         """
         Genera el ranking global de jugadores basado en sus victorias y derrotas.
 
-        Calcula las estadísticas de cada jugador contabilizando únicamente
-        los combates que han sido resueltos (status = RESOLVED). No se cuentan
-        como derrotas los combates BYE (donde player2_id es NULL).
+        Lee la tabla player_stats, mantenida de forma incremental cada vez que
+        se resuelve un combate, por lo que el coste depende del número de
+        jugadores y no del tamaño del historial de combates. Solo se cuentan
+        los combates resueltos y no se cuentan como derrotas los BYE.
 
-        Lógica de conteo:
+        Lógica de conteo (ver PlayerStatsService):
         - Victoria: El jugador es el winner_id del combate.
         - Derrota: El jugador participó (player1_id o player2_id) pero no ganó,
           y el combate NO es BYE (player2_id no es NULL).
@@ -41,55 +69,33 @@ class ReportsService:
         :param db: Sesión de la base de datos.
         :return: Lista de entradas del ranking ordenadas por victorias descendente.
         """
-        # Obtener todos los jugadores activos
-        players = db.query(Player).all()
-
-        leaderboard = []
-
-        for player in players:
-            # Contar victorias: combates resueltos donde este jugador ganó
-            wins = (
-                db.query(Match)
-                .filter(
-                    and_(
-                        Match.winner_id == player.id,
-                        Match.status == MatchStatus.RESOLVED,
-                    )
-                )
-                .count()
+        # Solo jugadores que han participado en al menos un combate.
+        # Orden: victorias descendente, derrotas ascendente y el id como desempate.
+        rows = db.execute(
+            select(
+                PlayerStats.player_id,
+                Player.nick,
+                PlayerStats.wins,
+                PlayerStats.losses,
             )
-
-            # Contar derrotas: combates resueltos donde participó pero no ganó
-            # y que NO sean BYE (player2_id no es NULL)
-            losses = (
-                db.query(Match)
-                .filter(
-                    and_(
-                        Match.status == MatchStatus.RESOLVED,
-                        Match.player2_id.isnot(None),  # NO contar BYE
-                        Match.winner_id != player.id,  # No ganó
-                        # Participó como player1 o player2
-                        (
-                            (Match.player1_id == player.id)
-                            | (Match.player2_id == player.id)
-                        ),
-                    )
-                )
-                .count()
+            .join(Player, Player.id == PlayerStats.player_id)
+            .where(or_(PlayerStats.wins > 0, PlayerStats.losses > 0))
+            .order_by(
+                PlayerStats.wins.desc(),
+                PlayerStats.losses.asc(),
+                PlayerStats.player_id,
             )
+        ).all()
 
-            # Solo incluir jugadores que han participado en al menos un combate
-            if wins > 0 or losses > 0:
-                leaderboard.append(
-                    LeaderboardEntry(
-                        player_id=player.id, nick=player.nick, wins=wins, losses=losses
-                    )
-                )
-
-        # Ordenar por victorias descendente, luego por derrotas ascendente
-        leaderboard.sort(key=lambda x: (-x.wins, x.losses))
-
-        return leaderboard
+        return [
+            LeaderboardEntry(
+                player_id=row.player_id,
+                nick=row.nick,
+                wins=row.wins,
+                losses=row.losses,
+            )
+            for row in rows
+        ]
 
     def get_tournament_matches(
         self, db: Session, tournament_id: int
@@ -113,37 +119,150 @@ class ReportsService:
             .all()
         )
 
+        # Resolver todos los nicks de una vez a través de la caché de jugadores;
+        # los que falten se cargan con una única consulta IN
+        player_ids = {
+            player_id
+            for match in matches
+            for player_id in (match.player1_id, match.player2_id, match.winner_id)
+            if player_id
+        }
+        players = player_cache.get_many(db, player_ids)
+        nicks = {player_id: player.nick for player_id, player in players.items()}
+
         history = []
 
         for match in matches:
-            # Obtener información del jugador 1
-            player1 = None
-            if match.player1_id:
-                player1 = db.query(Player).filter(Player.id == match.player1_id).first()
-
-            # Obtener información del jugador 2 (puede ser None si es BYE)
-            player2 = None
-            if match.player2_id:
-                player2 = db.query(Player).filter(Player.id == match.player2_id).first()
-
-            # Obtener información del ganador (puede ser None si está pendiente)
-            winner = None
-            if match.winner_id:
-                winner = db.query(Player).filter(Player.id == match.winner_id).first()
-
             history.append(
                 MatchHistoryEntry(
                     match_id=match.id,
                     round=match.round,
                     position=match.position,
                     player1_id=match.player1_id,
-                    player1_nick=player1.nick if player1 else None,
+                    player1_nick=nicks.get(match.player1_id),
                     player2_id=match.player2_id,
-                    player2_nick=player2.nick if player2 else None,
+                    player2_nick=nicks.get(match.player2_id),
                     winner_id=match.winner_id,
-                    winner_nick=winner.nick if winner else None,
+                    winner_nick=nicks.get(match.winner_id),
                     status=match.status.value,
                 )
             )
 
         return history
+
+    def export_matches(
+        self,
+        db: Session,
+        fmt: ExportFormat,
+        tournament_id: Optional[int] = None,
+        status: Optional[MatchStatus] = None,
+        min_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Exporta el historial de combates de todos los torneos por lotes.
+
+        Lee con un cursor de servidor (stream_results + yield_per), de modo
+        que en memoria solo hay un lote de EXPORT_BATCH_SIZE filas a la vez,
+        sea cual sea el tamaño de la tabla.
+
+        :param db: Sesión de la base de datos.
+        :param fmt: Formato de salida (NDJSON o CSV).
+        :param tournament_id: Filtro opcional por torneo.
+        :param status: Filtro opcional por estado del combate.
+        :param min_id: Filtro opcional: id de combate mínimo (incluido).
+        :param max_id: Filtro opcional: id de combate máximo (incluido).
+        :return: Iterador de fragmentos de texto listos para enviar.
+        """
+        if fmt == ExportFormat.CSV:
+            yield self._format_export_header()
+
+        result = db.execute(
+            self._export_statement(tournament_id, status, min_id, max_id)
+        )
+        for rows in result.partitions():
+            yield self._format_export_rows(rows, fmt)
+
+    async def export_matches_async(
+        self,
+        db: AsyncSession,
+        fmt: ExportFormat,
+        tournament_id: Optional[int] = None,
+        status: Optional[MatchStatus] = None,
+        min_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Versión asíncrona de export_matches sobre una AsyncSession.
+
+        Mismos parámetros y formato de salida que export_matches.
+        """
+        if fmt == ExportFormat.CSV:
+            yield self._format_export_header()
+
+        result = await db.stream(
+            self._export_statement(tournament_id, status, min_id, max_id)
+        )
+        async for rows in result.partitions():
+            yield self._format_export_rows(rows, fmt)
+
+    def _export_statement(
+        self,
+        tournament_id: Optional[int],
+        status: Optional[MatchStatus],
+        min_id: Optional[int],
+        max_id: Optional[int],
+    ) -> Select:
+        """Construye la consulta de exportación con los nicks ya resueltos."""
+        player1 = aliased(Player)
+        player2 = aliased(Player)
+        winner = aliased(Player)
+
+        stmt = (
+            select(
+                Match.id.label("match_id"),
+                Match.tournament_id,
+                Match.round,
+                Match.position,
+                Match.player1_id,
+                player1.nick.label("player1_nick"),
+                Match.player2_id,
+                player2.nick.label("player2_nick"),
+                Match.winner_id,
+                winner.nick.label("winner_nick"),
+                Match.status,
+            )
+            .outerjoin(player1, player1.id == Match.player1_id)
+            .outerjoin(player2, player2.id == Match.player2_id)
+            .outerjoin(winner, winner.id == Match.winner_id)
+            .order_by(Match.id)
+        )
+
+        if tournament_id is not None:
+            stmt = stmt.where(Match.tournament_id == tournament_id)
+        if status is not None:
+            stmt = stmt.where(Match.status == status)
+        if min_id is not None:
+            stmt = stmt.where(Match.id >= min_id)
+        if max_id is not None:
+            stmt = stmt.where(Match.id <= max_id)
+
+        return stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+
+    def _format_export_header(self) -> str:
+        """Cabecera CSV de la exportación."""
+        return ",".join(EXPORT_COLUMNS) + "\r\n"
+
+    def _format_export_rows(self, rows: Sequence, fmt: ExportFormat) -> str:
+        """Serializa un lote de filas en NDJSON o CSV."""
+        values = [[*row[:-1], row.status.value] for row in rows]
+
+        if fmt == ExportFormat.CSV:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(values)
+            return buffer.getvalue()
+
+        return "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, value)), ensure_ascii=False) + "\n"
+            for value in values
+        )
@@ -1,15 +1,32 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, case, func, insert, or_, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from ..core import data_versions
+from ..core.config import (
+    BRACKET_BULK_CHUNK_SIZE,
+    BRACKET_BULK_THRESHOLD,
+    PARTICIPANT_LOOKUP_CHUNK_SIZE,
+)
+from ..core.fast_json import schema_columns
+from ..core.live_brackets import notify_bracket_changed
+from ..core.metrics import brackets_generated, rounds_generated
+from ..core.player_cache import CachedPlayer, player_cache
+from ..core.report_cache import on_matches_changed
 from ..models.tournament import Tournament, TournamentStatus
 from ..models.tournament_player import TournamentPlayer
 from ..models.player import Player
 from ..models.match import Match, MatchStatus
+from ..models.player_stats import PlayerStats
+from .bracket_engine import BracketEngine
+from .player_stats_service import PlayerStatsService
+from ..schemas.match_schemas import MatchResponse
 from ..schemas.tournament_schemas import (
     TournamentCreate,
+    ParticipantBulkCreate,
     ParticipantCreate,
     TournamentUpdate,
 )
-import math
 import random
 
 
@@ -22,14 +39,24 @@ class TournamentsService:
     (bracket), hasta la progresión de rondas y finalización del torneo.
     """
 
-    def get_all(self, db: Session) -> List[Tournament]:
+    def __init__(self):
+        self.stats_service = PlayerStatsService()
+
+    def get_all(
+        self, db: Session, limit: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Tournament]:
         """
-        Obtiene la lista de todos los torneos registrados.
+        Obtiene los torneos registrados, ordenados por id.
 
         :param db: Sesión de la base de datos.
+        :param limit: Número máximo de torneos (None para todos).
+        :param after_id: Cursor keyset: devuelve solo torneos con id mayor.
         :return: Lista de objetos Tournament.
         """
-        return db.query(Tournament).all()
+        query = db.query(Tournament)
+        if after_id is not None:
+            query = query.filter(Tournament.id > after_id)
+        return query.order_by(Tournament.id).limit(limit).all()
 
     def get_by_id(self, db: Session, tournament_id: int) -> Optional[Tournament]:
         """
@@ -51,7 +78,11 @@ class TournamentsService:
         :param tournament: Datos del torneo a crear.
         :return: El torneo creado y persistido.
         """
-        db_tournament = Tournament(name=tournament.name, status=TournamentStatus.DRAFT)
+        db_tournament = Tournament(
+            name=tournament.name,
+            status=TournamentStatus.DRAFT,
+            auto_advance=tournament.auto_advance,
+        )
         db.add(db_tournament)
         db.commit()
         db.refresh(db_tournament)
@@ -123,20 +154,105 @@ class TournamentsService:
 
         return player
 
-    def get_participants(self, db: Session, tournament_id: int) -> List[Player]:
+    def add_participants(
+        self, db: Session, tournament_id: int, participants: ParticipantBulkCreate
+    ) -> dict:
+        """
+        Inscribe a varios jugadores en un torneo en borrador (DRAFT).
+
+        Las validaciones de add_participant se hacen por conjuntos: una consulta
+        IN para la existencia y el estado activo de los jugadores y otra para
+        los ya inscritos. Las inscripciones válidas se insertan con una sola
+        sentencia; los ids rechazados se devuelven con el motivo, sin impedir
+        la inscripción del resto.
+
+        :param db: Sesión de la base de datos.
+        :param tournament_id: Identificador del torneo.
+        :param participants: Lista de ids de jugador a inscribir.
+        :return: Diccionario con los ids inscritos y los rechazados.
+        """
+        # Bloqueo del torneo: serializa con la generación del cuadro
+        tournament = (
+            db.query(Tournament)
+            .filter(Tournament.id == tournament_id)
+            .with_for_update()
+            .first()
+        )
+        if not tournament:
+            raise Exception("Tournament not found")
+        if tournament.status != TournamentStatus.DRAFT:
+            raise Exception("Participants can only be added to DRAFT tournaments")
+
+        requested = list(dict.fromkeys(participants.player_ids))
+        active = {}
+        registered = set()
+        for start in range(0, len(requested), PARTICIPANT_LOOKUP_CHUNK_SIZE):
+            chunk = requested[start : start + PARTICIPANT_LOOKUP_CHUNK_SIZE]
+            active.update(
+                db.execute(select(Player.id, Player.active).where(Player.id.in_(chunk)))
+                .tuples()
+                .all()
+            )
+            registered.update(
+                db.execute(
+                    select(TournamentPlayer.player_id).where(
+                        TournamentPlayer.tournament_id == tournament_id,
+                        TournamentPlayer.player_id.in_(chunk),
+                    )
+                ).scalars()
+            )
+
+        accepted = []
+        rejected = []
+        seen = set()
+        for player_id in participants.player_ids:
+            if player_id in seen:
+                reason = "Player repeated in request"
+            elif player_id not in active:
+                reason = "Player not found"
+            elif not active[player_id]:
+                reason = "Only active players can participate in tournaments"
+            elif player_id in registered:
+                reason = "Player already registered in this tournament"
+            else:
+                reason = None
+                accepted.append(player_id)
+            seen.add(player_id)
+            if reason:
+                rejected.append({"player_id": player_id, "reason": reason})
+
+        if accepted:
+            db.execute(
+                insert(TournamentPlayer),
+                [
+                    {"tournament_id": tournament_id, "player_id": player_id}
+                    for player_id in accepted
+                ],
+            )
+        db.commit()
+
+        return {"registered": accepted, "rejected": rejected}
+
+    def get_participants(self, db: Session, tournament_id: int) -> List[CachedPlayer]:
         """
         Obtiene la lista de los jugadores inscritos en un torneo particular.
 
+        La identidad de cada jugador se resuelve a través de la caché de
+        jugadores, de modo que solo se consulta la tabla de inscripciones.
+
         :param db: Sesión de la base de datos.
         :param tournament_id: Identificador del torneo.
-        :return: Lista de objetos Player que participan.
+        :return: Lista de jugadores que participan, en orden de inscripción.
         """
-        return (
-            db.query(Player)
-            .join(TournamentPlayer)
+        player_ids = [
+            row.player_id
+            for row in db.query(TournamentPlayer.player_id)
             .filter(TournamentPlayer.tournament_id == tournament_id)
+            .order_by(TournamentPlayer.id)
             .all()
-        )
+        ]
+        players = player_cache.get_many(db, player_ids)
+        return [players[player_id] for player_id in player_ids if player_id in players]
 
     def generate_bracket(self, db: Session, tournament_id: int) -> List[Match]:
         """
@@ -149,9 +265,12 @@ class TournamentsService:
         4. Gestionar automáticamente los BYEs (jugadores sin oponente pasan a ronda 2).
         5. Cambiar el estado del torneo a GENERATED.
 
+        Si el torneo tiene auto_advance, se pre-generan además todas las rondas
+        hasta la final y los ganadores avanzan solos al resolver cada combate.
+
         :param db: Sesión de la base de datos.
         :param tournament_id: ID del torneo a generar.
-        :return: Lista de combates de la primera ronda.
+        :return: Lista de combates de la primera ronda (o de todo el cuadro).
         """
         tournament = self.get_by_id(db, tournament_id)
         if not tournament:
@@ -170,45 +289,34 @@ class TournamentsService:
 
         random.shuffle(participants)
 
-        # Determinar tamaño de bracket (potencia de 2)
-        n = len(participants)
-        bracket_size = 2 ** math.ceil(math.log2(n))
-
-        # Crear matches de ronda 1
+        # Cuadro en memoria (ver BracketEngine): huecos hasta la potencia de 2,
+        # BYE resueltos y, con avance automático, todas las rondas hasta la final.
+        # El combate (r, p) se alimenta de los combates (r-1, 2p-1) y (r-1, 2p).
+        engine = BracketEngine.seed(
+            [player.id for player in participants], full=tournament.auto_advance
+        )
         matches = []
-        num_matches = bracket_size // 2
-
-        for i in range(num_matches):
-            p1 = participants[i * 2] if i * 2 < n else None
-            p2 = participants[i * 2 + 1] if i * 2 + 1 < n else None
+        for round in range(1, engine.current_round + 1):
+            round_matches = engine.round_matches(tournament_id, round)
+            self._insert_matches(db, round_matches)
+            matches.extend(round_matches)
+        current_round = engine.current_round
 
-            # Si p2 no existe, es un BYE para p1
-            # Si p1 no existe (no debería pasar por lógica de potencia), es vacío
-
-            status = MatchStatus.PENDING
-            winner_id = None
-
-            if p1 is None and p2 is None:
-                status = MatchStatus.RESOLVED
-
-            if p1 and not p2:  # BYE
-                status = MatchStatus.RESOLVED
-                winner_id = p1.id
-
-            db_match = Match(
-                tournament_id=tournament_id,
-                round=1,
-                position=i + 1,
-                player1_id=p1.id if p1 else None,
-                player2_id=p2.id if p2 else None,
-                winner_id=winner_id,
-                status=status,
-            )
-            db.add(db_match)
-            matches.append(db_match)
+        # Los BYE resueltos automáticamente también cuentan en el ranking
+        self.stats_service.record_resolved_matches(db, matches)
 
         tournament.status = TournamentStatus.GENERATED
+        tournament.current_round = current_round
+        tournament.pending_matches = self._count_pending(matches)
+        data_versions.bump(
+            db,
+            data_versions.GLOBAL_SCOPE,
+            data_versions.tournament_scope(tournament_id),
+        )
         db.commit()
+        on_matches_changed([tournament_id])
+        notify_bracket_changed([tournament_id])
+        brackets_generated.inc()
         return matches
 
     def generate_next_round(self, db: Session, tournament_id: int) -> List[Match]:
@@ -216,27 +324,16 @@ class TournamentsService:
         if not tournament:
             raise Exception("Tournament not found")
 
-        last_match = (
-            db.query(Match)
-            .filter(Match.tournament_id == tournament_id)
-            .order_by(Match.round.desc())
-            .first()
-        )
-        if not last_match:
+        if tournament.current_round == 0:
             raise Exception("No bracket found for this tournament")
 
-        current_round = last_match.round
+        if tournament.auto_advance:
+            raise Exception("This tournament advances automatically")
 
-        # 1. Validación estricta de pendientes
-        pending = (
-            db.query(Match)
-            .filter(
-                Match.tournament_id == tournament_id,
-                Match.round == current_round,
-                Match.status == MatchStatus.PENDING,
-            )
-            .count()
-        )
+        current_round = tournament.current_round
+
+        # 1. Validación estricta de pendientes (contador mantenido en el torneo)
+        pending = tournament.pending_matches
         if pending > 0:
             raise Exception(f"Cannot progress: there are {pending} pending matches")
 
@@ -252,25 +349,316 @@ class TournamentsService:
         if len(results) == 1:
             tournament.status = TournamentStatus.FINISHED
             tournament.winner_id = results[0].winner_id
+            data_versions.bump(db, data_versions.tournament_scope(tournament_id))
             db.commit()
+            notify_bracket_changed([tournament_id])
             return []
 
         new_matches = []
         next_round = current_round + 1
-        
+
         # 3. La clave: La siguiente ronda siempre tiene la mitad de combates
         num_new_matches = len(results) // 2
 
         for i in range(num_new_matches):
             # Emparejamos los ganadores de los combates (i*2) e (i*2 + 1)
-            # Nota: winner_id puede ser None si era un combate vacío
-            w1_id = results[i * 2].winner_id
-            w2_id = results[i * 2 + 1].winner_id
+            new_matches.append(
+                self._pair_winners(
+                    tournament_id,
+                    next_round,
+                    i + 1,
+                    results[i * 2],
+                    results[i * 2 + 1],
+                )
+            )
+
+        self._insert_matches(db, new_matches)
+
+        self.stats_service.record_resolved_matches(db, new_matches)
+
+        tournament.current_round = next_round
+        tournament.pending_matches = self._count_pending(new_matches)
+        data_versions.bump(
+            db,
+            data_versions.GLOBAL_SCOPE,
+            data_versions.tournament_scope(tournament_id),
+        )
+
+        db.commit()
+        on_matches_changed([tournament_id])
+        notify_bracket_changed([tournament_id])
+        rounds_generated.inc()
+        return new_matches
 
-            status = MatchStatus.PENDING
-            winner_id = None
+    def get_bracket(
+        self,
+        db: Session,
+        tournament_id: int,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> List[Match]:
+        """
+        Recupera todos los combates asociados a un torneo, ordenados para su visualización.
 
-            # 4. Lógica de propagación de BYEs / Combates vacíos
+        :param db: Sesión de la base de datos.
+        :param tournament_id: ID del torneo.
+        :param limit: Número máximo de combates (None para todos).
+        :param after: Cursor keyset (ronda, posición) del último combate leído.
+        :return: Lista de objetos Match.
+        """
+        stmt = self._bracket_statement(select(Match), tournament_id, limit, after)
+        return db.execute(stmt).scalars().all()
+
+    def get_bracket_rows(
+        self,
+        db: Session,
+        tournament_id: int,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> List[dict]:
+        """
+        Igual que get_bracket, pero devuelve diccionarios con los campos de
+        MatchResponse leídos como tuplas, sin construir objetos del ORM
+        (ruta rápida de serialización).
+
+        :param db: Sesión de la base de datos.
+        :param tournament_id: ID del torneo.
+        :param limit: Número máximo de combates (None para todos).
+        :param after: Cursor keyset (ronda, posición) del último combate leído.
+        :return: Lista de diccionarios, uno por combate.
+        """
+        stmt = self._bracket_statement(
+            select(*schema_columns(Match, MatchResponse)), tournament_id, limit, after
+        )
+        result = db.execute(stmt)
+        keys = list(result.keys())
+        return [dict(zip(keys, row)) for row in result]
+
+    def get_player_path(self, db: Session, tournament_id: int, player_id: int) -> dict:
+        """
+        Calcula el camino de un jugador en el cuadro: combate en juego, rival
+        siguiente y resultado de cada ronda hasta la final.
+
+        El cuadro se lee con una sola consulta y las preguntas se responden
+        sobre el BracketEngine en memoria.
+
+        :param db: Sesión de la base de datos.
+        :param tournament_id: ID del torneo.
+        :param player_id: ID del jugador.
+        :return: Camino del jugador (ver BracketEngine.path).
+        """
+        tournament = self.get_by_id(db, tournament_id)
+        if not tournament:
+            raise Exception("Tournament not found")
+
+        if tournament.current_round == 0:
+            raise Exception("No bracket found for this tournament")
+
+        engine = BracketEngine.from_matches(self.get_bracket_rows(db, tournament_id))
+        return engine.path(player_id)
+
+    def get_odds_state(
+        self, db: Session, tournament_id: int
+    ) -> Tuple[BracketEngine, Dict[int, Tuple[int, int]]]:
+        """
+        Lee lo necesario para simular el resto del torneo (ver bracket_odds):
+        el cuadro actual y el historial de victorias y derrotas de sus
+        jugadores, de la tabla player_stats.
+
+        :param db: Sesión de la base de datos.
+        :param tournament_id: ID del torneo.
+        :return: Cuadro y {player_id: (victorias, derrotas)}.
+        """
+        tournament = self.get_by_id(db, tournament_id)
+        if not tournament:
+            raise Exception("Tournament not found")
+
+        if tournament.current_round == 0:
+            raise Exception("No bracket found for this tournament")
+
+        engine = BracketEngine.from_matches(self.get_bracket_rows(db, tournament_id))
+        rows = db.execute(
+            select(PlayerStats.player_id, PlayerStats.wins, PlayerStats.losses)
+            .join(TournamentPlayer, TournamentPlayer.player_id == PlayerStats.player_id)
+            .where(TournamentPlayer.tournament_id == tournament_id)
+        ).all()
+        return engine, {row.player_id: (row.wins, row.losses) for row in rows}
+
+    def get_live_bracket(self, db: Session, tournament_id: int) -> Optional[dict]:
+        """
+        Lee el estado completo del cuadro para su difusión en vivo: versión de
+        datos, campos de progreso del torneo y combates (ruta rápida).
+
+        La versión se lee antes que los combates: si hay un cambio entre
+        ambas lecturas, la siguiente comprobación verá una versión distinta.
+
+        :param db: Sesión de la base de datos.
+        :param tournament_id: ID del torneo.
+        :return: Diccionario con version, tournament y matches, o None si el
+            torneo no existe.
+        """
+        (version,) = data_versions.get_versions(
+            db, data_versions.tournament_scope(tournament_id)
+        )
+        tournament = db.execute(
+            select(
+                Tournament.id,
+                Tournament.status,
+                Tournament.current_round,
+                Tournament.pending_matches,
+                Tournament.winner_id,
+            ).where(Tournament.id == tournament_id)
+        ).first()
+        if tournament is None:
+            return None
+
+        return {
+            "version": version,
+            "tournament": dict(tournament._mapping),
+            "matches": self.get_bracket_rows(db, tournament_id),
+        }
+
+    def _bracket_statement(
+        self,
+        stmt: Select,
+        tournament_id: int,
+        limit: Optional[int],
+        after: Optional[Tuple[int, int]],
+    ) -> Select:
+        """Aplica a stmt el filtro, el cursor keyset y el orden del cuadro."""
+        stmt = stmt.where(Match.tournament_id == tournament_id)
+        if after is not None:
+            after_round, after_position = after
+            stmt = stmt.where(
+                or_(
+                    Match.round > after_round,
+                    and_(Match.round == after_round, Match.position > after_position),
+                )
+            )
+        return stmt.order_by(Match.round, Match.position).limit(limit)
+
+    def check_progress(self, db: Session, fix: bool = False) -> List[dict]:
+        """
+        Comprueba que current_round y pending_matches coinciden con la tabla match.
+
+        Los valores esperados se calculan para todos los torneos con una única
+        consulta agregada: la ronda más alta generada y sus combates pendientes
+        (los de todo el cuadro en los torneos con auto_advance).
+
+        :param db: Sesión de la base de datos.
+        :param fix: Si es True, corrige los torneos inconsistentes y hace commit.
+        :return: Lista de inconsistencias encontradas (valores actuales y esperados).
+        """
+        last_round = (
+            select(Match.tournament_id, func.max(Match.round).label("round"))
+            .group_by(Match.tournament_id)
+            .subquery()
+        )
+        pending = (
+            select(
+                Match.tournament_id,
+                Match.round,
+                func.count().label("pending"),
+            )
+            .where(Match.status == MatchStatus.PENDING)
+            .group_by(Match.tournament_id, Match.round)
+            .subquery()
+        )
+        # Con auto_advance el cuadro completo está generado y el contador
+        # abarca los pendientes de todas las rondas
+        total_pending = (
+            select(Match.tournament_id, func.count().label("pending"))
+            .where(Match.status == MatchStatus.PENDING)
+            .group_by(Match.tournament_id)
+            .subquery()
+        )
+        expected_pending = case(
+            (Tournament.auto_advance, func.coalesce(total_pending.c.pending, 0)),
+            else_=func.coalesce(pending.c.pending, 0),
+        )
+        rows = db.execute(
+            select(
+                Tournament.id,
+                Tournament.current_round,
+                Tournament.pending_matches,
+                func.coalesce(last_round.c.round, 0).label("expected_round"),
+                expected_pending.label("expected_pending"),
+            )
+            .outerjoin(last_round, last_round.c.tournament_id == Tournament.id)
+            .outerjoin(
+                pending,
+                and_(
+                    pending.c.tournament_id == Tournament.id,
+                    pending.c.round == last_round.c.round,
+                ),
+            )
+            .outerjoin(total_pending, total_pending.c.tournament_id == Tournament.id)
+            .order_by(Tournament.id)
+        ).all()
+
+        issues = [
+            {
+                "tournament_id": row.id,
+                "current_round": row.current_round,
+                "pending_matches": row.pending_matches,
+                "expected_round": row.expected_round,
+                "expected_pending": row.expected_pending,
+            }
+            for row in rows
+            if (row.current_round, row.pending_matches)
+            != (row.expected_round, row.expected_pending)
+        ]
+
+        if fix and issues:
+            for issue in issues:
+                db.execute(
+                    update(Tournament)
+                    .where(Tournament.id == issue["tournament_id"])
+                    .values(
+                        current_round=issue["expected_round"],
+                        pending_matches=issue["expected_pending"],
+                    )
+                )
+            db.commit()
+
+        return issues
+
+    def _pair_winners(
+        self,
+        tournament_id: int,
+        round: int,
+        position: int,
+        previous1: Match,
+        previous2: Match,
+    ) -> Match:
+        """
+        Construye el combate que enfrenta a los ganadores de dos combates previos.
+
+        Si algún combate previo sigue pendiente (solo ocurre al pre-generar el
+        cuadro completo), su hueco queda vacío y el combate queda PENDING hasta
+        que MatchesService propague el ganador.
+
+        :param tournament_id: ID del torneo.
+        :param round: Ronda del nuevo combate.
+        :param position: Posición del nuevo combate dentro de la ronda.
+        :param previous1: Combate previo que alimenta el hueco player1.
+        :param previous2: Combate previo que alimenta el hueco player2.
+        :return: Nuevo combate (aún no persistido).
+        """
+        # Nota: winner_id puede ser None si era un combate vacío o está pendiente
+        w1_id = previous1.winner_id
+        w2_id = previous2.winner_id
+
+        status = MatchStatus.PENDING
+        winner_id = None
+
+        both_resolved = (
+            previous1.status == MatchStatus.RESOLVED
+            and previous2.status == MatchStatus.RESOLVED
+        )
+
+        # 4. Lógica de propagación de BYEs / Combates vacíos
+        if both_resolved:
             # Si no hay nadie en ninguno de los dos combates previos
             if not w1_id and not w2_id:
                 status = MatchStatus.RESOLVED
@@ -283,32 +671,83 @@ class TournamentsService:
                 status = MatchStatus.RESOLVED
                 winner_id = w2_id
 
-            db_match = Match(
-                tournament_id=tournament_id,
-                round=next_round,
-                position=i + 1,
-                player1_id=w1_id,
-                player2_id=w2_id,
-                winner_id=winner_id,
-                status=status,
-            )
-            db.add(db_match)
-            new_matches.append(db_match)
+        return Match(
+            tournament_id=tournament_id,
+            round=round,
+            position=position,
+            player1_id=w1_id,
+            player2_id=w2_id,
+            winner_id=winner_id,
+            status=status,
+        )
 
-        db.commit()
-        return new_matches
+    def _count_pending(self, matches: List[Match]) -> int:
+        """Cuenta los combates que quedan pendientes en una ronda recién creada."""
+        return sum(1 for match in matches if match.status == MatchStatus.PENDING)
 
-    def get_bracket(self, db: Session, tournament_id: int) -> List[Match]:
+    def _insert_matches(self, db: Session, matches: List[Match]) -> None:
         """
-        Recupera todos los combates asociados a un torneo, ordenados para su visualización.
+        Persiste los combates de una ronda recién construidos (sin commit).
+
+        Por debajo de BRACKET_BULK_THRESHOLD se usa la unidad de trabajo del ORM.
+        Por encima, los combates se insertan en lotes de BRACKET_BULK_CHUNK_SIZE
+        con un INSERT multi-fila (executemany) y los ids se recuperan con
+        RETURNING, o con una única consulta si el motor no lo soporta.
+
+        En ambos casos los objetos quedan desvinculados de la sesión con sus
+        atributos cargados, de forma que devolverlos tras el commit no provoca
+        una relectura por fila.
 
         :param db: Sesión de la base de datos.
-        :param tournament_id: ID del torneo.
-        :return: Lista de objetos Match.
+        :param matches: Combates nuevos de una misma ronda, ordenados por posición.
         """
-        return (
-            db.query(Match)
-            .filter(Match.tournament_id == tournament_id)
-            .order_by(Match.round, Match.position)
-            .all()
+        if len(matches) < BRACKET_BULK_THRESHOLD:
+            db.add_all(matches)
+            db.flush()
+            for match in matches:
+                db.expunge(match)
+            return
+
+        table = Match.__table__
+        columns = (
+            "tournament_id",
+            "round",
+            "position",
+            "player1_id",
+            "player2_id",
+            "winner_id",
+            "status",
         )
+        dialect = db.get_bind().dialect
+        use_returning = dialect.insert_executemany_returning_sort_by_parameter_order
+
+        for start in range(0, len(matches), BRACKET_BULK_CHUNK_SIZE):
+            chunk = matches[start : start + BRACKET_BULK_CHUNK_SIZE]
+            rows = [
+                {column: getattr(match, column) for column in columns}
+                for match in chunk
+            ]
+
+            if use_returning:
+                ids = db.execute(
+                    insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                    rows,
+                ).scalars()
+                for match, match_id in zip(chunk, ids):
+                    match.id = match_id
+            else:
+                db.execute(insert(table), rows)
+
+        if not use_returning:
+            # Una sola lectura de los ids de la ronda, en orden de posición
+            first = matches[0]
+            ids = db.execute(
+                select(table.c.id)
+                .where(
+                    table.c.tournament_id == first.tournament_id,
+                    table.c.round == first.round,
+                )
+                .order_by(table.c.position)
+            ).scalars()
+            for match, match_id in zip(matches, ids):
+                match.id = match_id
@@ -0,0 +1,86 @@
+"""
+Prueba de carga comparativa entre la pila síncrona y la asíncrona.
+
+Arranca la API con uvicorn en cada modo (TK3_DB_ASYNC=0/1), lanza N clientes
+concurrentes con conexiones keep-alive contra un endpoint durante un tiempo
+fijo y muestra peticiones por segundo y latencias p50/p99.
+
+La base de datos es la configurada en el entorno (también se hereda
+TK3_ASYNC_DATABASE_URL), por lo que la comparación refleja la latencia real
+de red hacia MariaDB.
+
+Uso (desde el directorio tk3_api):
+    python -m bench.async_load
+    python -m bench.async_load --path /tournaments/1/bracket --duration 20
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+from .harness import HOST, http_request, start_server
+
+
+async def _client(port: int, path: str, deadline: float, latencies: List[float]):
+    """Cliente que repite peticiones por la misma conexión hasta el final."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, "GET", path)
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def _load(port: int, path: str, clients: int, duration: float) -> dict:
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(_client(port, path, deadline, latencies) for _ in range(clients)),
+        return_exceptions=True,
+    )
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "clients": clients,
+        "requests": count,
+        "rps": count / duration,
+        "p50_ms": latencies[count // 2] * 1000 if count else None,
+        "p99_ms": latencies[int(count * 0.99)] * 1000 if count else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--path", default="/reports/leaderboard")
+    parser.add_argument(
+        "--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"]
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'mode':>5} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in args.modes:
+        env = {"TK3_DB_ASYNC": "1" if mode == "async" else "0"}
+        server = start_server(env, args.port, args.workers)
+        try:
+            for clients in args.concurrency:
+                result = asyncio.run(
+                    _load(args.port, args.path, clients, args.duration)
+                )
+                print(
+                    f"{mode:>5} {clients:>7} {result['rps']:>9,.0f} "
+                    f"{result['p50_ms'] or 0:>8.1f} {result['p99_ms'] or 0:>8.1f}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
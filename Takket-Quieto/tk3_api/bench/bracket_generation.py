@@ -0,0 +1,151 @@
+"""
+Benchmark de generación de cuadros para torneos grandes.
+
+Mide las filas de combate insertadas por segundo en generate_bracket y
+generate_next_round sobre una base de datos SQLite local, para distintos
+números de inscritos y para cada estrategia de inserción (ORM o masiva).
+
+Uso (desde el directorio tk3_api):
+    python -m bench.bracket_generation
+    python -m bench.bracket_generation --sizes 1000 16000 --modes orm bulk
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import sessionmaker
+from app.core.db import Base
+from app.core.player_cache import player_cache
+from app.models.match import Match, MatchStatus
+from app.models.player import Player
+from app.models.player_stats import PlayerStats  # noqa: F401 (registro de tabla)
+from app.models.tournament import Tournament, TournamentStatus
+from app.models.tournament_player import TournamentPlayer
+from app.services import tournaments_service
+from app.services.tournaments_service import TournamentsService
+
+# Umbral efectivo para forzar cada estrategia de inserción
+MODES = {
+    "auto": tournaments_service.BRACKET_BULK_THRESHOLD,
+    "orm": float("inf"),
+    "bulk": 0,
+}
+
+
+def _seed(session_factory, entrants: int) -> int:
+    """Crea los jugadores, un torneo en DRAFT y sus inscripciones."""
+    db = session_factory()
+    try:
+        db.execute(
+            insert(Player),
+            [
+                {"id": i, "nick": f"player{i}", "active": True}
+                for i in range(1, entrants + 1)
+            ],
+        )
+        tournament = Tournament(name=f"open-{entrants}", status=TournamentStatus.DRAFT)
+        db.add(tournament)
+        db.flush()
+        db.execute(
+            insert(TournamentPlayer),
+            [
+                {"tournament_id": tournament.id, "player_id": i}
+                for i in range(1, entrants + 1)
+            ],
+        )
+        db.commit()
+        return tournament.id
+    finally:
+        db.close()
+
+
+def _resolve_round(session_factory, tournament_id: int) -> None:
+    """Resuelve todos los combates pendientes (fuera de la medición)."""
+    db = session_factory()
+    try:
+        db.execute(
+            update(Match)
+            .where(
+                Match.tournament_id == tournament_id,
+                Match.status == MatchStatus.PENDING,
+            )
+            .values(winner_id=Match.player1_id, status=MatchStatus.RESOLVED)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _timed(session_factory, fn, tournament_id: int):
+    """Ejecuta una operación del servicio y devuelve (filas creadas, segundos)."""
+    db = session_factory()
+    try:
+        start = time.perf_counter()
+        created = fn(db, tournament_id)
+        return len(created), time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def run(entrants: int, mode: str) -> dict:
+    """
+    Ejecuta el escenario completo para un tamaño y una estrategia.
+
+    :param entrants: Número de inscritos del torneo.
+    :param mode: Estrategia de inserción (auto, orm o bulk).
+    :return: Resultados con filas y filas/segundo de cada operación.
+    """
+    tournaments_service.BRACKET_BULK_THRESHOLD = MODES[mode]
+    player_cache.clear()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        service = TournamentsService()
+
+        tournament_id = _seed(session_factory, entrants)
+        rows, seconds = _timed(session_factory, service.generate_bracket, tournament_id)
+        _resolve_round(session_factory, tournament_id)
+        next_rows, next_seconds = _timed(
+            session_factory, service.generate_next_round, tournament_id
+        )
+        engine.dispose()
+
+    return {
+        "entrants": entrants,
+        "mode": mode,
+        "generate_rows": rows,
+        "generate_rows_per_sec": rows / seconds,
+        "next_round_rows": next_rows,
+        "next_round_rows_per_sec": next_rows / next_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 16000, 64000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["orm", "bulk"])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(
+        f"{'entrants':>9} {'mode':>5} "
+        f"{'generate rows/s':>16} {'next-round rows/s':>18}"
+    )
+    for entrants in args.sizes:
+        for mode in args.modes:
+            result = run(entrants, mode)
+            print(
+                f"{entrants:>9} {mode:>5} "
+                f"{result['generate_rows_per_sec']:>16,.0f} "
+                f"{result['next_round_rows_per_sec']:>18,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
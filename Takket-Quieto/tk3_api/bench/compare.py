@@ -0,0 +1,81 @@
+"""
+Comparación de dos ficheros de resultados de bench.suite.
+
+Empareja las mediciones por escenario, modo y concurrencia y muestra la
+variación de operaciones por segundo y de p95. Marca como regresión toda
+caída de ops/s o subida de p95 por encima del umbral indicado.
+
+Uso (desde el directorio tk3_api):
+    python -m bench.compare base.json head.json
+    python -m bench.compare base.json head.json --threshold 15 --fail
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Optional, Tuple
+
+
+def _load(path: str) -> Tuple[dict, Dict[tuple, dict]]:
+    with open(path) as handle:
+        report = json.load(handle)
+    results = {
+        (r["scenario"], r["mode"], r["concurrency"]): r for r in report["results"]
+    }
+    return report["meta"], results
+
+
+def _change(base: Optional[float], head: Optional[float]) -> Optional[float]:
+    """Variación porcentual de head respecto a base (None si no es calculable)."""
+    if not base or head is None:
+        return None
+    return (head - base) / base * 100
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Umbral de regresión en %%"
+    )
+    parser.add_argument(
+        "--fail", action="store_true", help="Salir con código 1 si hay regresiones"
+    )
+    args = parser.parse_args()
+
+    base_meta, base = _load(args.base)
+    head_meta, head = _load(args.head)
+    print(f"base: {base_meta.get('commit')} ({base_meta.get('timestamp')})")
+    print(f"head: {head_meta.get('commit')} ({head_meta.get('timestamp')})")
+    print(
+        f"{'scenario':>20} {'mode':>6} {'conc':>4} {'ops/s':>9} {'Δ%':>7} "
+        f"{'p95 ms':>8} {'Δ%':>7}"
+    )
+
+    regressions = 0
+    for key in sorted(base.keys() & head.keys()):
+        ops = _change(base[key]["ops_per_sec"], head[key]["ops_per_sec"])
+        p95 = _change(base[key]["p95_ms"], head[key]["p95_ms"])
+        regressed = (ops is not None and ops < -args.threshold) or (
+            p95 is not None and p95 > args.threshold
+        )
+        regressions += regressed
+        scenario, mode, concurrency = key
+        print(
+            f"{scenario:>20} {mode:>6} {concurrency:>4} "
+            f"{head[key]['ops_per_sec'] or 0:>9,.1f} {ops or 0:>+7.1f} "
+            f"{head[key]['p95_ms'] or 0:>8.1f} {p95 or 0:>+7.1f}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+
+    for key in sorted(base.keys() ^ head.keys()):
+        print(f"only in {'base' if key in base else 'head'}: {key}")
+
+    print(f"{regressions} regression(s) above {args.threshold:g}%")
+    if args.fail and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
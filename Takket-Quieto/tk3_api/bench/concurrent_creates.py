@@ -0,0 +1,124 @@
+"""
+Prueba de carga de altas concurrentes de jugadores.
+
+Lanza varios procesos (como workers de uvicorn), cada uno con varios hilos,
+que crean jugadores a la vez con create_player sobre la misma base de datos
+SQLite. Al terminar comprueba que no ha habido errores, que se han creado
+todos los jugadores y que ningún id se ha repetido. Los tests
+(tests/test_id_allocator.py) ejecutan la misma comprobación con una carga
+pequeña; este script sirve para probar cargas mayores.
+
+Uso (desde el directorio tk3_api):
+    python -m bench.concurrent_creates
+    python -m bench.concurrent_creates --workers 4 --threads 8 --per-thread 50
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from app.core.migrations import upgrade
+from app.models.player import Player
+from app.schemas.player_schemas import PlayerCreate
+from app.services.players_service import PlayersService
+
+
+def _engine(path: str):
+    # Espera generosa al bloqueo de escritura: los procesos compiten por él
+    return create_engine(f"sqlite:///{path}", connect_args={"timeout": 60})
+
+
+def _worker(path: str, worker: int, threads: int, per_thread: int) -> list:
+    """Proceso worker: crea jugadores desde varios hilos y devuelve los errores."""
+    engine = _engine(path)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    service = PlayersService()
+
+    def create(thread: int) -> list:
+        errors = []
+        for i in range(per_thread):
+            db = session_factory()
+            try:
+                nick = f"w{worker}-t{thread}-{i}"
+                service.create_player(db, PlayerCreate(nick=nick))
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+            finally:
+                db.close()
+        return errors
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(create, range(threads)))
+    engine.dispose()
+    return [error for errors in results for error in errors]
+
+
+def run(workers: int, threads: int, per_thread: int) -> dict:
+    """
+    Ejecuta la prueba completa y verifica la unicidad de los ids.
+
+    :param workers: Número de procesos.
+    :param threads: Hilos por proceso.
+    :param per_thread: Altas por hilo.
+    :return: Resultados (esperados, creados, ids distintos, errores, segundos).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = _engine(path)
+        upgrade(engine)
+
+        context = multiprocessing.get_context("spawn")
+        start = time.perf_counter()
+        with context.Pool(workers) as pool:
+            results = pool.starmap(
+                _worker,
+                [(path, worker, threads, per_thread) for worker in range(workers)],
+            )
+        seconds = time.perf_counter() - start
+
+        with engine.connect() as conn:
+            created, distinct = conn.execute(
+                select(func.count(Player.id), func.count(func.distinct(Player.id)))
+            ).one()
+        engine.dispose()
+
+    errors = [error for worker_errors in results for error in worker_errors]
+    return {
+        "expected": workers * threads * per_thread,
+        "created": created,
+        "distinct_ids": distinct,
+        "errors": errors,
+        "seconds": seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--per-thread", type=int, default=25)
+    args = parser.parse_args()
+
+    result = run(args.workers, args.threads, args.per_thread)
+    print(
+        f"expected={result['expected']} created={result['created']} "
+        f"distinct_ids={result['distinct_ids']} errors={len(result['errors'])} "
+        f"seconds={result['seconds']:.2f}"
+    )
+    for error in result["errors"][:10]:
+        print(f"  {error}")
+
+    ok = (
+        not result["errors"]
+        and result["created"] == result["expected"] == result["distinct_ids"]
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
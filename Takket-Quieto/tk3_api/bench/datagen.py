@@ -0,0 +1,248 @@
+"""
+Generador de datos sintéticos reproducibles para los benchmarks.
+
+Crea N jugadores y M torneos de tamaños variados y juega sus cuadros hasta
+el final a través de los propios servicios de la API, de modo que las
+estadísticas, contadores y versiones quedan coherentes como en producción.
+Con la misma semilla se obtiene siempre la misma base de datos.
+
+Además prepara los "fixtures" que consumen los escenarios de escritura:
+torneos en DRAFT listos para generar, rondas terminadas listas para pasar a
+la siguiente y combates pendientes listos para resolver.
+
+Uso (desde el directorio tk3_api):
+    python -m bench.datagen --db /tmp/tk3-bench.sqlite3
+    python -m bench.datagen --db /tmp/tk3-bench.sqlite3 --players 5000 --tournaments 80
+"""
+
+import argparse
+import os
+import random
+import time
+from typing import List, Tuple
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from app.core.id_allocator import player_ids
+from app.core.migrations import upgrade
+from app.core.player_cache import player_cache
+from app.models.match import Match, MatchStatus
+from app.schemas.tournament_schemas import ParticipantBulkCreate, TournamentCreate
+from app.services.matches_service import MatchesService
+from app.services.players_service import PlayersService
+from app.services.tournaments_service import TournamentsService
+
+players_service = PlayersService()
+tournaments_service = TournamentsService()
+matches_service = MatchesService()
+
+
+def sqlite_engine(path: str):
+    """Motor SQLite local del perfil de benchmark (sin red)."""
+    return create_engine(f"sqlite:///{path}", connect_args={"timeout": 60})
+
+
+def _playable(db, tournament_id: int) -> List[Match]:
+    """Combates pendientes con sus dos jugadores asignados."""
+    return (
+        db.execute(
+            select(Match).where(
+                Match.tournament_id == tournament_id,
+                Match.status == MatchStatus.PENDING,
+                Match.player1_id.is_not(None),
+                Match.player2_id.is_not(None),
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def _resolve_all(db, rng: random.Random, tournament_id: int) -> int:
+    """Resuelve con ganadores aleatorios todos los combates jugables."""
+    pairs = [
+        (match.id, rng.choice((match.player1_id, match.player2_id)))
+        for match in _playable(db, tournament_id)
+    ]
+    if pairs:
+        matches_service.set_winners(db, pairs)
+    return len(pairs)
+
+
+def _new_tournament(
+    db, rng: random.Random, name: str, size: int, player_count: int, auto: bool
+) -> int:
+    """Crea un torneo en DRAFT con size inscritos elegidos al azar."""
+    tournament = tournaments_service.create_tournament(
+        db, TournamentCreate(name=name, auto_advance=auto)
+    )
+    entrants = rng.sample(range(1, player_count + 1), size)
+    tournaments_service.add_participants(
+        db, tournament.id, ParticipantBulkCreate(player_ids=entrants)
+    )
+    return tournament.id
+
+
+def play_tournament(db, rng: random.Random, tournament_id: int) -> None:
+    """Genera el cuadro y lo juega hasta que el torneo termina."""
+    tournaments_service.generate_bracket(db, tournament_id)
+    tournament = tournaments_service.get_by_id(db, tournament_id)
+    while True:
+        resolved = _resolve_all(db, rng, tournament_id)
+        db.refresh(tournament)
+        if tournament.winner_id is not None:
+            return
+        if tournament.auto_advance:
+            if not resolved:
+                return
+            continue
+        tournaments_service.generate_next_round(db, tournament_id)
+        db.refresh(tournament)
+        if tournament.winner_id is not None:
+            return
+
+
+def generate(
+    engine,
+    players: int = 2000,
+    tournaments: int = 30,
+    min_size: int = 8,
+    max_size: int = 256,
+    seed: int = 42,
+) -> dict:
+    """
+    Puebla una base de datos vacía con jugadores y torneos ya jugados.
+
+    Uno de cada tres torneos usa avance automático. Los tamaños se reparten
+    de forma aleatoria entre min_size y max_size (no tienen por qué ser
+    potencias de dos, así que también hay BYEs).
+
+    :param engine: Motor de la base de datos destino (se migra si hace falta).
+    :param players: Número de jugadores.
+    :param tournaments: Número de torneos jugados.
+    :param min_size: Inscritos mínimos por torneo.
+    :param max_size: Inscritos máximos por torneo.
+    :param seed: Semilla del generador.
+    :return: Resumen con los ids de torneo creados y los segundos empleados.
+    """
+    # Sorteo de los cuadros (random global) y ganadores (rng) deterministas
+    random.seed(seed)
+    rng = random.Random(seed)
+    player_ids.reset()
+    player_cache.clear()
+    upgrade(engine)
+
+    start = time.perf_counter()
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        players_service.import_players(
+            db, [{"nick": f"player{i:06d}"} for i in range(1, players + 1)]
+        )
+        tournament_ids = []
+        for number in range(tournaments):
+            size = rng.randint(min_size, min(max_size, players))
+            tournament_id = _new_tournament(
+                db, rng, f"league-{number}", size, players, auto=number % 3 == 2
+            )
+            play_tournament(db, rng, tournament_id)
+            tournament_ids.append(tournament_id)
+    finally:
+        db.close()
+
+    return {
+        "players": players,
+        "tournaments": tournament_ids,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def draft_tournaments(
+    engine, count: int, size: int, players: int, seed: int
+) -> List[int]:
+    """Torneos en DRAFT con inscritos, listos para generate_bracket."""
+    rng = random.Random(seed)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        return [
+            _new_tournament(db, rng, f"draft-{seed}-{i}", size, players, auto=False)
+            for i in range(count)
+        ]
+    finally:
+        db.close()
+
+
+def finished_round_tournaments(
+    engine, count: int, size: int, players: int, seed: int
+) -> List[int]:
+    """Torneos con la ronda 1 resuelta, listos para generate_next_round."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        ids = []
+        for i in range(count):
+            tournament_id = _new_tournament(
+                db, rng, f"round-{seed}-{i}", size, players, auto=False
+            )
+            tournaments_service.generate_bracket(db, tournament_id)
+            _resolve_all(db, rng, tournament_id)
+            ids.append(tournament_id)
+        return ids
+    finally:
+        db.close()
+
+
+def pending_matches(
+    engine, count: int, size: int, players: int, seed: int
+) -> List[Tuple[int, int]]:
+    """Al menos count pares (match_id, winner_id) pendientes para set_winner."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        pairs: List[Tuple[int, int]] = []
+        number = 0
+        while len(pairs) < count:
+            tournament_id = _new_tournament(
+                db, rng, f"pending-{seed}-{number}", size, players, auto=False
+            )
+            tournaments_service.generate_bracket(db, tournament_id)
+            pairs.extend(
+                (match.id, rng.choice((match.player1_id, match.player2_id)))
+                for match in _playable(db, tournament_id)
+            )
+            number += 1
+        return pairs[:count]
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", required=True, help="Fichero SQLite destino")
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--tournaments", type=int, default=30)
+    parser.add_argument("--min-size", type=int, default=8)
+    parser.add_argument("--max-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        parser.error(f"{args.db} already exists")
+    engine = sqlite_engine(args.db)
+    summary = generate(
+        engine,
+        args.players,
+        args.tournaments,
+        args.min_size,
+        args.max_size,
+        args.seed,
+    )
+    engine.dispose()
+    print(
+        f"{summary['players']} players, {len(summary['tournaments'])} tournaments "
+        f"in {summary['seconds']:.1f}s -> {args.db}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Utilidades compartidas por los scripts de benchmark.
+
+Arranque de la API con uvicorn en un subproceso, un cliente HTTP/1.1
+keep-alive mínimo (sin dependencias externas) y el resumen estadístico de
+las latencias medidas.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+HOST = "127.0.0.1"
+
+
+async def http_request(
+    reader, writer, method: str, path: str, body: Optional[dict] = None
+) -> Tuple[int, bytes]:
+    """
+    Envía una petición HTTP/1.1 keep-alive y lee la respuesta completa.
+
+    :param reader: StreamReader de la conexión.
+    :param writer: StreamWriter de la conexión.
+    :param method: Método HTTP.
+    :param path: Ruta (con query string).
+    :param body: Cuerpo JSON opcional.
+    :return: Código de estado y cuerpo de la respuesta.
+    """
+    payload = json.dumps(body).encode() if body is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: keep-alive\r\n"
+    if body is not None:
+        head += "Content-Type: application/json\r\n"
+    head += f"Content-Length: {len(payload)}\r\n\r\n"
+    writer.write(head.encode() + payload)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return int(status_line.split()[1]), await reader.readexactly(length)
+
+
+def start_server(env: dict, port: int, workers: int = 1) -> subprocess.Popen:
+    """
+    Arranca uvicorn con el entorno indicado y espera a que acepte conexiones.
+
+    :param env: Variables de entorno añadidas a las del proceso actual.
+    :param port: Puerto de escucha.
+    :param workers: Número de workers de uvicorn.
+    :return: Proceso del servidor (terminarlo al acabar).
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            HOST,
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=dict(os.environ, **env),
+    )
+    for _ in range(100):
+        try:
+            with socket.create_connection((HOST, port), timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> dict:
+    """
+    Resume una serie de latencias (en segundos) medidas durante elapsed segundos.
+
+    :return: Número de operaciones, errores, media, percentiles y ops/s (en ms).
+    """
+    latencies = sorted(latencies)
+    count = len(latencies)
+
+    def percentile(p: float) -> Optional[float]:
+        if not count:
+            return None
+        return latencies[min(count - 1, int(count * p))] * 1000
+
+    return {
+        "ops": count,
+        "errors": errors,
+        "mean_ms": sum(latencies) / count * 1000 if count else None,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": latencies[-1] * 1000 if count else None,
+        "ops_per_sec": count / elapsed if elapsed > 0 else None,
+    }
@@ -0,0 +1,90 @@
+"""
+Benchmark de la importación masiva de jugadores.
+
+Compara el alta fila a fila de create_player con import_players sobre una
+base de datos SQLite local y muestra los jugadores creados por segundo.
+
+Uso (desde el directorio tk3_api):
+    python -m bench.player_import
+    python -m bench.player_import --sizes 1000 10000 --modes bulk
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.db import Base
+from app.core.id_allocator import player_ids
+from app.models.player_stats import PlayerStats  # noqa: F401 (registro de tabla)
+from app.schemas.player_schemas import PlayerCreate
+from app.services.players_service import PlayersService
+
+MODES = ("per-row", "bulk")
+
+
+def _rows(count: int) -> list:
+    """Filas de importación con nicks únicos."""
+    return [
+        {"nick": f"player{i}", "logo_url": f"https://cdn.example/{i}.png"}
+        for i in range(1, count + 1)
+    ]
+
+
+def run(count: int, mode: str) -> dict:
+    """
+    Importa count jugadores en una base de datos vacía con una estrategia.
+
+    :param count: Número de jugadores a crear.
+    :param mode: per-row (create_player) o bulk (import_players).
+    :return: Resultados con segundos y jugadores/segundo.
+    """
+    service = PlayersService()
+    player_ids.reset()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine, autoflush=False)()
+        rows = _rows(count)
+        try:
+            start = time.perf_counter()
+            if mode == "bulk":
+                created = service.import_players(db, rows)["created"]
+            else:
+                for row in rows:
+                    service.create_player(db, PlayerCreate(**row))
+                created = len(rows)
+            seconds = time.perf_counter() - start
+        finally:
+            db.close()
+            engine.dispose()
+
+    return {
+        "players": count,
+        "mode": mode,
+        "created": created,
+        "seconds": seconds,
+        "players_per_sec": created / seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    print(f"{'players':>8} {'mode':>8} {'seconds':>9} {'players/s':>11}")
+    for count in args.sizes:
+        for mode in args.modes:
+            result = run(count, mode)
+            print(
+                f"{count:>8} {mode:>8} {result['seconds']:>9.2f} "
+                f"{result['players_per_sec']:>11,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Microbenchmark de serialización de listados grandes.
+
+Compara, para el cuadro de un torneo con 1k, 10k y 100k combates sobre
+SQLite local, las dos rutas de respuesta de la API:
+
+- model: consulta ORM + validación from_attributes y serialización con
+  Pydantic (lo que hace FastAPI con response_model=List[MatchResponse]).
+- fast: consulta de tuplas (get_bracket_rows) + FastJSONResponse (orjson).
+
+Mide por separado la consulta y la serialización, y comprueba que ambas
+rutas producen el mismo JSON.
+
+Uso (desde el directorio tk3_api):
+    python -m bench.serialization
+    python -m bench.serialization --sizes 1000 10000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.core import fast_json
+from app.core.db import Base
+from app.models.match import Match, MatchStatus
+from app.models.player import Player
+from app.models.player_stats import PlayerStats  # noqa: F401 (registro de tabla)
+from app.models.tournament import Tournament, TournamentStatus
+from app.models.tournament_player import TournamentPlayer  # noqa: F401
+from app.schemas.match_schemas import MatchResponse
+from app.services.tournaments_service import TournamentsService
+
+_adapter = TypeAdapter(List[MatchResponse])
+
+
+def _seed(session_factory, rows: int) -> int:
+    """Crea un torneo con rows combates resueltos."""
+    db = session_factory()
+    try:
+        db.execute(
+            insert(Player),
+            [{"id": i, "nick": f"player{i}", "active": True} for i in (1, 2)],
+        )
+        tournament = Tournament(name="bench", status=TournamentStatus.GENERATED)
+        db.add(tournament)
+        db.flush()
+        db.execute(
+            insert(Match),
+            [
+                {
+                    "tournament_id": tournament.id,
+                    "round": 1 + i // 1000,
+                    "position": 1 + i % 1000,
+                    "player1_id": 1,
+                    "player2_id": 2,
+                    "winner_id": 1,
+                    "status": MatchStatus.RESOLVED,
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+        return tournament.id
+    finally:
+        db.close()
+
+
+def _model_path(db, service, tournament_id):
+    matches = service.get_bracket(db, tournament_id)
+    start = time.perf_counter()
+    validated = _adapter.validate_python(matches, from_attributes=True)
+    body = json.dumps(
+        _adapter.dump_python(validated, mode="json"),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return body, start
+
+
+def _fast_path(db, service, tournament_id):
+    rows = service.get_bracket_rows(db, tournament_id)
+    start = time.perf_counter()
+    body = fast_json.FastJSONResponse(rows).body
+    return body, start
+
+
+PATHS = {"model": _model_path, "fast": _fast_path}
+
+
+def run(rows: int, repeat: int) -> List[dict]:
+    """
+    Mide cada ruta con un cuadro de rows combates (mejor de repeat).
+
+    :param rows: Número de combates del cuadro.
+    :param repeat: Repeticiones por ruta.
+    :return: Resultados por ruta: consulta, serialización y total en ms.
+    """
+    service = TournamentsService()
+    results = []
+    bodies = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        tournament_id = _seed(session_factory, rows)
+
+        for name, path in PATHS.items():
+            best = None
+            for _ in range(repeat):
+                db = session_factory()
+                try:
+                    begin = time.perf_counter()
+                    body, serialize_start = path(db, service, tournament_id)
+                    end = time.perf_counter()
+                finally:
+                    db.close()
+                timing = (serialize_start - begin, end - serialize_start)
+                if best is None or sum(timing) < sum(best):
+                    best = timing
+            bodies[name] = body
+            results.append(
+                {
+                    "rows": rows,
+                    "path": name,
+                    "query_ms": best[0] * 1000,
+                    "serialize_ms": best[1] * 1000,
+                    "total_ms": sum(best) * 1000,
+                    "bytes": len(body),
+                }
+            )
+        engine.dispose()
+
+    if json.loads(bodies["model"]) != json.loads(bodies["fast"]):
+        raise AssertionError("model and fast paths produced different JSON")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    encoder = "orjson" if fast_json.orjson is not None else "json"
+    print(f"fast path encoder: {encoder}")
+    print(
+        f"{'rows':>7} {'path':>5} {'query ms':>9} {'serialize ms':>13} "
+        f"{'total ms':>9} {'bytes':>10}"
+    )
+    for rows in args.sizes:
+        for result in run(rows, args.repeat):
+            print(
+                f"{rows:>7} {result['path']:>5} {result['query_ms']:>9.1f} "
+                f"{result['serialize_ms']:>13.1f} {result['total_ms']:>9.1f} "
+                f"{result['bytes']:>10,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Suite de benchmarks reproducible de los endpoints de la API.
+
+Genera (o reutiliza) una base de datos SQLite local con datos sintéticos
+sembrados (ver bench.datagen) y mide estos escenarios:
+
+- leaderboard: ranking global.
+- tournament_history: historial de combates de un torneo terminado.
+- bracket_read: cuadro completo de un torneo terminado.
+- bracket_generation: generación del cuadro de un torneo en DRAFT.
+- next_round: paso a la siguiente ronda de un torneo con la ronda resuelta.
+- set_winner: resolución de un combate pendiente.
+
+Cada escenario se ejecuta en proceso (llamando a los servicios, con N hilos)
+y/o por HTTP (uvicorn en un subproceso y N clientes keep-alive). Los
+resultados se escriben en JSON para compararlos entre commits con
+bench.compare.
+
+Uso (desde el directorio tk3_api):
+    python -m bench.suite --output results.json
+    python -m bench.suite --modes http --concurrency 1 16 --iterations 300
+    python -m bench.suite --scenarios leaderboard set_winner --env TK3_FAST_JSON=1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+from sqlalchemy.orm import sessionmaker
+from . import datagen
+from .harness import HOST, http_request, start_server, summarize
+from app.services.reports_service import ReportsService
+
+reports_service = ReportsService()
+
+# Tamaño de los torneos creados como fixtures de los escenarios de escritura
+FIXTURE_SIZE = 64
+
+
+class Scenario(NamedTuple):
+    """
+    Escenario medible: cómo preparar sus elementos de trabajo y cómo
+    ejecutar uno en proceso y por HTTP.
+    """
+
+    name: str
+    prepare: Callable[[object, dict, int, int], List]
+    inproc: Callable[[object, object], object]
+    http: Callable[[object], tuple]
+
+
+def _cycle(values: List, count: int) -> List:
+    return [values[i % len(values)] for i in range(count)]
+
+
+def _finished(engine, dataset: dict, count: int, seed: int) -> List[int]:
+    return _cycle(dataset["tournaments"], count)
+
+
+def _drafts(engine, dataset: dict, count: int, seed: int) -> List[int]:
+    return datagen.draft_tournaments(
+        engine, count, FIXTURE_SIZE, dataset["players"], seed
+    )
+
+
+def _rounds(engine, dataset: dict, count: int, seed: int) -> List[int]:
+    return datagen.finished_round_tournaments(
+        engine, count, FIXTURE_SIZE, dataset["players"], seed
+    )
+
+
+def _pending(engine, dataset: dict, count: int, seed: int) -> List[tuple]:
+    return datagen.pending_matches(
+        engine, count, FIXTURE_SIZE, dataset["players"], seed
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            "leaderboard",
+            lambda engine, dataset, count, seed: [None] * count,
+            lambda db, _: reports_service.get_leaderboard(db),
+            lambda _: ("GET", "/reports/leaderboard", None),
+        ),
+        Scenario(
+            "tournament_history",
+            _finished,
+            lambda db, tid: reports_service.get_tournament_matches(db, tid),
+            lambda tid: ("GET", f"/reports/tournaments/{tid}/matches", None),
+        ),
+        Scenario(
+            "bracket_read",
+            _finished,
+            lambda db, tid: datagen.tournaments_service.get_bracket(db, tid),
+            lambda tid: ("GET", f"/tournaments/{tid}/bracket?limit=1000", None),
+        ),
+        Scenario(
+            "bracket_generation",
+            _drafts,
+            lambda db, tid: datagen.tournaments_service.generate_bracket(db, tid),
+            lambda tid: ("POST", f"/tournaments/{tid}/generate", {}),
+        ),
+        Scenario(
+            "next_round",
+            _rounds,
+            lambda db, tid: datagen.tournaments_service.generate_next_round(db, tid),
+            lambda tid: ("POST", f"/tournaments/{tid}/next-round", {}),
+        ),
+        Scenario(
+            "set_winner",
+            _pending,
+            lambda db, pair: datagen.matches_service.set_winner(db, *pair),
+            lambda pair: (
+                "POST",
+                f"/matches/{pair[0]}/winner",
+                {"winner_id": pair[1]},
+            ),
+        ),
+    )
+}
+
+
+def run_inproc(engine, scenario: Scenario, items: List, concurrency: int) -> dict:
+    """Ejecuta los elementos llamando a los servicios desde N hilos."""
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    queue = deque(items)
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors = [0]
+
+    def worker() -> None:
+        while True:
+            with lock:
+                if not queue:
+                    return
+                item = queue.popleft()
+            db = session_factory()
+            try:
+                start = time.perf_counter()
+                scenario.inproc(db, item)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+            finally:
+                db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    return summarize(latencies, time.perf_counter() - start, errors[0])
+
+
+async def _http_load(port: int, scenario: Scenario, items: List, concurrency: int):
+    queue = deque(items)
+    latencies: List[float] = []
+    errors = [0]
+
+    async def client() -> None:
+        reader, writer = await asyncio.open_connection(HOST, port)
+        try:
+            while queue:
+                method, path, body = scenario.http(queue.popleft())
+                start = time.perf_counter()
+                status, _ = await http_request(reader, writer, method, path, body)
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors[0] += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors[0])
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", help="SQLite a reutilizar (por defecto, temporal)")
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--tournaments", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--modes", nargs="+", choices=["inproc", "http"], default=["inproc", "http"]
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Variable de entorno extra para el servidor HTTP (repetible)",
+    )
+    parser.add_argument("--output", default="bench-results.json")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    path = args.db or os.path.join(tmp.name, "bench.sqlite3")
+    engine = datagen.sqlite_engine(path)
+    if args.db and os.path.exists(args.db):
+        print(f"reusing {path}")
+        with engine.connect() as conn:
+            ids = conn.exec_driver_sql(
+                "SELECT id FROM tournament WHERE status = 'FINISHED' ORDER BY id"
+            ).scalars()
+            dataset = {"players": args.players, "tournaments": list(ids)}
+    else:
+        dataset = datagen.generate(
+            engine, args.players, args.tournaments, seed=args.seed
+        )
+        print(
+            f"seeded {args.players} players and {args.tournaments} tournaments "
+            f"in {dataset['seconds']:.1f}s"
+        )
+
+    server_env = dict(item.split("=", 1) for item in args.env)
+    server_env["TK3_DATABASE_URL"] = f"sqlite:///{path}"
+
+    results = []
+    print(
+        f"{'scenario':>20} {'mode':>6} {'conc':>4} {'ops/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'errors':>6}"
+    )
+    # Cada ejecución consume sus propios fixtures: semillas distintas por paso
+    step = 0
+    for mode in args.modes:
+        server = start_server(server_env, args.port) if mode == "http" else None
+        try:
+            for name in args.scenarios:
+                scenario = SCENARIOS[name]
+                for concurrency in args.concurrency:
+                    step += 1
+                    items = scenario.prepare(
+                        engine, dataset, args.iterations, args.seed + step
+                    )
+                    if mode == "http":
+                        stats = asyncio.run(
+                            _http_load(args.port, scenario, items, concurrency)
+                        )
+                    else:
+                        stats = run_inproc(engine, scenario, items, concurrency)
+                    results.append(
+                        {
+                            "scenario": name,
+                            "mode": mode,
+                            "concurrency": concurrency,
+                            **stats,
+                        }
+                    )
+                    print(
+                        f"{name:>20} {mode:>6} {concurrency:>4} "
+                        f"{stats['ops_per_sec'] or 0:>9,.1f} "
+                        f"{stats['p50_ms'] or 0:>8.1f} {stats['p95_ms'] or 0:>8.1f} "
+                        f"{stats['errors']:>6}"
+                    )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    engine.dispose()
+    tmp.cleanup()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "port")
+            },
+            "env": {
+                key: value
+                for key, value in sorted(os.environ.items())
+                if key.startswith("TK3_")
+            },
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
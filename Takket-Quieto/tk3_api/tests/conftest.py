@@ -0,0 +1,100 @@
+"""
+Configuración común de los tests.
+
+La API se importa contra una base de datos SQLite temporal (las variables
+TK3_* se fijan antes de importar app) y cada test empieza con las tablas
+de datos vacías y las cachés del proceso limpias.
+
+Uso (desde el directorio tk3_api):
+    python -m pytest -q
+"""
+
+import os
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="tk3_tests_")
+os.environ["TK3_DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP_DIR, 'tk3.db')}"
+os.environ["TK3_DB_ASYNC"] = "0"
+os.environ["TK3_REPORT_CACHE_BACKEND"] = "memory"
+os.environ["TK3_METRICS_DIR"] = "none"
+
+import pytest  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+from app.core.db import Base, SessionLocal, engine  # noqa: E402
+from app.core.migrations import upgrade  # noqa: E402
+from app.core.player_cache import player_cache  # noqa: E402
+from app.core.report_cache import report_cache  # noqa: E402
+from app.schemas.tournament_schemas import (  # noqa: E402
+    ParticipantBulkCreate,
+    TournamentCreate,
+)
+from app.services.players_service import PlayersService  # noqa: E402
+from app.services.tournaments_service import TournamentsService  # noqa: E402
+
+# Tablas de control que se conservan entre tests: los bloques de ids y las
+# versiones de datos solo crecen, así que no interfieren entre tests
+_KEEP_TABLES = {"id_sequence", "data_version"}
+
+upgrade(engine)
+
+
+@pytest.fixture(autouse=True)
+def _clean_database():
+    """Vacía las tablas de datos y las cachés antes de cada test."""
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in _KEEP_TABLES:
+                conn.execute(delete(table))
+    player_cache.clear()
+    report_cache.clear()
+    yield
+
+
+@pytest.fixture
+def db():
+    """Sesión síncrona de la base de datos de tests."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    """Cliente HTTP de la API en proceso."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_bracket(db):
+    """
+    Factoría de torneos con el cuadro ya generado.
+
+    :return: Función (jugadores, auto_advance=False) -> id del torneo.
+    """
+    players_service = PlayersService()
+    tournaments_service = TournamentsService()
+    created = [0]
+
+    def _make(size: int, auto_advance: bool = False) -> int:
+        start = created[0]
+        created[0] += size
+        result = players_service.import_players(
+            db, [{"nick": f"player{i:05d}"} for i in range(start, start + size)]
+        )
+        tournament = tournaments_service.create_tournament(
+            db, TournamentCreate(name=f"t{size}", auto_advance=auto_advance)
+        )
+        player_ids = [row["id"] for row in result["results"]]
+        tournaments_service.add_participants(
+            db, tournament.id, ParticipantBulkCreate(player_ids=player_ids)
+        )
+        tournaments_service.generate_bracket(db, tournament.id)
+        return tournament.id
+
+    return _make
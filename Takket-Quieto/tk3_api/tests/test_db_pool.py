@@ -0,0 +1,29 @@
+"""Contadores del pool de conexiones instrumentado."""
+
+import sqlite3
+from app.core.db_pool import InstrumentedQueuePool
+
+
+def _pool():
+    return InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1)
+
+
+def test_each_pool_has_its_own_stats():
+    first, second = _pool(), _pool()
+
+    first.connect().close()
+
+    assert first.stats is not second.stats
+    assert first.stats.checkouts == 1
+    assert second.stats.checkouts == 0
+
+
+def test_recreated_pool_keeps_the_stats():
+    pool = _pool()
+    pool.connect().close()
+
+    recreated = pool.recreate()
+    recreated.connect().close()
+
+    assert recreated.stats is pool.stats
+    assert recreated.stats.checkouts == 2
@@ -0,0 +1,75 @@
+"""Unicidad de los ids repartidos por bloques con altas concurrentes."""
+
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select
+from app.core.db import SessionLocal
+from app.core.id_allocator import IdAllocator
+from app.models.player import Player
+from app.schemas.player_schemas import PlayerCreate
+from app.services.players_service import PlayersService
+from bench.concurrent_creates import run
+
+THREADS = 8
+PER_THREAD = 20
+
+
+def _in_threads(fn):
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(fn, range(THREADS)))
+
+
+def test_concurrent_creates_get_distinct_ids(db):
+    service = PlayersService()
+
+    def create(thread):
+        ids = []
+        for i in range(PER_THREAD):
+            session = SessionLocal()
+            try:
+                player = service.create_player(
+                    session, PlayerCreate(nick=f"t{thread}-{i}")
+                )
+                ids.append(player.id)
+            finally:
+                session.close()
+        return ids
+
+    ids = [player_id for thread_ids in _in_threads(create) for player_id in thread_ids]
+
+    created, distinct = db.execute(
+        select(func.count(Player.id), func.count(func.distinct(Player.id)))
+    ).one()
+    assert created == distinct == THREADS * PER_THREAD
+    assert sorted(ids) == sorted(db.execute(select(Player.id)).scalars())
+
+
+def test_allocators_of_several_workers_never_overlap():
+    # Un asignador por worker (como en procesos distintos) con bloques
+    # pequeños para que compitan a menudo por la fila de id_sequence
+    workers = [IdAllocator("player", Player.id, block_size=3) for _ in range(4)]
+
+    def allocate(thread):
+        allocator = workers[thread % len(workers)]
+        ranges = []
+        for count in (1, 2, 5, 1, 3) * 4:
+            session = SessionLocal()
+            try:
+                ranges.append(allocator.allocate(session, count))
+            finally:
+                session.close()
+        return ranges
+
+    ids = [
+        player_id
+        for thread_ranges in _in_threads(allocate)
+        for allocated in thread_ranges
+        for player_id in allocated
+    ]
+    assert len(ids) == len(set(ids)) == THREADS * (1 + 2 + 5 + 1 + 3) * 4
+
+
+def test_concurrent_creates_across_processes():
+    result = run(workers=2, threads=4, per_thread=10)
+
+    assert result["errors"] == []
+    assert result["created"] == result["expected"] == result["distinct_ids"] == 80
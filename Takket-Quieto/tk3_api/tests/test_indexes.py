@@ -0,0 +1,143 @@
+"""
+Los índices de la migración hot_path_indexes cubren las consultas de los
+servicios: se registran las sentencias SELECT de cada operación y se
+comprueba su plan con EXPLAIN QUERY PLAN en SQLite.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+from sqlalchemy import create_engine, delete, event, inspect, text
+from app.core.db import engine
+from app.core.migrations import _UNUSED_MATCH_INDEXES, schema_version, upgrade
+from app.models.match import MatchStatus
+from app.services.matches_service import MatchesService
+from app.services.reports_service import ReportsService
+from app.services.tournaments_service import TournamentsService
+
+tournaments_service = TournamentsService()
+matches_service = MatchesService()
+reports_service = ReportsService()
+
+# Índice de la restricción única (tournament_id, player_id) en SQLite
+TOURNAMENT_PLAYER_UNIQUE = "sqlite_autoindex_tournament_player_1"
+
+
+@contextmanager
+def _selects() -> Iterator[List[Tuple[str, tuple]]]:
+    """Registra las sentencias SELECT (y sus parámetros) ejecutadas en el bloque."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _plans(statements) -> List[str]:
+    """Plan de cada sentencia, con sus pasos unidos por " | "."""
+    with engine.connect() as conn:
+        return [
+            " | ".join(
+                row[3]
+                for row in conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            )
+            for statement, parameters in statements
+        ]
+
+
+def _match_plans(statements) -> List[str]:
+    """Planes de las lecturas de combates que no van por clave primaria."""
+    return [
+        plan
+        for plan in _plans(statements)
+        if "match" in plan.split() and "PRIMARY KEY" not in plan
+    ]
+
+
+def _assert_all_use(plans: List[str], index: str) -> None:
+    assert plans, "no statements recorded"
+    for plan in plans:
+        assert index in plan, plan
+
+
+def test_bracket_reads_use_tournament_round_position_index(db, make_bracket):
+    tournament_id = make_bracket(16)
+
+    with _selects() as statements:
+        tournaments_service.get_bracket(db, tournament_id, 10, (1, 2))
+        tournaments_service.get_bracket_rows(db, tournament_id)
+        tournaments_service.get_odds_state(db, tournament_id)
+
+    _assert_all_use(_match_plans(statements), "ix_match_tournament_round_position")
+
+
+def test_tournament_history_uses_tournament_round_position_index(db, make_bracket):
+    tournament_id = make_bracket(16)
+
+    with _selects() as statements:
+        reports_service.get_tournament_matches(db, tournament_id)
+
+    _assert_all_use(_match_plans(statements), "ix_match_tournament_round_position")
+
+
+def test_winner_advance_uses_tournament_round_position_index(db, make_bracket):
+    tournament_id = make_bracket(16, auto_advance=True)
+    matches = tournaments_service.get_bracket(db, tournament_id)
+    first, second = [match for match in matches if match.round == 1][:2]
+
+    with _selects() as statements:
+        matches_service.set_winner(db, first.id, first.player1_id)
+        matches_service.set_winner(db, second.id, second.player2_id)
+
+    # Siguiente combate y combate hermano: búsqueda exacta por las tres columnas
+    plans = _match_plans(statements)
+    _assert_all_use(plans, "ix_match_tournament_round_position")
+    assert all("tournament_id=? AND round=? AND position=?" in plan for plan in plans)
+
+
+def test_next_round_uses_tournament_round_position_index(db, make_bracket):
+    tournament_id = make_bracket(8)
+    for match in tournaments_service.get_bracket(db, tournament_id):
+        if match.status == MatchStatus.PENDING:
+            matches_service.set_winner(db, match.id, match.player1_id)
+
+    with _selects() as statements:
+        tournaments_service.generate_next_round(db, tournament_id)
+
+    plans = _match_plans(statements)
+    _assert_all_use(plans, "ix_match_tournament_round_position")
+    assert all("tournament_id=? AND round=?" in plan for plan in plans)
+
+
+def test_participant_reads_use_tournament_player_index(db, make_bracket):
+    tournament_id = make_bracket(8)
+
+    with _selects() as statements:
+        tournaments_service.get_participants(db, tournament_id)
+        tournaments_service.get_odds_state(db, tournament_id)
+
+    plans = [plan for plan in _plans(statements) if "tournament_player" in plan]
+    _assert_all_use(plans, TOURNAMENT_PLAYER_UNIQUE)
+
+
+def test_unused_match_indexes_are_dropped(tmp_path):
+    other = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    upgrade(other)
+    # Base de datos migrada con la versión 3 anterior, que los creaba
+    with other.begin() as conn:
+        for name in _UNUSED_MATCH_INDEXES:
+            conn.execute(text(f"CREATE INDEX {name} ON `match` (status)"))
+        conn.execute(delete(schema_version).where(schema_version.c.version == 8))
+
+    upgrade(other)
+
+    names = {index["name"] for index in inspect(other).get_indexes("match")}
+    assert names == {"ix_match_tournament_round_position", "ix_match_id"}
+    other.dispose()
@@ -0,0 +1,151 @@
+"""
+Equivalencia del ranking con la lógica original, que contaba victorias y
+derrotas con dos consultas COUNT por jugador.
+"""
+
+import random
+from sqlalchemy import and_
+from app.models.match import Match, MatchStatus
+from app.models.player import Player
+from app.schemas.player_schemas import PlayerCreate
+from app.schemas.tournament_schemas import ParticipantBulkCreate, TournamentCreate
+from app.services.matches_service import MatchesService
+from app.services.player_stats_service import PlayerStatsService
+from app.services.players_service import PlayersService
+from app.services.reports_service import ReportsService
+from app.services.tournaments_service import TournamentsService
+
+players_service = PlayersService()
+tournaments_service = TournamentsService()
+matches_service = MatchesService()
+stats_service = PlayerStatsService()
+reports_service = ReportsService()
+
+
+def _legacy_leaderboard(db):
+    """Ranking calculado jugador a jugador, como antes de la consulta agregada."""
+    leaderboard = []
+    for player in db.query(Player).order_by(Player.id).all():
+        wins = (
+            db.query(Match)
+            .filter(
+                and_(
+                    Match.winner_id == player.id,
+                    Match.status == MatchStatus.RESOLVED,
+                )
+            )
+            .count()
+        )
+        losses = (
+            db.query(Match)
+            .filter(
+                and_(
+                    Match.status == MatchStatus.RESOLVED,
+                    Match.player2_id.isnot(None),
+                    Match.winner_id != player.id,
+                    (Match.player1_id == player.id) | (Match.player2_id == player.id),
+                )
+            )
+            .count()
+        )
+        if wins > 0 or losses > 0:
+            leaderboard.append((player.id, player.nick, wins, losses))
+
+    # La ordenación es estable: los empates quedan en orden de id
+    leaderboard.sort(key=lambda entry: (-entry[2], entry[3]))
+    return leaderboard
+
+
+def _entries(leaderboard):
+    return [(e.player_id, e.nick, e.wins, e.losses) for e in leaderboard]
+
+
+def _create_players(db, count):
+    return [
+        players_service.create_player(db, PlayerCreate(nick=f"player{i:03d}")).id
+        for i in range(count)
+    ]
+
+
+def _seed_random_matches(db, seed=42):
+    """
+    Combates sintéticos con resultados aleatorios: BYEs, pendientes y
+    muchos empates en victorias y derrotas.
+    """
+    rng = random.Random(seed)
+    player_ids = _create_players(db, 40)
+    tournament = tournaments_service.create_tournament(db, TournamentCreate(name="t"))
+    for position in range(1, 301):
+        player1, player2 = rng.sample(player_ids, 2)
+        if rng.random() < 0.1:
+            player2 = None
+        status = rng.choice([MatchStatus.RESOLVED] * 3 + [MatchStatus.PENDING])
+        winner = None
+        if status == MatchStatus.RESOLVED:
+            winner = player1 if player2 is None else rng.choice([player1, player2])
+        db.add(
+            Match(
+                tournament_id=tournament.id,
+                round=1,
+                position=position,
+                player1_id=player1,
+                player2_id=player2,
+                winner_id=winner,
+                status=status,
+            )
+        )
+    db.commit()
+
+
+def test_compute_from_matches_matches_legacy_counts(db):
+    _seed_random_matches(db)
+    legacy = {entry[0]: entry[2:] for entry in _legacy_leaderboard(db)}
+
+    computed = {
+        row.player_id: (row.wins, row.losses)
+        for row in stats_service.compute_from_matches(db)
+    }
+
+    assert computed == legacy
+
+
+def test_leaderboard_matches_legacy_including_ties(db):
+    _seed_random_matches(db)
+    stats_service.rebuild(db)
+    legacy = _legacy_leaderboard(db)
+
+    # El conjunto de datos debe tener empates para comprobar su orden
+    assert len({entry[2:] for entry in legacy}) < len(legacy)
+    assert _entries(reports_service.get_leaderboard(db)) == legacy
+
+
+def test_incremental_stats_match_legacy_after_playing_tournaments(db):
+    rng = random.Random(7)
+    player_ids = _create_players(db, 23)
+    for size in (5, 8, 13, 23):
+        tournament = tournaments_service.create_tournament(
+            db, TournamentCreate(name=f"t{size}", auto_advance=size % 2 == 0)
+        )
+        tournaments_service.add_participants(
+            db,
+            tournament.id,
+            ParticipantBulkCreate(player_ids=rng.sample(player_ids, size)),
+        )
+        tournaments_service.generate_bracket(db, tournament.id)
+        # Se juega solo parte de cada torneo: quedan combates pendientes
+        for _ in range(size // 2):
+            playable = [
+                match
+                for match in tournaments_service.get_bracket(db, tournament.id)
+                if match.status == MatchStatus.PENDING
+                and match.player1_id
+                and match.player2_id
+            ]
+            if not playable:
+                break
+            match = rng.choice(playable)
+            matches_service.set_winner(
+                db, match.id, rng.choice([match.player1_id, match.player2_id])
+            )
+
+    assert _entries(reports_service.get_leaderboard(db)) == _legacy_leaderboard(db)
@@ -0,0 +1,125 @@
+"""Agregación de las métricas de varios workers desde METRICS_DIR."""
+
+import json
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.core import metrics as metrics_module
+from app.core.metrics import MetricsMiddleware, MetricsRegistry, _process_start_time
+
+pytestmark = pytest.mark.skipif(
+    _process_start_time(os.getpid()) is None,
+    reason="process start time is only available on Linux (/proc)",
+)
+
+
+def _write(directory, pid, data):
+    with open(os.path.join(directory, f"{pid}.json"), "w") as handle:
+        json.dump(data, handle)
+
+
+def _registry(tmp_path):
+    registry = MetricsRegistry(str(tmp_path), flush_seconds=60)
+    registry.gauge("tk3_in_flight", "In flight requests")
+    registry.counter("tk3_requests_total", "Requests")
+    return registry
+
+
+def _render(tmp_path, files):
+    registry = _registry(tmp_path)
+    for pid, data in files.items():
+        _write(str(tmp_path), pid, data)
+    return registry.render()
+
+
+def _worker_file(start_time, in_flight, requests):
+    return {
+        "start_time": start_time,
+        "metrics": {
+            "tk3_in_flight": [[[], in_flight]],
+            "tk3_requests_total": [[[], requests]],
+        },
+    }
+
+
+def test_gauges_of_live_workers_are_added(tmp_path):
+    # El proceso padre hace de otro worker vivo
+    parent = os.getppid()
+    text = _render(tmp_path, {parent: _worker_file(_process_start_time(parent), 3, 7)})
+
+    assert "tk3_in_flight 3" in text
+    assert "tk3_requests_total 7" in text
+
+
+def test_reused_pid_does_not_count_as_live(tmp_path):
+    # Mismo pid, otra hora de arranque: el worker terminó y otro proceso
+    # heredó su pid. Sus contadores se conservan, sus medidores no
+    parent = os.getppid()
+    stale = _worker_file(_process_start_time(parent) - 1, 3, 7)
+    text = _render(tmp_path, {parent: stale})
+
+    assert "tk3_in_flight 3" not in text
+    assert "tk3_requests_total 7" in text
+
+
+def test_files_without_start_time_are_checked_by_pid(tmp_path):
+    parent = os.getppid()
+    legacy = _worker_file(None, 3, 7)["metrics"]
+    text = _render(tmp_path, {parent: legacy})
+
+    assert "tk3_in_flight 3" in text
+    assert "tk3_requests_total 7" in text
+
+
+def test_dead_worker_files_are_retired_once(tmp_path):
+    parent = os.getppid()
+    registry = _registry(tmp_path)
+
+    # Dos workers terminados en momentos distintos
+    _write(str(tmp_path), parent, _worker_file(_process_start_time(parent) - 1, 3, 7))
+    assert "tk3_requests_total 7" in registry.render()
+    _write(str(tmp_path), parent, _worker_file(_process_start_time(parent) - 2, 1, 5))
+    text = registry.render()
+
+    assert "tk3_requests_total 12" in text
+    assert "\ntk3_in_flight " not in text
+    assert registry.render() == text
+    assert not os.path.exists(os.path.join(str(tmp_path), f"{parent}.json"))
+    with open(os.path.join(str(tmp_path), "retired.json")) as handle:
+        assert json.load(handle)["metrics"] == {"tk3_requests_total": [[[], 12]]}
+
+
+def test_default_directory_is_per_server_start():
+    group = os.getpgrp()
+    directory = metrics_module.default_directory()
+
+    assert os.path.basename(directory) == (
+        f"tk3_metrics_{group}_{_process_start_time(group) or 0}"
+    )
+
+
+def test_streaming_responses_are_not_in_flight_nor_timed():
+    app = FastAPI()
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"data: 1\n\n"]), media_type="text/event-stream")
+
+    @app.get("/plain")
+    def plain():
+        return {}
+
+    def value(metric, *labels):
+        return metric._values.get(labels)
+
+    in_flight = metrics_module.http_in_flight._values.get((), 0.0)
+    with TestClient(MetricsMiddleware(app)) as client:
+        client.get("/stream")
+        client.get("/plain")
+
+    assert metrics_module.http_in_flight._values.get((), 0.0) == in_flight
+    assert value(metrics_module.http_requests, "/stream", "GET", "200") >= 1
+    assert value(metrics_module.http_latency, "/stream", "GET") is None
+    assert value(metrics_module.http_latency, "/plain", "GET") is not None
@@ -0,0 +1,59 @@
+"""Caché de identidad de jugadores."""
+
+from app.core.player_cache import PlayerCache
+from app.schemas.player_schemas import PlayerCreate, PlayerUpdate
+from app.services.players_service import PlayersService
+
+players_service = PlayersService()
+
+
+class _WriteDuringRead:
+    """
+    Sesión que, justo después de leer de la base de datos, simula la
+    escritura concurrente de otra petición (update_player + put).
+    """
+
+    def __init__(self, db, on_read):
+        self._db = db
+        self._on_read = on_read
+
+    def query(self, *entities):
+        db, on_read = self._db, self._on_read
+
+        class _Query:
+            def __init__(self, query):
+                self._query = query
+
+            def filter(self, *criteria):
+                return _Query(self._query.filter(*criteria))
+
+            def all(self):
+                rows = self._query.all()
+                on_read()
+                return rows
+
+        return _Query(db.query(*entities))
+
+
+def test_miss_does_not_overwrite_concurrent_write_through(db):
+    cache = PlayerCache(max_size=100, ttl_seconds=300)
+    player = players_service.create_player(db, PlayerCreate(nick="old"))
+
+    def rename():
+        updated = players_service.update_player(db, player.id, PlayerUpdate(nick="new"))
+        cache.put(updated)
+
+    # La lectura devuelve la fila que leyó, pero no la guarda sobre la nueva
+    found = cache.get_many(_WriteDuringRead(db, rename), [player.id])
+    assert found[player.id].nick == "old"
+    assert cache.get(db, player.id).nick == "new"
+
+
+def test_miss_is_stored_without_concurrent_writes(db):
+    cache = PlayerCache(max_size=100, ttl_seconds=300)
+    player = players_service.create_player(db, PlayerCreate(nick="p"))
+
+    cache.get(db, player.id)
+    cache.get(db, player.id)
+
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
@@ -0,0 +1,101 @@
+"""Importación masiva de jugadores: nicks duplicados y conflictos concurrentes."""
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.id_allocator import player_ids
+from app.core.query_stats import capture
+from app.models.player import Player
+from app.schemas.player_schemas import PlayerCreate, PlayerImportStatus
+from app.services import players_service
+from app.services.players_service import PlayersService
+
+service = PlayersService()
+
+
+def _statuses(report):
+    return [(row["nick"], row["status"]) for row in report["results"]]
+
+
+def test_nicks_follow_the_same_rule_as_create_player(db):
+    # Misma comparación que el índice único (y que create_player): en SQLite,
+    # exacta; los nicks se guardan tal cual
+    service.create_player(db, PlayerCreate(nick="Alice"))
+
+    report = service.import_players(
+        db,
+        [{"nick": "Alice"}, {"nick": "Bob"}, {"nick": "Bob"}, {"nick": "alice "}],
+    )
+
+    assert _statuses(report) == [
+        ("Alice", PlayerImportStatus.DUPLICATE),
+        ("Bob", PlayerImportStatus.CREATED),
+        ("Bob", PlayerImportStatus.DUPLICATE),
+        ("alice ", PlayerImportStatus.CREATED),
+    ]
+    assert report["results"][0]["detail"] == "Nick already exists"
+    assert report["results"][2]["detail"] == "Nick repeated in row 2"
+    assert sorted(db.execute(select(Player.nick)).scalars()) == [
+        "Alice",
+        "Bob",
+        "alice ",
+    ]
+
+
+def test_nick_lookups_are_chunked_in_queries(db, monkeypatch):
+    monkeypatch.setattr(players_service, "_NICK_LOOKUP_CHUNK", 2)
+    service.import_players(db, [{"nick": f"p{i}"} for i in range(3)])
+
+    with capture() as stats:
+        service.import_players(db, [{"nick": f"p{i}"} for i in range(5)])
+
+    lookups = {
+        statement: times
+        for statement, times in stats.statements.items()
+        if statement.startswith("SELECT player.nick")
+    }
+    assert sum(lookups.values()) == 3
+    assert all("WHERE player.nick IN" in statement for statement in lookups)
+
+
+def test_concurrent_insert_marks_only_the_conflicting_row(db, monkeypatch):
+    allocate = player_ids.allocate
+
+    def allocate_after_concurrent_insert(session, count):
+        # Otra petición da de alta "Bob" después de la validación
+        with Session(session.get_bind()) as other:
+            other.execute(insert(Player).values(id=10**6, nick="Bob"))
+            other.commit()
+        return allocate(session, count)
+
+    monkeypatch.setattr(player_ids, "allocate", allocate_after_concurrent_insert)
+
+    report = service.import_players(
+        db, [{"nick": "Alice"}, {"nick": "Bob"}, {"nick": "Carol"}]
+    )
+
+    assert _statuses(report) == [
+        ("Alice", PlayerImportStatus.CREATED),
+        ("Bob", PlayerImportStatus.DUPLICATE),
+        ("Carol", PlayerImportStatus.CREATED),
+    ]
+    assert "id" not in report["results"][1]
+    assert report["created"] == 2
+    assert report["rejected"] == 1
+    stored = dict(db.execute(select(Player.nick, Player.id)).all())
+    assert stored["Alice"] == report["results"][0]["id"]
+    assert stored["Carol"] == report["results"][2]["id"]
+    assert stored["Bob"] == 10**6
+
+
+def test_other_integrity_errors_are_not_reported_as_duplicates(db, monkeypatch):
+    taken = service.create_player(db, PlayerCreate(nick="Taken")).id
+    # Ids ya usados: la clave primaria falla, no el nick
+    monkeypatch.setattr(
+        player_ids, "allocate", lambda session, count: range(taken, taken + count)
+    )
+
+    with pytest.raises(Exception, match="Import failed at row 1"):
+        service.import_players(db, [{"nick": "Alice"}, {"nick": "Bob"}])
+
+    assert list(db.execute(select(Player.nick)).scalars()) == ["Taken"]
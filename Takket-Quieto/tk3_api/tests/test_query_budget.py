@@ -0,0 +1,79 @@
+"""
+Número de sentencias SQL por petición de los endpoints más consultados: no
+debe crecer con el tamaño de los datos (sin patrones N+1).
+"""
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from app.core import query_stats
+from app.core.db import engine
+from app.core.player_cache import player_cache
+from app.core.query_stats import capture, query_budget
+from app.models.match import Match, MatchStatus
+from app.services.matches_service import MatchesService
+
+
+@pytest.fixture
+def debug_headers(monkeypatch):
+    """Activa las cabeceras X-DB-* con el número de sentencias por petición."""
+    monkeypatch.setattr(query_stats, "DEBUG", True)
+
+
+def _query_count(response) -> int:
+    assert response.status_code == 200, response.text
+    return int(response.headers[query_stats.QUERY_COUNT_HEADER])
+
+
+def test_tournament_history_statement_count_is_constant(
+    client, make_bracket, debug_headers
+):
+    counts = []
+    for size in (4, 64):
+        tournament_id = make_bracket(size)
+        # Sin caché de jugadores: los nicks se cargan de la base de datos
+        player_cache.clear()
+        with query_budget(3, max_repeats=1):
+            response = client.get(f"/reports/tournaments/{tournament_id}/matches")
+        assert len(response.json()) == size // 2
+        counts.append(_query_count(response))
+
+    assert counts[0] == counts[1]
+
+
+def _resolve_pending(db, tournament_id):
+    """Resuelve los combates pendientes del torneo (gana el primer jugador)."""
+    pending = db.execute(
+        select(Match.id, Match.player1_id).where(
+            Match.tournament_id == tournament_id,
+            Match.status == MatchStatus.PENDING,
+            Match.player1_id.is_not(None),
+        )
+    ).all()
+    MatchesService().set_winners(db, pending)
+
+
+def test_leaderboard_statement_count_is_constant(
+    client, db, make_bracket, debug_headers
+):
+    counts = []
+    for size in (4, 64):
+        _resolve_pending(db, make_bracket(size))
+        player_cache.clear()
+        with query_budget(3, max_repeats=1):
+            response = client.get("/reports/leaderboard")
+        assert len(response.json()) >= size
+        counts.append(_query_count(response))
+
+    assert counts[0] == counts[1]
+
+
+def test_failed_statement_does_not_leak_start_marks():
+    with engine.connect() as conn, capture() as stats:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+
+        assert conn.info.get("tk3_query_start") == []
+    assert stats.count == 4
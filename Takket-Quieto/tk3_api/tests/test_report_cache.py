@@ -0,0 +1,127 @@
+"""Caché de informes: fallos del backend y ganchos de invalidación."""
+
+import logging
+import sqlite3
+import time
+from unittest.mock import patch
+import pytest
+from app.core import report_cache as report_cache_module
+from app.core.report_cache import (
+    MemoryCacheBackend,
+    ReportCache,
+    SQLiteCacheBackend,
+    leaderboard_key,
+    on_matches_changed,
+    on_players_changed,
+)
+from app.routers import reports_router
+from app.schemas.player_schemas import PlayerCreate, PlayerUpdate
+from app.services.players_service import PlayersService
+
+
+class _LockedBackend(MemoryCacheBackend):
+    """Backend cuya invalidación falla como un fichero SQLite bloqueado."""
+
+    def invalidate(self, prefixes):
+        raise sqlite3.OperationalError("database is locked")
+
+
+@pytest.fixture
+def locked_cache(monkeypatch):
+    cache = ReportCache(_LockedBackend(max_entries=10, ttl_seconds=60))
+    monkeypatch.setattr(report_cache_module, "report_cache", cache)
+    return cache
+
+
+def test_hooks_log_and_bump_generation_when_invalidation_fails(locked_cache, caplog):
+    generation = locked_cache.generation()
+
+    with caplog.at_level(logging.WARNING, logger="tk3.report_cache"):
+        on_matches_changed([1, 2])
+        on_players_changed()
+
+    assert locked_cache.generation() == generation + 2
+    assert "database is locked" in caplog.text
+    # Un informe calculado antes del cambio ya no se guarda
+    locked_cache.set(leaderboard_key("1-0"), b"[]", generation)
+    assert locked_cache.get(leaderboard_key("1-0")) is None
+
+
+def test_hooks_never_raise_even_if_the_generation_bump_fails(locked_cache):
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    locked_cache.backend.bump_generation = locked
+
+    on_matches_changed([1])
+    on_players_changed()
+
+
+def test_write_succeeds_when_cache_is_locked(db, locked_cache):
+    service = PlayersService()
+    player = service.create_player(db, PlayerCreate(nick="locked"))
+
+    updated = service.update_player(db, player.id, PlayerUpdate(nick="unlocked"))
+
+    assert updated.nick == "unlocked"
+
+
+def test_sqlite_backend_bump_generation(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), 10, 60)
+    generation = backend.generation()
+
+    backend.bump_generation()
+
+    assert backend.generation() == generation + 1
+    assert not backend.set(leaderboard_key("1-0"), b"[]", generation)
+
+
+class _BrokenBackend(MemoryCacheBackend):
+    """Backend bloqueante en el que fallan todas las operaciones."""
+
+    blocking = True
+
+    def get(self, key):
+        raise sqlite3.OperationalError("database is locked")
+
+    generation = set = get
+
+
+def test_report_is_served_when_cache_reads_and_stores_fail(client, monkeypatch, caplog):
+    cache = ReportCache(_BrokenBackend(max_entries=10, ttl_seconds=60))
+    monkeypatch.setattr(reports_router, "report_cache", cache)
+
+    with caplog.at_level(logging.WARNING, logger="tk3.report_cache"):
+        response = client.get("/reports/leaderboard")
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert cache.misses == 1
+    assert "Report cache read failed" in caplog.text
+
+
+def test_sqlite_read_does_not_write(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteCacheBackend(path, 10, 60)
+    key = leaderboard_key("1-0")
+    assert backend.set(key, b"[]", backend.generation())
+
+    # Otro proceso retiene el bloqueo de escritura del fichero
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        with patch.object(time, "time", return_value=time.time() + 5):
+            assert backend.get(key) == b"[]"
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    # La fecha de acceso se guarda con el siguiente set
+    (accessed,) = backend._conn().execute("SELECT accessed_at FROM entries").fetchone()
+    backend.set(leaderboard_key("2-0"), b"[]", backend.generation())
+    (touched,) = (
+        backend._conn()
+        .execute("SELECT accessed_at FROM entries WHERE key = ?", (key,))
+        .fetchone()
+    )
+    assert touched > accessed